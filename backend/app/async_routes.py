@@ -0,0 +1,109 @@
+"""
+Versiones asíncronas de los routers de tableros y tarjetas.
+
+En lugar de duplicar cada endpoint, `asyncify_router` genera un router nuevo
+en el que cada ruta es una corutina:
+
+- Las dependencias síncronas (`get_db`, `get_current_user`) se sustituyen por
+  sus equivalentes asíncronas (`get_async_db`, `get_current_user_async`).
+- El cuerpo original del endpoint se ejecuta con `AsyncSession.run_sync`, que
+  corre el código ORM síncrono sobre la conexión asíncrona (greenlet) sin
+  ocupar un hilo del threadpool mientras se espera a la base de datos.
+
+Así la lógica de negocio vive en un único sitio (los routers síncronos) y el
+modo se elige con `settings.ASYNC_DB` en app.main.
+"""
+import inspect
+from typing import Callable
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .auth.utils import get_db, get_async_db, get_current_user, get_current_user_async
+
+# Dependencia síncrona -> dependencia asíncrona equivalente
+ASYNC_DEPENDENCIES: dict[Callable, Callable] = {
+    get_db: get_async_db,
+    get_current_user: get_current_user_async,
+}
+
+# Dependencias que producen la sesión (en la versión async se pasan vía run_sync)
+SESSION_DEPENDENCIES = {get_async_db}
+
+
+def asyncify_endpoint(endpoint: Callable) -> Callable:
+    """
+    Envuelve un endpoint síncrono en una corutina que usa la sesión asíncrona.
+
+    Args:
+        endpoint (Callable): Función de ruta síncrona que recibe una Session.
+
+    Returns:
+        Callable: Corutina con la misma firma pública (mismos parámetros de
+        path, query, body y cabeceras) y dependencias asíncronas.
+    """
+    signature = inspect.signature(endpoint)
+    params = []
+    session_params = []
+
+    for param in signature.parameters.values():
+        dependency = getattr(param.default, "dependency", None)
+        if dependency in ASYNC_DEPENDENCIES:
+            async_dependency = ASYNC_DEPENDENCIES[dependency]
+            param = param.replace(default=Depends(async_dependency))
+            if async_dependency in SESSION_DEPENDENCIES:
+                param = param.replace(annotation=AsyncSession)
+                session_params.append(param.name)
+        params.append(param)
+
+    if not session_params:
+        return endpoint
+
+    async def async_endpoint(**kwargs):
+        db: AsyncSession = kwargs[session_params[0]]
+
+        def call(sync_db):
+            for name in session_params:
+                kwargs[name] = sync_db
+            return endpoint(**kwargs)
+
+        return await db.run_sync(call)
+
+    async_endpoint.__signature__ = signature.replace(parameters=params)
+    async_endpoint.__name__ = f"{endpoint.__name__}_async"
+    async_endpoint.__doc__ = endpoint.__doc__
+    return async_endpoint
+
+
+def asyncify_router(router: APIRouter) -> APIRouter:
+    """
+    Construye la versión asíncrona de un router síncrono.
+
+    Conserva prefijo, tags, paths, métodos, response_model y códigos de estado
+    de cada ruta, por lo que el esquema OpenAPI no cambia entre modos.
+    """
+    async_router = APIRouter()
+
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+
+        async_router.add_api_route(
+            route.path,
+            asyncify_endpoint(route.endpoint),
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            summary=route.summary,
+            description=route.description,
+            name=route.name,
+            dependencies=route.dependencies,
+            responses=route.responses,
+            response_class=route.response_class,
+            include_in_schema=route.include_in_schema,
+        )
+
+    return async_router
@@ -0,0 +1,92 @@
+"""
+Calibración del coste de hashing (iteraciones de pbkdf2_sha256) para este host.
+
+Mide cuánto tarda un hash en la máquina actual y calcula las iteraciones
+necesarias para acercarse a un presupuesto de latencia (por defecto 50 ms).
+El resultado se usa como `PBKDF2_ROUNDS` en la configuración; los hashes
+existentes se actualizan solos en el siguiente login de cada usuario.
+
+Uso:
+    python -m app.auth.calibrate --target-ms 50
+    python -m app.auth.calibrate --target-ms 50 --env-file .env
+"""
+import argparse
+import math
+import time
+from pathlib import Path
+from typing import Callable
+
+from passlib.hash import pbkdf2_sha256
+
+# Límites de seguridad: nunca calibrar por debajo de MIN_ROUNDS
+MIN_ROUNDS = 10_000
+MAX_ROUNDS = 10_000_000
+SAMPLE_ROUNDS = 20_000
+
+
+def measure_hash_seconds(rounds: int, samples: int = 3) -> float:
+    """Mejor tiempo (segundos) de `samples` hashes con `rounds` iteraciones."""
+    hasher = pbkdf2_sha256.using(rounds=rounds)
+    best = float("inf")
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibracion-neocare")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate_rounds(
+    target_ms: float,
+    measure: Callable[[int], float] = measure_hash_seconds,
+    min_rounds: int = MIN_ROUNDS,
+) -> int:
+    """
+    Calcula las iteraciones que hacen que un hash tarde aproximadamente `target_ms`.
+
+    Hace una medición de muestra, extrapola linealmente (el coste de pbkdf2 es
+    proporcional a las iteraciones) y corrige con una segunda medición.
+
+    Returns:
+        int: Iteraciones redondeadas hacia arriba a 1000 y acotadas a [min_rounds, MAX_ROUNDS].
+    """
+    target = target_ms / 1000
+    rounds = SAMPLE_ROUNDS
+    for _ in range(2):
+        elapsed = measure(rounds)
+        rounds = int(rounds * target / max(elapsed, 1e-9))
+        rounds = min(max(rounds, min_rounds), MAX_ROUNDS)
+    # Redondear antes de acotar: el redondeo no puede bajar del mínimo
+    rounds = math.ceil(rounds / 1000) * 1000
+    return min(max(rounds, min_rounds), MAX_ROUNDS)
+
+
+def write_env_value(path: Path, key: str, value) -> None:
+    """Añade o reemplaza `KEY=valor` en un fichero .env."""
+    lines = path.read_text().splitlines() if path.exists() else []
+    lines = [line for line in lines if not line.startswith(f"{key}=")]
+    lines.append(f"{key}={value}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibra PBKDF2_ROUNDS para un presupuesto de latencia.")
+    parser.add_argument("--target-ms", type=float, default=50.0, help="Latencia objetivo por hash (ms)")
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS, help="Iteraciones mínimas permitidas")
+    parser.add_argument("--env-file", type=Path, help="Fichero .env donde guardar PBKDF2_ROUNDS")
+    args = parser.parse_args(argv)
+
+    rounds = calibrate_rounds(args.target_ms, min_rounds=args.min_rounds)
+    measured_ms = measure_hash_seconds(rounds) * 1000
+
+    print(f"Objetivo: {args.target_ms:.1f} ms por hash")
+    print(f"Medido:   {measured_ms:.1f} ms con {rounds} iteraciones")
+    print(f"PBKDF2_ROUNDS={rounds}")
+
+    if args.env_file:
+        write_env_value(args.env_file, "PBKDF2_ROUNDS", rounds)
+        print(f"Guardado en {args.env_file}")
+    return rounds
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Ejecución del hashing de contraseñas en un pool de procesos dedicado.
+
+pbkdf2_sha256 es CPU intensivo: ejecutado dentro del hilo de la petición
+mantiene el GIL y frena al resto de endpoints del worker durante una ráfaga de
+logins. Aquí el cálculo se envía a un ProcessPoolExecutor con una cola acotada:
+si ya hay demasiados hashes en curso o esperando, se responde al instante con
+503 y `Retry-After` en lugar de encolar indefinidamente.
+
+`hash_password` y `verify_password` de este módulo tienen la misma firma que
+las de app.auth.utils (que siguen siendo las funciones que se ejecutan en el
+pool), de modo que las rutas solo cambian el import.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from fastapi import HTTPException, status
+
+from ..config import settings
+from . import utils
+
+
+class HashingBusy(Exception):
+    """La cola de hashing está llena; el llamador debe reintentar más tarde."""
+
+
+class HashingExecutor:
+    """
+    Pool de procesos para hashing con profundidad de cola acotada.
+
+    Args:
+        workers (int): Procesos del pool. 0 = ejecutar en el hilo llamador
+            (útil en desarrollo); el límite de concurrencia se mantiene.
+        queue_depth (int): Trabajos que pueden esperar además de los que se
+            están ejecutando.
+    """
+
+    def __init__(self, workers: int, queue_depth: int):
+        self.workers = workers
+        self.capacity = max(workers, 1) + queue_depth
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: no se hace fork de un proceso con hilos (threadpool de Starlette)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def run(self, fn: Callable, *args):
+        """
+        Ejecuta `fn(*args)` en el pool y espera el resultado.
+
+        Raises:
+            HashingBusy: Si la cola está llena (no se bloquea esperando hueco).
+        """
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        """Detiene los procesos del pool (al apagar la aplicación)."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+hashing_executor = HashingExecutor(settings.HASH_POOL_WORKERS, settings.HASH_QUEUE_DEPTH)
+
+
+def _run(fn: Callable, *args):
+    try:
+        return hashing_executor.run(fn, *args)
+    except HashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, inténtalo de nuevo en unos segundos",
+            headers={"Retry-After": str(settings.HASH_RETRY_AFTER_SECONDS)},
+        )
+
+
+def hash_password(password: str) -> str:
+    """
+    Hashea la contraseña en el pool de procesos.
+
+    Raises:
+        HTTPException: 503 con Retry-After si la cola de hashing está llena.
+    """
+    return _run(utils.hash_password, password)
+
+
+def verify_password(plain: str, hashed: str) -> bool:
+    """
+    Verifica la contraseña en el pool de procesos.
+
+    Raises:
+        HTTPException: 503 con Retry-After si la cola de hashing está llena.
+    """
+    return _run(utils.verify_password, plain, hashed)
@@ -0,0 +1,61 @@
+"""
+Caché de identidades de usuario autenticados.
+
+get_current_user valida el JWT en cada petición y, sin caché, consulta la tabla
+users para cargar al usuario. Esta caché guarda, por user_id, los campos
+públicos del usuario durante un TTL corto, y los reconstruye en la sesión de la
+petición con `merge(load=False)` (sin SELECT).
+
+Se invalida automáticamente cuando un User se actualiza o se elimina a través
+del ORM en este proceso; en otros workers el TTL acota la ventana de datos
+atrasados.
+"""
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..boards.models import User
+from ..cache import TTLCache, register_cache
+from ..config import settings
+
+# Campos cacheados (sin password_hash: si alguien lo necesita, se carga al acceder)
+IDENTITY_FIELDS = ("id", "email", "name", "role", "created_at", "updated_at")
+
+identity_cache = register_cache(
+    "identity",
+    TTLCache(maxsize=settings.IDENTITY_CACHE_MAX_SIZE, ttl=settings.IDENTITY_CACHE_TTL_SECONDS),
+)
+
+
+def remember_user(user) -> None:
+    """Guarda en caché la identidad de un usuario recién cargado de la base de datos."""
+    if isinstance(user, User):
+        identity_cache.set(user.id, {field: getattr(user, field) for field in IDENTITY_FIELDS})
+
+
+def cached_user(user_id: int) -> Optional[User]:
+    """
+    Devuelve un User desacoplado (detached) construido desde la caché, o None.
+
+    El llamador debe incorporarlo a su sesión con `merge(..., load=False)`.
+    """
+    values = identity_cache.get(user_id)
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def load_cached_user(db: Session, user_id: int) -> Optional[User]:
+    """Incorpora a `db` el usuario cacheado sin consultar la base de datos."""
+    user = cached_user(user_id)
+    return db.merge(user, load=False) if user is not None else None
+
+
+# ===== INVALIDACIÓN =====
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_identity(mapper, connection, target):
+    identity_cache.invalidate(target.id)
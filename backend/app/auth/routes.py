@@ -7,9 +7,11 @@ y autenticar el acceso mediante JWT, utilizando modelos y esquemas definidos.
 from fastapi import APIRouter, Depends, HTTPException, status   # 👈 IMPORTANTE
 from sqlalchemy.orm import Session
 
-from ..boards.models import User, Board, List
+from ..boards.models import User
+from ..boards.provisioning import provision_board
 from ..auth.schemas import UserRegister, UserLogin, Token
-from ..auth.utils import hash_password, verify_password, create_token, get_db
+from ..auth.utils import create_token, get_db, password_needs_update
+from ..auth.hashing import hash_password, verify_password  # hashing en pool de procesos
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -19,6 +21,9 @@ def register(user: UserRegister, db: Session = Depends(get_db)):
     """
     Crea un usuario nuevo y retorna un token de acceso JWT.
 
+    El usuario, su tablero por defecto y las listas de la plantilla se crean en
+    una sola transacción.
+
     Parámetros:
         user (UserRegister): Datos de registro recibidos en el cuerpo de la petición.
         db (Session): Sesión de base de datos proporcionada por FastAPI.
@@ -28,6 +33,7 @@ def register(user: UserRegister, db: Session = Depends(get_db)):
 
     Excepciones:
         HTTP 400: Si el email ya está registrado en el sistema.
+        HTTP 503: Si la cola de hashing está llena (con cabecera Retry-After).
     """
     # Verifica si el correo ya está registrado
     existing = db.query(User).filter(User.email == user.email).first()
@@ -37,40 +43,23 @@ def register(user: UserRegister, db: Session = Depends(get_db)):
             detail="Email ya registrado",
         )
 
+    # El hash se calcula antes de escribir nada (si la cola está llena: 503)
+    password_hash = hash_password(user.password)
+
     try:
         # 1) Crea el usuario con contraseña hasheada
         new_user = User(
             email=user.email,
-            password_hash=hash_password(user.password),
+            password_hash=password_hash,
             name=user.name,
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-
-        """
-        NUEVO: crear tablero y listas por defecto para evitar que /boards/ devuelva [].
-
-        - Crea 1 tablero "Tablero principal" asociado al usuario.
-        - Crea 3 listas dentro del tablero, con position obligatorio (0,1,2).
-        """
+        db.flush()  # obtiene new_user.id sin confirmar todavía
+        user_id, email = new_user.id, new_user.email
 
-        # 2) Crea tablero por defecto
-        default_board = Board(
-            name="Tablero principal",
-            user_id=new_user.id,
-        )
-        db.add(default_board)
-        db.commit()
-        db.refresh(default_board)
-
-        # 3) Crea listas por defecto
-        default_lists = [
-            List(name="Por hacer", board_id=default_board.id, position=0),
-            List(name="En curso", board_id=default_board.id, position=1),
-            List(name="Hecho", board_id=default_board.id, position=2),
-        ]
-        db.add_all(default_lists)
+        # 2) Crea su tablero y listas desde la plantilla por defecto,
+        #    todo en la misma transacción: o se crea todo o nada
+        provision_board(db, user_id)
         db.commit()
 
     except Exception:
@@ -81,8 +70,8 @@ def register(user: UserRegister, db: Session = Depends(get_db)):
             detail="Error interno creando usuario/tablero por defecto",
         )
 
-    # 4) Genera el JWT para el usuario recién creado
-    token = create_token({"user_id": new_user.id, "email": new_user.email})
+    # 3) Genera el JWT para el usuario recién creado
+    token = create_token({"user_id": user_id, "email": email})
     return {"access_token": token, "token_type": "bearer"}
 
 
@@ -91,6 +80,9 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
     """
     Autentica un usuario existente y retorna un token JWT si las credenciales son correctas.
 
+    Si el hash almacenado usa un coste distinto del configurado (PBKDF2_ROUNDS),
+    se regenera con la contraseña recibida y se guarda en el mismo login.
+
     Parámetros:
         user (UserLogin): Credenciales enviadas por el cliente.
         db (Session): Sesión de base de datos proporcionada por FastAPI.
@@ -100,6 +92,7 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
 
     Excepciones:
         HTTP 401: Si el email no existe o la contraseña no coincide.
+        HTTP 503: Si la cola de hashing está llena (con cabecera Retry-After).
     """
     db_user = db.query(User).filter(User.email == user.email).first()
 
@@ -109,6 +102,14 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
             detail="Credenciales incorrectas",
         )
 
+    # Rehash transparente al nuevo coste (si el pool está saturado, se deja para otro login)
+    if password_needs_update(db_user.password_hash):
+        try:
+            db_user.password_hash = hash_password(user.password)
+            db.commit()
+        except HTTPException:
+            db.rollback()
+
     # Genera el JWT para el usuario autenticado
     token = create_token({"user_id": db_user.id, "email": db_user.email})
     return {"access_token": token, "token_type": "bearer"}
\ No newline at end of file
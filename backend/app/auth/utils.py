@@ -8,12 +8,17 @@ de datos.
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from starlette.requests import HTTPConnection
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
 from ..database import SessionLocal
+from ..async_database import AsyncSessionLocal
 from ..boards.models import User  # tu modelo User está ahí
+from .identity import load_cached_user, cached_user, remember_user
 
 
 # ======== CONFIGURACIÓN DE JWT =========
@@ -22,7 +27,30 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MIN = 60
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+
+def build_pwd_context(rounds=None) -> CryptContext:
+    """
+    Construye el contexto de passlib para pbkdf2_sha256.
+
+    Args:
+        rounds (int | None): Iteraciones de pbkdf2 (ver `python -m app.auth.calibrate`).
+            Si se indica, también se fijan como mínimo y máximo: cualquier hash
+            guardado con otro coste se marca para actualizar (`needs_update`) y
+            se rehashea en el siguiente login. None = valor por defecto de passlib.
+    """
+    if not rounds:
+        return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+pwd_context = build_pwd_context(settings.PBKDF2_ROUNDS)
 
 # ===== CONTRASEÑAS =====
 def hash_password(password: str) -> str:
@@ -58,6 +86,20 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+def password_needs_update(hashed: str) -> bool:
+    """
+    Indica si un hash almacenado no usa el coste configurado y debe regenerarse.
+
+    No calcula ningún hash (solo inspecciona sus parámetros), así que es barato
+    llamarlo en cada login correcto.
+    """
+    try:
+        return pwd_context.needs_update(hashed)
+    except (TypeError, ValueError):
+        # Formato desconocido: no se puede decidir, se deja como está
+        return False
+
+
 # ===== TOKEN: CREAR =====
 def create_token(data: dict):
     """
@@ -76,24 +118,74 @@ def create_token(data: dict):
 
 
 # ===== DEPENDENCIA DB =====
-def get_db():
+# Métodos HTTP de solo lectura: sus consultas pueden ir a una réplica
+READ_ONLY_METHODS = {"GET", "HEAD"}
+
+
+def get_db(request: HTTPConnection):
     """
     Genera una sesión nueva de base de datos para inyectar en rutas de FastAPI.
 
+    Las peticiones GET/HEAD marcan la sesión como de solo lectura para que
+    RoutingSession pueda enviarlas a una réplica. Los WebSocket (sin método
+    HTTP) solo leen al conectarse y se tratan como GET.
+
     Yields:
         Session: Sesión SQLAlchemy.
     """
     db = SessionLocal()
+    db.info["read_only"] = request.scope.get("method", "GET") in READ_ONLY_METHODS
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_db(request: Request):
+    """
+    Genera una sesión asíncrona de base de datos para las rutas async.
+
+    Yields:
+        AsyncSession: Sesión SQLAlchemy asíncrona.
+    """
+    async with AsyncSessionLocal() as db:
+        db.info["read_only"] = request.method in READ_ONLY_METHODS
+        yield db
+
+
+def _credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token inválido o expirado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_user_id(token: str) -> int:
+    """
+    Decodifica el JWT y devuelve el `user_id` del payload.
+
+    Raises:
+        HTTPException: 401 si el token es inválido, ha expirado o no trae user_id.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: int = payload.get("user_id")
+    except JWTError:
+        raise _credentials_error()
+
+    if user_id is None:
+        raise _credentials_error()
+    return user_id
+
 # TOKEN: VALIDAR Y OBTENER USUARIO
 def get_current_user(token: str = Depends(oauth2_scheme),db: Session = Depends(get_db)):
     """
     Obtiene el usuario actual autenticado a partir del token JWT.
 
+    El usuario se sirve desde la caché de identidades si está vigente; solo en
+    caso de fallo se consulta la tabla users.
+
     Args:
         token (str): Token JWT extraído automáticamente por FastAPI.
         db (Session): Sesión SQLAlchemy, inyectada.
@@ -104,22 +196,58 @@ def get_current_user(token: str = Depends(oauth2_scheme),db: Session = Depends(g
     Returns:
         User: Instancia del usuario autenticado en base de datos.
     """
-    credentials_error = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Token inválido o expirado",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    user_id = decode_user_id(token)
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("user_id")
-        if user_id is None:
-            raise credentials_error
-    except JWTError:
-        raise credentials_error
+    user = load_cached_user(db, user_id)
+    if user is not None:
+        return user
 
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
-        raise credentials_error
+        raise _credentials_error()
+
+    remember_user(user)
+    return user
 
-    return user
\ No newline at end of file
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Variante asíncrona de get_current_user para las rutas async.
+
+    Returns:
+        User: Usuario autenticado, cargado en la sesión asíncrona de la petición.
+    """
+    user_id = decode_user_id(token)
+
+    user = cached_user(user_id)
+    if user is not None:
+        return await db.merge(user, load=False)
+
+    user = await db.get(User, user_id)
+    if not user:
+        raise _credentials_error()
+
+    remember_user(user)
+    return user
+
+
+# ===== ADMINISTRADORES =====
+ADMIN_ROLE = "admin"
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependencia de los endpoints de operación (/metrics): exige `role == "admin"`.
+
+    Raises:
+        HTTPException: 401 sin un token válido, 403 si el usuario no es administrador.
+
+    Returns:
+        User: El administrador autenticado.
+    """
+    if current_user.role != ADMIN_ROLE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solo para administradores")
+    return current_user
@@ -0,0 +1,161 @@
+"""
+Registro de cambios por tablero para la sincronización incremental.
+
+Cada escritura de una lista o tarjeta llama a `record_change`, que incrementa
+la revisión del tablero y guarda (revisión, entidad, id, operación) en
+`board_changes`. GET /boards/{id}/changes?since=N lee ese registro y devuelve
+solo lo que cambió desde la revisión N: las entidades modificadas y lápidas
+para las borradas.
+
+El registro se recorta por antigüedad (`trim_changes`); `Board.changelog_floor`
+recuerda hasta qué revisión se ha recortado, y un cliente que pida cambios
+anteriores recibe el tablero completo.
+
+Recorte periódico (p. ej. desde cron):
+    python -m app.boards.changes --retention-seconds 604800
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from .events import queue_event
+from .models import Board, BoardChange
+from .revisions import bump_revision
+
+ENTITIES = ("card", "list")
+OPERATIONS = ("upsert", "delete")
+
+
+def record_change(db: Session, board_id: int, entity: str, entity_id: int, op: str = "upsert") -> int:
+    """
+    Registra un cambio en el tablero e incrementa su revisión (sin commit).
+
+    El evento correspondiente se envía a los clientes WebSocket del tablero
+    cuando la transacción se confirma (app/boards/events.py).
+
+    Args:
+        entity (str): "card" o "list".
+        entity_id (int): Id de la entidad (ya debe existir: hacer flush antes
+            de registrar una creación).
+        op (str): "upsert" para altas y modificaciones, "delete" para borrados.
+
+    Returns:
+        int: Revisión del tablero tras el cambio.
+    """
+    return record_changes(db, board_id, entity, [(entity_id, op)])
+
+
+def record_changes(db: Session, board_id: int, entity: str, changes: list[tuple[int, str]]) -> int:
+    """
+    Registra varios cambios de un tablero con una sola revisión (sin commit).
+
+    Para escrituras en lote: un UPDATE de la revisión y un INSERT (executemany)
+    en `board_changes`, en lugar de dos sentencias por entidad.
+
+    Args:
+        changes: [(entity_id, op), ...] con op "upsert" o "delete".
+
+    Returns:
+        int: Revisión del tablero tras los cambios.
+    """
+    if entity not in ENTITIES or any(op not in OPERATIONS for _, op in changes):
+        raise ValueError(f"Cambio no válido: {entity}/{[op for _, op in changes]}")
+
+    revision = bump_revision(db, board_id)
+    db.execute(insert(BoardChange.__table__), [
+        {"board_id": board_id, "revision": revision, "entity": entity, "entity_id": entity_id, "op": op}
+        for entity_id, op in changes
+    ])
+    for entity_id, op in changes:
+        queue_event(db, {
+            "type": "change",
+            "board_id": board_id,
+            "revision": revision,
+            "entity": entity,
+            "id": entity_id,
+            "op": op,
+        })
+    return revision
+
+
+def latest_changes(db: Session, board_id: int, since: int) -> dict[tuple[str, int], str]:
+    """
+    Última operación de cada entidad cambiada después de `since`.
+
+    Varios cambios de la misma tarjeta se reducen a uno: al cliente solo le
+    interesa su estado final (o que ya no existe).
+
+    Returns:
+        dict: {(entity, entity_id): op}
+    """
+    rows = (
+        db.query(BoardChange.entity, BoardChange.entity_id, BoardChange.op)
+        .filter(BoardChange.board_id == board_id, BoardChange.revision > since)
+        .order_by(BoardChange.revision, BoardChange.id)
+        .all()
+    )
+    return {(entity, entity_id): op for entity, entity_id, op in rows}
+
+
+def trim_changes(db: Session, retention_seconds: Optional[float] = None, now: Optional[datetime] = None) -> int:
+    """
+    Borra los cambios más antiguos que la retención y sube `changelog_floor`.
+
+    Args:
+        retention_seconds (float): Antigüedad máxima; por defecto
+            CHANGELOG_RETENTION_SECONDS.
+        now (datetime): Instante de referencia (inyectable en pruebas).
+
+    Returns:
+        int: Número de entradas borradas (sin commit).
+    """
+    retention = settings.CHANGELOG_RETENTION_SECONDS if retention_seconds is None else retention_seconds
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(seconds=retention)
+
+    trimmed = (
+        select(BoardChange.board_id, func.max(BoardChange.revision).label("floor"))
+        .where(BoardChange.created_at < cutoff)
+        .group_by(BoardChange.board_id)
+        .subquery()
+    )
+    # Las revisiones crecen con el tiempo: el nuevo suelo nunca es menor que el anterior
+    new_floor = select(trimmed.c.floor).where(trimmed.c.board_id == Board.id).scalar_subquery()
+    db.execute(
+        update(Board)
+        .where(Board.id.in_(select(trimmed.c.board_id)))
+        .values(changelog_floor=new_floor)
+        .execution_options(synchronize_session=False)
+    )
+    result = db.execute(
+        delete(BoardChange)
+        .where(BoardChange.created_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recorta el registro de cambios de los tableros.")
+    parser.add_argument(
+        "--retention-seconds",
+        type=float,
+        default=settings.CHANGELOG_RETENTION_SECONDS,
+        help="Antigüedad máxima de los cambios que se conservan",
+    )
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        deleted = trim_changes(db, args.retention_seconds)
+        db.commit()
+
+    print(f"Cambios borrados: {deleted}")
+    return deleted
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Difusión en tiempo real de los cambios de tableros (WebSocket /ws/boards/{id}).
+
+Flujo de un evento:
+1. `record_change` (app/boards/changes.py) deja el evento pendiente en la
+   sesión con `queue_event`.
+2. Al confirmarse la transacción se publica en el backend de difusión; si
+   hay rollback se descarta, así nunca se anuncia un cambio que no existe.
+3. El backend entrega el mensaje al `BoardHub` de cada worker, que lo copia
+   en la cola acotada de cada suscriptor del tablero.
+
+El evento se serializa a JSON una sola vez y la misma cadena se envía a todos
+los suscriptores. Un cliente lento cuya cola se llena se desconecta (1013) en
+lugar de frenar al resto o acumular memoria; al reconectar se pone al día con
+GET /boards/{id}/changes?since=.
+
+Backends (`settings.BROADCAST_BACKEND`):
+    local: solo los clientes del propio proceso (un worker, desarrollo).
+    postgres: LISTEN/NOTIFY sobre la base de datos; llega a todos los workers
+        sin servicios externos adicionales.
+"""
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+# Clave de session.info con los eventos pendientes de commit
+PENDING_EVENTS = "board_events"
+
+# Marca que recibe un suscriptor cuya cola se ha desbordado
+OVERFLOW = object()
+
+
+# ===== SUSCRIPTORES =====
+class Subscriber:
+    """Cliente conectado a un tablero, con su cola acotada de mensajes."""
+
+    def __init__(self, board_id: int, maxsize: int):
+        self.board_id = board_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+
+class BoardHub:
+    """
+    Reparto de mensajes a los suscriptores de cada tablero en este proceso.
+
+    Todas las operaciones sobre colas ocurren en el event loop; desde otros
+    hilos (rutas síncronas) se usa `dispatch_threadsafe`.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.delivered = 0
+        self.dropped = 0
+
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        self._loop = loop
+
+    def subscribe(self, board_id: int) -> Subscriber:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(board_id, self.queue_size)
+        self._subscribers.setdefault(board_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.board_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.board_id]
+
+    def dispatch(self, board_id: int, message: str) -> None:
+        """Copia `message` en la cola de cada suscriptor del tablero (en el loop)."""
+        for subscriber in list(self._subscribers.get(board_id, ())):
+            try:
+                subscriber.queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                # Cliente demasiado lento: se vacía su cola y se le pide que se vaya
+                self.dropped += 1
+                self.unsubscribe(subscriber)
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(OVERFLOW)
+
+    def dispatch_threadsafe(self, board_id: int, message: str) -> None:
+        """Como `dispatch`, pero invocable desde cualquier hilo. Sin loop, no hace nada."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self.dispatch, board_id, message)
+
+    def stats(self) -> dict:
+        return {
+            "boards": len(self._subscribers),
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+# ===== BACKENDS DE DIFUSIÓN =====
+class LocalBroadcast:
+    """Entrega directa al hub del proceso (sin comunicación entre workers)."""
+
+    def __init__(self):
+        self.hub: Optional[BoardHub] = None
+
+    async def start(self, hub: BoardHub) -> None:
+        self.hub = hub
+
+    def publish(self, board_id: int, message: str) -> None:
+        if self.hub is not None:
+            self.hub.dispatch_threadsafe(board_id, message)
+
+    async def stop(self) -> None:
+        self.hub = None
+
+
+class PostgresBroadcast:
+    """
+    Difusión entre workers con LISTEN/NOTIFY de PostgreSQL (vía asyncpg).
+
+    Cada worker escucha el canal y reparte lo que recibe a su hub, incluidos
+    sus propios mensajes, por lo que publicar no entrega nada localmente.
+    El payload es "board_id:json" para enrutar sin volver a parsear el JSON.
+
+    Si se pierde la conexión (reinicio o failover de la base de datos) se
+    reconecta con espera exponencial y se vuelve a emitir el LISTEN. Las
+    notificaciones enviadas mientras tanto se pierden; los clientes se ponen
+    al día con GET /boards/{id}/changes?since= al reconectar.
+    """
+
+    # Espera entre intentos de reconexión: se duplica hasta el máximo
+    RECONNECT_MIN_SECONDS = 0.5
+    RECONNECT_MAX_SECONDS = 30.0
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self.hub: Optional[BoardHub] = None
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._tasks: set = set()
+        self.reconnects = 0
+
+    async def start(self, hub: BoardHub) -> None:
+        self.hub = hub
+        self._loop = asyncio.get_running_loop()
+        self._lock = asyncio.Lock()
+        await self._connect()
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    def _on_terminated(self, connection) -> None:
+        if self.hub is None or connection is not self._conn:
+            return
+        logger.warning("Conexión LISTEN de eventos de tablero perdida; reconectando")
+        self._spawn(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.RECONNECT_MIN_SECONDS
+        while self.hub is not None:
+            await asyncio.sleep(delay)
+            if self.hub is None:
+                return
+            try:
+                async with self._lock:
+                    await self._connect()
+            except Exception:
+                logger.warning(
+                    "No se pudo reconectar la escucha de eventos; reintento en %.1f s", delay, exc_info=True,
+                )
+                delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+                continue
+            self.reconnects += 1
+            logger.info("Escucha de eventos de tablero restablecida")
+            return
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        board_id, _, message = payload.partition(":")
+        self.hub.dispatch(int(board_id), message)
+
+    def publish(self, board_id: int, message: str) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._schedule_notify, f"{board_id}:{message}")
+
+    def _schedule_notify(self, payload: str) -> None:
+        self._spawn(self._notify(payload))
+
+    def _spawn(self, coro) -> None:
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _notify(self, payload: str) -> None:
+        # Una conexión asyncpg no admite operaciones concurrentes
+        async with self._lock:
+            try:
+                await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            except Exception:
+                logger.exception("No se pudo publicar el evento de tablero")
+
+    async def stop(self) -> None:
+        # Sin hub, el cierre propio (o una reconexión en curso) no vuelve a conectar
+        self.hub = None
+        for task in list(self._tasks):
+            task.cancel()
+        if self._conn is not None and not self._conn.is_closed():
+            self._conn.remove_termination_listener(self._on_terminated)
+            await self._conn.remove_listener(self.channel, self._on_notify)
+            await self._conn.close()
+        self._conn = None
+        self._loop = None
+
+
+def _postgres_dsn(url: str) -> str:
+    """URL de SQLAlchemy -> DSN de asyncpg (sin el sufijo de driver)."""
+    scheme, sep, rest = url.partition("://")
+    return f"{scheme.split('+')[0]}{sep}{rest}"
+
+
+# Backends disponibles por nombre (BROADCAST_BACKEND)
+BROADCAST_BACKENDS = {
+    "local": lambda: LocalBroadcast(),
+    "postgres": lambda: PostgresBroadcast(
+        _postgres_dsn(settings.BROADCAST_URL or DATABASE_URL),
+        settings.BROADCAST_CHANNEL,
+    ),
+}
+
+
+# ===== FACHADA =====
+class BoardEvents:
+    """Hub del proceso + backend de difusión configurado."""
+
+    def __init__(self, queue_size: int, backend_name: str):
+        if backend_name not in BROADCAST_BACKENDS:
+            raise ValueError(f"BROADCAST_BACKEND desconocido: {backend_name}")
+        self.hub = BoardHub(queue_size)
+        self.backend = BROADCAST_BACKENDS[backend_name]()
+
+    async def start(self) -> None:
+        """Arranca el backend en el event loop actual (lifespan de la app)."""
+        self.hub.bind(asyncio.get_running_loop())
+        await self.backend.start(self.hub)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+        self.hub.bind(None)
+
+    def publish(self, event_data: dict) -> None:
+        """Serializa el evento una vez y lo publica para su tablero."""
+        message = json.dumps(event_data, separators=(",", ":"))
+        self.backend.publish(event_data["board_id"], message)
+
+
+board_events = BoardEvents(settings.WS_QUEUE_SIZE, settings.BROADCAST_BACKEND)
+
+
+# ===== PUBLICACIÓN TRAS COMMIT =====
+def queue_event(db: Session, event_data: dict) -> None:
+    """Deja un evento pendiente; se publica solo si la transacción se confirma."""
+    db.info.setdefault(PENDING_EVENTS, []).append(event_data)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    for event_data in session.info.pop(PENDING_EVENTS, ()):
+        board_events.publish(event_data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(PENDING_EVENTS, None)
@@ -0,0 +1,138 @@
+"""
+Exportación de un tablero completo en NDJSON, en streaming y con memoria acotada.
+
+El resultado es una línea JSON por entidad, en este orden:
+
+    {"type": "export", "version": 1, "board_id": ..., "exported_at": ...}
+    {"type": "board", "data": {...}}
+    {"type": "list", "data": {...}}        (por posición)
+    {"type": "card", "data": {...}}        (por lista y rank)
+    {"type": "time_entry", "data": {...}}  (por tarjeta)
+
+Cada `data` lleva todas las columnas de la tabla, de modo que la exportación
+puede volver a importarse sin pérdida.
+
+Toda la lectura se hace con una conexión propia dentro de una única
+transacción REPEATABLE READ (en SQLite, la transacción de lectura ya es una
+foto consistente), así que el fichero refleja un único estado del tablero
+aunque haya escrituras mientras se descarga. Las consultas usan cursores de
+servidor (`yield_per` / `stream_results`): se leen y se emiten
+EXPORT_BATCH_SIZE filas cada vez, y la memoria no crece con el tamaño del
+tablero. Opcionalmente se comprime con gzip al vuelo (`gzip_stream`).
+"""
+import zlib
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import engine as primary_engine
+from .models import Board, Card, List, TimeEntry
+
+EXPORT_FORMAT_VERSION = 1
+
+# Nivel de gzip: compresión razonable sin frenar el streaming
+GZIP_LEVEL = 6
+
+
+def _line(record: dict) -> bytes:
+    # Fechas en ISO 8601 y Numeric (horas) como cadena, sin perder precisión
+    return to_json(record) + b"\n"
+
+
+def _stream_rows(conn: Connection, entity: str, stmt, batch_size: int) -> Iterator[bytes]:
+    """Ejecuta `stmt` con cursor de servidor y emite un bloque de líneas por lote."""
+    result = conn.execution_options(yield_per=batch_size).execute(stmt)
+    for partition in result.mappings().partitions():
+        yield b"".join(_line({"type": entity, "data": dict(row)}) for row in partition)
+
+
+def export_engine(db: Session) -> Engine:
+    """
+    Engine síncrono con el que leer la exportación.
+
+    Normalmente el de la sesión de la petición (primario o réplica). En modo
+    ASYNC_DB la sesión va sobre un engine asíncrono, que no puede usarse desde
+    el hilo que recorre el stream; entonces se lee del primario síncrono.
+    """
+    bind = db.get_bind()
+    if getattr(bind.dialect, "is_async", False):
+        return primary_engine
+    return bind
+
+
+def _snapshot_connection(engine: Engine) -> Connection:
+    """Conexión con una transacción de lectura consistente (foto única)."""
+    if engine.dialect.name == "postgresql":
+        conn = engine.connect().execution_options(isolation_level="REPEATABLE READ")
+        conn.begin()
+        conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+        return conn
+    conn = engine.connect()
+    conn.begin()
+    if engine.dialect.name == "sqlite":
+        # pysqlite no abre la transacción hasta la primera escritura
+        conn.exec_driver_sql("BEGIN")
+    return conn
+
+
+def export_board(engine: Engine, board_id: int, batch_size: int = None) -> Iterator[bytes]:
+    """
+    Genera la exportación NDJSON de un tablero en bloques de bytes.
+
+    Args:
+        engine (Engine): Engine síncrono del que se abre la conexión de la foto.
+        board_id (int): Tablero a exportar (el permiso se comprueba antes).
+        batch_size (int | None): Filas por lote; por defecto EXPORT_BATCH_SIZE.
+
+    Yields:
+        bytes: Una o varias líneas NDJSON completas.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    conn = _snapshot_connection(engine)
+    try:
+        board = conn.execute(select(Board.__table__).where(Board.id == board_id)).mappings().first()
+        if board is None:
+            return
+        yield _line({
+            "type": "export",
+            "version": EXPORT_FORMAT_VERSION,
+            "board_id": board_id,
+            "exported_at": datetime.now(timezone.utc),
+        })
+        yield _line({"type": "board", "data": dict(board)})
+
+        lists = List.__table__
+        yield from _stream_rows(conn, "list", (
+            select(lists).where(lists.c.board_id == board_id).order_by(lists.c.position, lists.c.id)
+        ), batch_size)
+
+        cards = Card.__table__
+        yield from _stream_rows(conn, "card", (
+            select(cards).where(cards.c.board_id == board_id)
+            .order_by(cards.c.list_id, cards.c.rank, cards.c.position, cards.c.id)
+        ), batch_size)
+
+        entries = TimeEntry.__table__
+        yield from _stream_rows(conn, "time_entry", (
+            select(entries).join(cards, cards.c.id == entries.c.card_id)
+            .where(cards.c.board_id == board_id)
+            .order_by(entries.c.card_id, entries.c.id)
+        ), batch_size)
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """Comprime al vuelo un flujo de bytes en formato gzip."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,371 @@
+"""
+Importación masiva de tableros desde NDJSON (el formato de app/boards/export.py).
+
+Crear cada tarjeta con POST /cards/ supone un commit y una comprobación de
+permisos por tarjeta. Aquí el fichero se procesa en dos pasadas en streaming,
+sin cargarlo entero en memoria:
+
+1. `validate_lines`: valida cada línea (tipo, esquema y referencias a listas y
+   tarjetas anteriores) y cuenta las líneas. Solo guarda conjuntos de ids.
+2. `run_import`: crea un tablero nuevo del usuario que importa y escribe
+   listas, tarjetas y registros de tiempo con `insert()` por lotes de
+   IMPORT_BATCH_SIZE filas (executemany con RETURNING para obtener los ids
+   nuevos). Cada lote se confirma en la misma transacción que el punto de
+   control del trabajo (BoardImport.lines_done) y que su tabla de ids
+   (ImportIdMap), así que una importación interrumpida se reanuda desde el
+   último lote confirmado sin duplicar filas.
+
+Los ids del fichero se reasignan. Los usuarios del fichero no tienen por qué
+existir aquí: por defecto el creador de las tarjetas y de los registros de
+tiempo pasa a ser quien importa y el responsable queda vacío; con
+`keep_users=True` se conservan los ids de usuario que existan en esta base de
+datos (restaurar en la misma instancia).
+
+Uso:
+    python -m app.boards.importer board.ndjson --user-id 1
+    python -m app.boards.importer board.ndjson.gz --user-id 1 --resume 7
+"""
+import argparse
+import gzip
+import json
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, IO, Iterable, Iterator, Optional
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from .export import EXPORT_FORMAT_VERSION
+from .models import Board, BoardImport, Card, ImportIdMap, List, TimeEntry, User
+from .schemas import ImportBoard, ImportCard, ImportList, ImportTimeEntry
+
+# Tipo de línea -> (esquema, tabla destino)
+ROW_TYPES: dict[str, tuple[type[BaseModel], object]] = {
+    "list": (ImportList, List.__table__),
+    "card": (ImportCard, Card.__table__),
+    "time_entry": (ImportTimeEntry, TimeEntry.__table__),
+}
+
+
+class ImportValidationError(ValueError):
+    """El fichero no es una exportación válida; `line` es la línea (1-based)."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Línea {line}: {message}")
+        self.line = line
+
+
+@dataclass
+class ImportSummary:
+    """Resultado de la pasada de validación."""
+    total_lines: int = 0
+    counts: dict = field(default_factory=lambda: {"list": 0, "card": 0, "time_entry": 0})
+
+
+def _records(lines: Iterable) -> Iterator[tuple[int, dict]]:
+    """(número de línea, objeto JSON) de cada línea no vacía."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ImportValidationError(line_no, "JSON inválido")
+        if not isinstance(record, dict):
+            raise ImportValidationError(line_no, "se esperaba un objeto JSON")
+        yield line_no, record
+
+
+def _parse(line_no: int, model: type[BaseModel], data) -> BaseModel:
+    try:
+        return model.model_validate(data)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        where = ".".join(str(part) for part in error["loc"])
+        raise ImportValidationError(line_no, f"{where}: {error['msg']}" if where else error["msg"])
+
+
+def validate_lines(lines: Iterable) -> ImportSummary:
+    """
+    Pasada de validación: comprueba el fichero completo sin escribir nada.
+
+    Reglas: la primera línea es la cabecera "export" con una versión
+    soportada, la segunda el "board", y cada tarjeta (registro de tiempo)
+    referencia una lista (tarjeta) que aparece antes en el fichero.
+
+    Raises:
+        ImportValidationError: En la primera línea inválida.
+    """
+    summary = ImportSummary()
+    seen = {"list": set(), "card": set(), "time_entry": set()}
+    position = 0
+
+    for line_no, record in _records(lines):
+        summary.total_lines = line_no
+        kind = record.get("type")
+        position += 1
+
+        if position == 1:
+            if kind != "export" or record.get("version") != EXPORT_FORMAT_VERSION:
+                raise ImportValidationError(line_no, "falta la cabecera de exportación o la versión no es compatible")
+            continue
+        if position == 2:
+            if kind != "board":
+                raise ImportValidationError(line_no, "se esperaba la línea del tablero")
+            _parse(line_no, ImportBoard, record.get("data"))
+            continue
+        if kind not in ROW_TYPES:
+            raise ImportValidationError(line_no, f"tipo de línea desconocido: {kind!r}")
+
+        row = _parse(line_no, ROW_TYPES[kind][0], record.get("data"))
+        if row.id in seen[kind]:
+            raise ImportValidationError(line_no, f"{kind} {row.id} duplicado")
+        if kind == "card" and row.list_id not in seen["list"]:
+            raise ImportValidationError(line_no, f"la lista {row.list_id} no aparece antes en el fichero")
+        if kind == "time_entry" and row.card_id not in seen["card"]:
+            raise ImportValidationError(line_no, f"la tarjeta {row.card_id} no aparece antes en el fichero")
+        seen[kind].add(row.id)
+        summary.counts[kind] += 1
+
+    if position < 2:
+        raise ImportValidationError(summary.total_lines + 1, "fichero incompleto: falta la cabecera o el tablero")
+    return summary
+
+
+def start_import(db: Session, user_id: int, total_lines: Optional[int] = None) -> BoardImport:
+    """Crea (y confirma) el trabajo de importación de `user_id`."""
+    job = BoardImport(user_id=user_id, status="running", lines_done=0, total_lines=total_lines)
+    db.add(job)
+    db.commit()
+    return job
+
+
+class _Importer:
+    """Estado de la pasada de escritura de un trabajo (mapas de ids y usuarios)."""
+
+    def __init__(self, db: Session, job: BoardImport, keep_users: bool):
+        self.db = db
+        self.job = job
+        self.keep_users = keep_users
+        self.ids = {"list": {}, "card": {}}
+        self.users: dict[int, bool] = {}
+        if job.id is not None:
+            rows = db.execute(
+                select(ImportIdMap.entity, ImportIdMap.source_id, ImportIdMap.target_id)
+                .where(ImportIdMap.import_id == job.id)
+            )
+            for entity, source_id, target_id in rows:
+                self.ids[entity][source_id] = target_id
+
+    def _existing_users(self, user_ids: set) -> None:
+        missing = {uid for uid in user_ids if uid is not None and uid not in self.users}
+        if missing:
+            found = set(self.db.scalars(select(User.id).where(User.id.in_(missing))))
+            self.users.update({uid: uid in found for uid in missing})
+
+    def _user(self, user_id: Optional[int], fallback: Optional[int]) -> Optional[int]:
+        if self.keep_users and user_id is not None and self.users.get(user_id):
+            return user_id
+        return fallback
+
+    def _values(self, kind: str, row: BaseModel) -> dict:
+        values = row.model_dump(exclude={"id"})
+        if kind == "list":
+            values["board_id"] = self.job.board_id
+        elif kind == "card":
+            values["board_id"] = self.job.board_id
+            values["list_id"] = self.ids["list"][row.list_id]
+            values["created_by_id"] = self._user(row.created_by_id, self.job.user_id)
+            values["responsible_id"] = self._user(row.responsible_id, None)
+        else:
+            values["card_id"] = self.ids["card"][row.card_id]
+            values["user_id"] = self._user(row.user_id, self.job.user_id)
+        return values
+
+    def _insert_returning_ids(self, table, values: list[dict]) -> list[int]:
+        """Inserta `values` y devuelve los ids nuevos en el mismo orden."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            # SQLite no sabe ordenar RETURNING por parámetros (SQLAlchemy insertaría
+            # fila a fila). La transacción tiene el bloqueo de escritura, así que
+            # los rowid nuevos son consecutivos en el orden de inserción.
+            return sorted(self.db.scalars(insert(table).returning(table.c.id), values))
+        return self.db.scalars(insert(table).returning(table.c.id, sort_by_parameter_order=True), values).all()
+
+    def write_batch(self, kind: str, rows: list[BaseModel]) -> None:
+        """Inserta un lote del mismo tipo y guarda la correspondencia de ids."""
+        if self.keep_users:
+            self._existing_users({
+                uid for row in rows
+                for uid in (getattr(row, "created_by_id", None), getattr(row, "responsible_id", None),
+                            getattr(row, "user_id", None))
+            })
+        table = ROW_TYPES[kind][1]
+        values = [self._values(kind, row) for row in rows]
+        if kind == "time_entry":
+            self.db.execute(insert(table), values)
+            return
+
+        new_ids = self._insert_returning_ids(table, values)
+        mapping = [
+            {"import_id": self.job.id, "entity": kind, "source_id": row.id, "target_id": new_id}
+            for row, new_id in zip(rows, new_ids)
+        ]
+        self.db.execute(insert(ImportIdMap.__table__), mapping)
+        self.ids[kind].update((m["source_id"], m["target_id"]) for m in mapping)
+
+    def checkpoint(self, line_no: int) -> None:
+        """Confirma lo pendiente junto con el avance del trabajo."""
+        self.job.lines_done = line_no
+        self.job.updated_at = datetime.now(timezone.utc)
+        self.db.commit()
+
+
+def run_import(
+    db: Session,
+    job: BoardImport,
+    lines: Iterable,
+    batch_size: Optional[int] = None,
+    keep_users: bool = False,
+    progress: Optional[Callable[[BoardImport], None]] = None,
+) -> BoardImport:
+    """
+    Pasada de escritura: importa (o reanuda) `job` a partir de `lines`.
+
+    `lines` debe ser el mismo fichero validado con `validate_lines`; las líneas
+    hasta `job.lines_done` se saltan. `progress` se llama tras cada lote
+    confirmado.
+
+    Raises:
+        ImportValidationError: Si el fichero no es válido (el trabajo queda "failed").
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    state = _Importer(db, job, keep_users)
+    pending: list[BaseModel] = []
+    pending_kind = None
+    last_line = job.lines_done
+
+    def flush(line_no: int) -> None:
+        nonlocal pending
+        if pending:
+            state.write_batch(pending_kind, pending)
+            pending = []
+        state.checkpoint(line_no)
+        if progress:
+            progress(job)
+
+    try:
+        for line_no, record in _records(lines):
+            if line_no <= job.lines_done:
+                continue
+            kind = record.get("type")
+            if kind == "export":
+                continue
+            if kind == "board":
+                board = _parse(line_no, ImportBoard, record.get("data"))
+                new_board = Board(name=board.name, user_id=job.user_id)
+                db.add(new_board)
+                db.flush()
+                job.board_id = new_board.id
+                flush(line_no)
+                continue
+            if kind not in ROW_TYPES:
+                raise ImportValidationError(line_no, f"tipo de línea desconocido: {kind!r}")
+
+            if pending and (kind != pending_kind or len(pending) >= batch_size):
+                flush(last_line)
+            pending_kind = kind
+            pending.append(_parse(line_no, ROW_TYPES[kind][0], record.get("data")))
+            last_line = line_no
+
+        flush(last_line)
+    except Exception as exc:
+        db.rollback()
+        job.status = "failed"
+        job.error = str(exc)
+        db.commit()
+        raise
+
+    job.status = "done"
+    job.error = None
+    db.execute(delete(ImportIdMap).where(ImportIdMap.import_id == job.id))
+    db.commit()
+    if progress:
+        progress(job)
+    return job
+
+
+def open_lines(fileobj: IO[bytes]) -> IO[bytes]:
+    """Lee el fichero tal cual o descomprimiéndolo si es gzip (detectado por la cabecera)."""
+    head = fileobj.read(2)
+    fileobj.seek(0)
+    return gzip.GzipFile(fileobj=fileobj, mode="rb") if head == b"\x1f\x8b" else fileobj
+
+
+async def spool_body(request: Request) -> AsyncIterator[IO[bytes]]:
+    """
+    Dependencia: vuelca el cuerpo de la petición a un fichero temporal.
+
+    La importación recorre el fichero dos veces (validar y escribir); el
+    cuerpo se guarda en memoria hasta IMPORT_SPOOL_MEMORY_BYTES y en disco a
+    partir de ahí.
+
+    Raises:
+        HTTPException: 413 si supera IMPORT_MAX_BYTES.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MEMORY_BYTES)
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.IMPORT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Fichero de importación demasiado grande",
+                )
+            spool.write(chunk)
+        spool.seek(0)
+        yield spool
+    finally:
+        spool.close()
+
+
+def main(argv=None):
+    from ..database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Importa un tablero desde NDJSON (formato de exportación).")
+    parser.add_argument("path", help="Fichero .ndjson o .ndjson.gz")
+    parser.add_argument("--user-id", type=int, required=True, help="Usuario propietario del tablero importado")
+    parser.add_argument("--resume", type=int, help="Id de un trabajo interrumpido a reanudar")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument("--keep-users", action="store_true", help="Conservar ids de usuario existentes")
+    args = parser.parse_args(argv)
+
+    with open(args.path, "rb") as raw:
+        summary = validate_lines(open_lines(raw))
+        print(f"Validado: {summary.total_lines} líneas ({summary.counts})")
+
+        with SessionLocal() as db:
+            if args.resume:
+                job = db.get(BoardImport, args.resume)
+                if job is None or job.user_id != args.user_id:
+                    parser.error(f"No existe la importación {args.resume} de este usuario")
+                if job.status == "done":
+                    parser.error(f"La importación {args.resume} ya terminó")
+            else:
+                job = start_import(db, args.user_id, summary.total_lines)
+
+            def report(job):
+                print(f"Importación {job.id}: {job.lines_done}/{summary.total_lines} líneas")
+
+            raw.seek(0)
+            run_import(db, job, open_lines(raw), args.batch_size, args.keep_users, report)
+            print(f"Tablero {job.board_id} importado")
+            return job.id
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,13 @@
 Modelos ORM principales del sistema de gestión de tableros Kanban.
 
 Este módulo define las tablas y relaciones para usuarios, tableros, listas,
-tarjetas, registros de tiempo y membresías usando SQLAlchemy.
+tarjetas, registros de tiempo, membresías, importaciones y claves de
+idempotencia usando SQLAlchemy.
 """
 from datetime import datetime, timezone
 from sqlalchemy import (
     Column,
+    PrimaryKeyConstraint,
     Integer,
     String,
     Text,
@@ -15,6 +17,9 @@ from sqlalchemy import (
     Boolean,
     Numeric,
     ForeignKey,
+    Index,
+    JSON,
+    LargeBinary,
     UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
@@ -72,6 +77,10 @@ class Board(Base):
         id (int): Identificador único de tablero.
         name (str): Nombre del tablero.
         user_id (int): Usuario propietario del tablero.
+        revision (int): Contador que aumenta con cada cambio en listas o tarjetas
+            (ver app/boards/revisions.py).
+        changelog_floor (int): Revisión desde la que el registro de cambios está
+            completo; lo anterior se ha recortado (ver app/boards/changes.py).
         created_at (datetime): Fecha de creación.
     
     Relaciones:
@@ -79,12 +88,15 @@ class Board(Base):
         lists: Listas asociadas.
         cards: Tarjetas asociadas.
         members: Miembros del tablero.
+        changes: Registro de cambios para sincronización incremental.
     """
     __tablename__ = "boards"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(150), nullable=False)
     user_id = Column(Integer,ForeignKey("users.id", ondelete="CASCADE"),nullable=False,)
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
+    changelog_floor = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
     # Relaciones
@@ -92,6 +104,7 @@ class Board(Base):
     lists = relationship("List",back_populates="board",cascade="all, delete-orphan",passive_deletes=True,)
     cards = relationship("Card",back_populates="board",cascade="all, delete-orphan",passive_deletes=True,)
     members = relationship("BoardMember",back_populates="board", cascade="all, delete-orphan",passive_deletes=True,)
+    changes = relationship("BoardChange",back_populates="board",cascade="all, delete-orphan",passive_deletes=True,)
 
 
 class List(Base):
@@ -139,9 +152,14 @@ class Card(Base):
         responsible_id (int): Usuario responsable.
         created_by_id (int): Usuario creador.
         created_at/updated_at/completed_at: Tiempos de registro.
-        position (int): Para orden en la lista.
+        position (int): Orden heredado (índice denso, previo a los ranks).
+        rank (str): Clave lexicográfica que define el orden dentro de la lista.
         priority (str): Nivel de prioridad.
         archived (bool): Indica si está archivada.
+        version (int): Versión para concurrencia optimista; cada cambio de la
+            tarjeta la incrementa y solo se aplica si no ha cambiado desde la
+            lectura. Reequilibrar ranks de la lista no la cambia (ver
+            app/cards/versioning.py).
 
     Relaciones:
         board: Tablero dueño.
@@ -152,6 +170,11 @@ class Card(Base):
     """
 
     __tablename__ = "cards"
+    __table_args__ = (
+        Index("ix_cards_list_rank", "list_id", "rank"),
+        # Lecturas por tablero y filtro de permisos de la búsqueda (app/search)
+        Index("ix_cards_board", "board_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     board_id = Column(Integer,ForeignKey("boards.id", ondelete="CASCADE"),nullable=False,)
@@ -167,8 +190,13 @@ class Card(Base):
     completed_at = Column(DateTime, nullable=True)
 
     position = Column(Integer, nullable=False, default=0)
+    rank = Column(String(64), nullable=True)
     priority = Column(String(20), nullable=True)
     archived = Column(Boolean, nullable=False, default=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # UPDATE/DELETE del ORM: "... WHERE id = :id AND version = :leída" (StaleDataError si no coincide)
+    __mapper_args__ = {"version_id_col": version}
 
     #codigo semana 3
     @property
@@ -176,10 +204,16 @@ class Card(Base):
         """
         Alias lógico para exponer el orden de la tarjeta en la API.
 
-        - La base de datos usa `position`
-        - La API (Semana 3) usa `order`
+        - La base de datos ordena por `rank` (ver app/cards/ranking.py)
+        - La API (Semana 3) usa `order`, el índice dentro de la lista, que las
+          rutas calculan al leer. Si no se ha calculado, se usa `position`.
         """
-        return self.position
+        computed = self.__dict__.get("_order")
+        return computed if computed is not None else self.position
+
+    @order.setter
+    def order(self, value: int) -> None:
+        self.__dict__["_order"] = value
 
 
 
@@ -235,17 +269,23 @@ class BoardMember(Base):
         id (int): Identificador único.
         board_id (int): Tablero asociado.
         user_id (int): Usuario asociado.
-        role (str): Rol dentro del tablero.
+        role (str): Rol dentro del tablero: "viewer", "editor" u "owner"
+            (ver app/boards/permissions.py).
 
     Restricciones:
         uq_board_user: Un usuario sólo puede estar una vez en cada tablero.
+        ix_board_members_user_board: Tableros compartidos con un usuario
+            (listado y comprobación de acceso) sin leer la tabla.
 
     Relaciones:
         board: Tablero al que pertenece la membresía.
         user: Usuario relacionado.
     """
     __tablename__ = "board_members"
-    __table_args__ = (UniqueConstraint("board_id", "user_id", name="uq_board_user"),)
+    __table_args__ = (
+        UniqueConstraint("board_id", "user_id", name="uq_board_user"),
+        Index("ix_board_members_user_board", "user_id", "board_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     board_id = Column(Integer,ForeignKey("boards.id", ondelete="CASCADE"),nullable=False,)
@@ -254,4 +294,129 @@ class BoardMember(Base):
 
     # Relaciones
     board = relationship("Board", back_populates="members")
-    user = relationship("User", back_populates="board_memberships")
\ No newline at end of file
+    user = relationship("User", back_populates="board_memberships")
+
+class BoardChange(Base):
+    """
+    Entrada del registro de cambios de un tablero (sincronización incremental).
+
+    Cada escritura de una lista o tarjeta añade una fila con la revisión del
+    tablero que produjo. Los borrados quedan como lápidas (op="delete") para
+    que los clientes puedan eliminar la entidad de su copia local.
+
+    Campos principales:
+        id (int): Identificador único.
+        board_id (int): Tablero modificado.
+        revision (int): Revisión del tablero tras el cambio.
+        entity (str): "card" o "list".
+        entity_id (int): Id de la tarjeta o lista afectada.
+        op (str): "upsert" o "delete".
+        created_at (datetime): Momento del cambio (para el recorte por antigüedad).
+
+    Relaciones:
+        board: Tablero al que pertenece el cambio.
+    """
+    __tablename__ = "board_changes"
+    __table_args__ = (
+        Index("ix_board_changes_board_revision", "board_id", "revision"),
+        Index("ix_board_changes_created_at", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    board_id = Column(Integer,ForeignKey("boards.id", ondelete="CASCADE"),nullable=False,)
+    revision = Column(Integer, nullable=False)
+    entity = Column(String(10), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    # Relaciones
+    board = relationship("Board", back_populates="changes")
+
+
+class BoardImport(Base):
+    """
+    Trabajo de importación de un tablero desde NDJSON (ver app/boards/importer.py).
+
+    Hace de punto de control: cada lote insertado se confirma en la misma
+    transacción que el avance (`lines_done`), así que una importación
+    interrumpida se reanuda desde la última línea confirmada.
+
+    Campos principales:
+        id (int): Identificador único.
+        user_id (int): Usuario que importa (propietario del tablero creado).
+        board_id (int): Tablero creado (nulo hasta procesar la línea "board").
+        status (str): "running", "done" o "failed".
+        lines_done (int): Líneas del fichero ya importadas y confirmadas.
+        total_lines (int): Líneas del fichero (de la pasada de validación).
+        error (Text): Motivo del fallo, si lo hubo.
+        created_at/updated_at (datetime): Inicio y último avance.
+    """
+    __tablename__ = "board_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer,ForeignKey("users.id", ondelete="CASCADE"),nullable=False,)
+    board_id = Column(Integer,ForeignKey("boards.id", ondelete="SET NULL"),nullable=True,)
+    status = Column(String(20), nullable=False, default="running")
+    lines_done = Column(Integer, nullable=False, default=0)
+    total_lines = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class ImportIdMap(Base):
+    """
+    Correspondencia id de origen -> id nuevo de una importación en curso.
+
+    Las tarjetas referencian listas y los registros de tiempo tarjetas por el
+    id del fichero; al reanudar se recupera de aquí el id asignado. Las filas
+    se borran al terminar la importación.
+
+    Campos principales:
+        import_id (int): Importación a la que pertenece.
+        entity (str): "list" o "card".
+        source_id (int): Id en el fichero.
+        target_id (int): Id creado en esta base de datos.
+    """
+    __tablename__ = "board_import_ids"
+    __table_args__ = (PrimaryKeyConstraint("import_id", "entity", "source_id"),)
+
+    import_id = Column(Integer,ForeignKey("board_imports.id", ondelete="CASCADE"),nullable=False,)
+    entity = Column(String(10), nullable=False)
+    source_id = Column(Integer, nullable=False)
+    target_id = Column(Integer, nullable=False)
+
+
+class IdempotencyKey(Base):
+    """
+    Respuesta de una escritura con cabecera Idempotency-Key (ver app/idempotency.py).
+
+    Se guarda en la base de datos para que un reintento se reproduzca aunque
+    llegue a otro worker o instancia. Mientras la primera ejecución sigue en
+    curso, `status_code` es nulo. Las filas caducadas se borran al reutilizar
+    la clave y con `python -m app.idempotency`.
+
+    Campos principales:
+        user_id, method, path, key: Clave primaria (cada usuario tiene sus claves por ruta).
+        fingerprint (str): SHA-256 del cuerpo de la petición.
+        status_code (int): Estado de la respuesta guardada (nulo = en curso).
+        body (bytes): Cuerpo JSON de la respuesta.
+        headers (JSON): Cabeceras que se reproducen (p. ej. ETag).
+        expires_at (datetime): A partir de entonces la clave se puede reutilizar.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "method", "path", "key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    user_id = Column(Integer,ForeignKey("users.id", ondelete="CASCADE"),nullable=False,)
+    method = Column(String(10), nullable=False)
+    path = Column(String(255), nullable=False)
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    headers = Column(JSON, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
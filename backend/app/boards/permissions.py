@@ -0,0 +1,219 @@
+"""
+Comprobaciones de acceso a tableros compartidas por los routers.
+
+Un usuario accede a un tablero como propietario (`Board.user_id`) o como
+miembro (`BoardMember`) con uno de estos roles:
+
+    viewer: leer el tablero, sus listas y tarjetas.
+    editor: además, crear, editar, mover y borrar tarjetas.
+    owner:  además, gestionar los miembros.
+
+Las decisiones (usuario, tablero) -> rol se guardan en una caché acotada con
+TTL, de modo que las escrituras de tarjetas no consultan `boards` ni
+`board_members` en cada petición.
+
+Se invalida automáticamente cuando un tablero se borra o cambia de dueño y
+cuando cambian sus membresías (BoardMember) a través del ORM en este proceso;
+en otros workers el TTL acota la ventana de decisiones atrasadas. Como la
+publicación de eventos (events.py), la invalidación espera al commit: si se
+hiciera en el flush, otra petición podría volver a cachear el estado anterior
+antes de que la transacción se confirme.
+"""
+from fastapi import HTTPException
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Query, Session, object_session
+from sqlalchemy.sql import Select
+
+from ..cache import TTLCache, register_cache
+from ..config import settings
+from ..loader import loader_for
+from .models import Board, BoardMember, User
+
+VIEWER = "viewer"
+EDITOR = "editor"
+OWNER = "owner"
+
+# Cada rol incluye los permisos de los anteriores
+ROLE_LEVELS = {VIEWER: 1, EDITOR: 2, OWNER: 3}
+
+# Valor cacheado para "sin acceso" (None significa que no hay entrada)
+NO_ACCESS = ""
+
+# Clave de session.info con las decisiones a invalidar tras el commit
+PENDING_INVALIDATIONS = "permission_invalidations"
+
+permission_cache = register_cache(
+    "board_permissions",
+    TTLCache(maxsize=settings.PERMISSION_CACHE_MAX_SIZE, ttl=settings.PERMISSION_CACHE_TTL_SECONDS),
+)
+
+
+def _forbidden() -> HTTPException:
+    return HTTPException(status_code=403, detail="No tienes permiso para este tablero")
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(status_code=404, detail="Tablero no encontrado")
+
+
+def accessible_boards(db: Session, user_id: int) -> Query:
+    """
+    Consulta de los tableros a los que el usuario tiene acceso (propios o compartidos).
+
+    Una sola sentencia: la subconsulta de membresías se resuelve con el índice
+    board_members(user_id, board_id) sin tocar la tabla.
+    """
+    shared = select(BoardMember.board_id).where(BoardMember.user_id == user_id)
+    return db.query(Board).filter(or_(Board.user_id == user_id, Board.id.in_(shared)))
+
+
+def boards_with_role(user_id: int, required: str = VIEWER) -> Select:
+    """
+    Subconsulta con los ids de tableros donde el usuario tiene al menos `required`.
+
+    Para comprobar el permiso dentro de la misma sentencia que escribe
+    (`... WHERE cards.board_id IN (boards_with_role(...))`), sin una consulta
+    previa. Es la misma regla que `board_role`: el propietario siempre, y los
+    miembros según su rol (sin rol = viewer).
+    """
+    roles = [role for role, level in ROLE_LEVELS.items() if level >= ROLE_LEVELS[required]]
+    role_ok = BoardMember.role.in_(roles)
+    if required == VIEWER:
+        role_ok = or_(role_ok, BoardMember.role.is_(None), BoardMember.role.notin_(list(ROLE_LEVELS)))
+    members = select(BoardMember.board_id).where(BoardMember.user_id == user_id, role_ok)
+    return select(Board.id).where(Board.user_id == user_id).union(members)
+
+
+def board_role(db: Session, board: Board, user_id: int) -> str:
+    """Rol del usuario en el tablero, o NO_ACCESS. El propietario no necesita consulta."""
+    if board.user_id == user_id:
+        return OWNER
+    membership = (
+        db.query(BoardMember)
+        .filter(BoardMember.user_id == user_id, BoardMember.board_id == board.id)
+        .first()
+    )
+    if membership is None:
+        return NO_ACCESS
+    # Membresías antiguas sin rol: solo lectura
+    return membership.role if membership.role in ROLE_LEVELS else VIEWER
+
+
+def _require(role: str, required: str) -> None:
+    if ROLE_LEVELS.get(role, 0) < ROLE_LEVELS[required]:
+        raise _forbidden()
+
+
+def verify_board_permission(board_id: int, user_id: int, db: Session, required: str = VIEWER):
+    """
+    Verifica que el tablero existe y que el usuario tiene al menos el rol
+    `required`, y devuelve el tablero.
+
+    Siempre carga el tablero (las lecturas necesitan su revisión para la
+    ETag); el rol sale de la caché si está disponible.
+
+    Raises:
+        HTTPException: 404 si el tablero no existe, 403 si el rol no alcanza.
+
+    Returns:
+        Board: El tablero comprobado.
+    """
+    board = loader_for(db).load(Board, board_id)
+    if not board:
+        raise _not_found()
+
+    role = permission_cache.get((user_id, board_id))
+    if role is None:
+        role = board_role(db, board, user_id)
+        permission_cache.set((user_id, board_id), role)
+    _require(role, required)
+
+    return board
+
+
+def check_board_access(board_id: int, user_id: int, db: Session, required: str = VIEWER) -> str:
+    """
+    Verifica el acceso al tablero usando la caché de decisiones.
+
+    Para rutas que no necesitan el objeto Board (escrituras de tarjetas): con
+    la decisión en caché no se ejecuta ninguna consulta, y sin ella el tablero
+    queda en la sesión para el resto de la petición.
+
+    Raises:
+        HTTPException: 404 si el tablero no existe, 403 si el rol no alcanza.
+
+    Returns:
+        str: Rol del usuario en el tablero.
+    """
+    role = permission_cache.get((user_id, board_id))
+    if role is None:
+        board = loader_for(db).load(Board, board_id)
+        if board is None:
+            raise _not_found()
+        role = board_role(db, board, user_id)
+        permission_cache.set((user_id, board_id), role)
+
+    _require(role, required)
+    return role
+
+
+# ===== INVALIDACIÓN =====
+def invalidate_board(board_id: int) -> None:
+    """Olvida todas las decisiones sobre un tablero."""
+    permission_cache.invalidate_where(lambda key: key[1] == board_id)
+
+
+def _invalidate(user_id, board_id) -> None:
+    # None hace de comodín: (None, tablero) o (usuario, None)
+    if user_id is None:
+        invalidate_board(board_id)
+    elif board_id is None:
+        permission_cache.invalidate_where(lambda key: key[0] == user_id)
+    else:
+        permission_cache.invalidate((user_id, board_id))
+
+
+def _queue_invalidation(target, user_id, board_id) -> None:
+    """Anota la invalidación en la sesión de `target`; se aplica tras el commit."""
+    session = object_session(target)
+    if session is None:
+        _invalidate(user_id, board_id)
+        return
+    session.info.setdefault(PENDING_INVALIDATIONS, set()).add((user_id, board_id))
+
+
+@event.listens_for(Board, "after_delete")
+def _board_deleted(mapper, connection, target):
+    _queue_invalidation(target, None, target.id)
+
+
+@event.listens_for(Board, "after_update")
+def _board_updated(mapper, connection, target):
+    # Solo un cambio de propietario altera las decisiones
+    if inspect(target).attrs.user_id.history.has_changes():
+        _queue_invalidation(target, None, target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    # Sus tableros se borran en cascada en la base de datos (sin eventos ORM);
+    # las decisiones de otros usuarios sobre ellos caducan con el TTL
+    _queue_invalidation(target, target.id, None)
+
+
+@event.listens_for(BoardMember, "after_insert")
+@event.listens_for(BoardMember, "after_update")
+@event.listens_for(BoardMember, "after_delete")
+def _membership_changed(mapper, connection, target):
+    _queue_invalidation(target, target.user_id, target.board_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    for user_id, board_id in session.info.pop(PENDING_INVALIDATIONS, ()):
+        _invalidate(user_id, board_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(PENDING_INVALIDATIONS, None)
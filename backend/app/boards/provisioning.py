@@ -0,0 +1,73 @@
+"""
+Creación de tableros a partir de plantillas.
+
+Una plantilla (ver `BOARD_TEMPLATES` en app/config.py) define el nombre por
+defecto del tablero y sus listas en orden. `provision_board` crea el tablero y
+todas sus listas dentro de la transacción del llamador: un INSERT para el
+tablero y un único INSERT multi-fila para las listas, sin commits intermedios.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..config import BoardTemplate, settings
+from .models import Board, List
+
+
+class UnknownTemplate(KeyError):
+    """La plantilla pedida no existe en la configuración."""
+
+
+def get_template(name: Optional[str] = None) -> BoardTemplate:
+    """
+    Devuelve la plantilla `name` (o la plantilla por defecto).
+
+    Raises:
+        UnknownTemplate: Si no hay ninguna plantilla con ese nombre.
+    """
+    name = name or settings.DEFAULT_BOARD_TEMPLATE
+    try:
+        return settings.BOARD_TEMPLATES[name]
+    except KeyError:
+        raise UnknownTemplate(name)
+
+
+def provision_board(
+    db: Session,
+    user_id: int,
+    template_name: Optional[str] = None,
+    board_name: Optional[str] = None,
+) -> Board:
+    """
+    Crea un tablero y sus listas según una plantilla, sin confirmar la transacción.
+
+    Args:
+        db (Session): Sesión activa; el llamador hace commit (o rollback).
+        user_id (int): Propietario del tablero.
+        template_name (str | None): Plantilla a usar (None = la de por defecto).
+        board_name (str | None): Nombre del tablero (None = el de la plantilla).
+
+    Raises:
+        UnknownTemplate: Si la plantilla no existe.
+
+    Returns:
+        Board: Tablero creado (ya con id).
+    """
+    template = get_template(template_name)
+
+    board = Board(name=board_name or template.name, user_id=user_id)
+    db.add(board)
+    db.flush()  # obtiene board.id
+
+    now = datetime.now(timezone.utc)
+    if template.lists:
+        db.execute(
+            insert(List),
+            [
+                {"board_id": board.id, "name": list_name, "position": idx, "created_at": now}
+                for idx, list_name in enumerate(template.lists)
+            ],
+        )
+    return board
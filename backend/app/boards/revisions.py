@@ -0,0 +1,64 @@
+"""
+Revisión por tablero y GET condicionales (ETag / If-None-Match).
+
+Cada tablero lleva un contador `revision` que se incrementa en la misma
+transacción que cualquier cambio en sus listas o tarjetas. Las lecturas del
+tablero exponen esa revisión como ETag; si el cliente la envía en
+`If-None-Match` y sigue vigente, se responde 304 tras una única consulta
+indexada al tablero, sin leer listas ni tarjetas.
+"""
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .models import Board
+
+
+def bump_revision(db: Session, board_id: int) -> int:
+    """
+    Incrementa la revisión del tablero (sin commit) y devuelve la nueva.
+
+    Se hace con un UPDATE ... RETURNING atómico en la base de datos para que dos
+    escrituras concurrentes no produzcan la misma revisión.
+    """
+    return db.execute(
+        update(Board)
+        .where(Board.id == board_id)
+        .values(revision=Board.revision + 1)
+        .returning(Board.revision)
+    ).scalar_one()
+
+
+def board_etag(board: Board) -> str:
+    """ETag débil derivado del id y la revisión del tablero."""
+    return f'W/"{board.id}-{board.revision}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True si alguna de las ETags de `If-None-Match` coincide con `etag` (o es `*`)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    # Comparación débil: W/"x" y "x" representan la misma revisión
+    bare = etag.removeprefix("W/")
+    return any(value == "*" or value.removeprefix("W/") == bare for value in candidates)
+
+
+def conditional_response(
+    request: Request, response: Response, board: Board, etag: Optional[str] = None
+) -> Optional[Response]:
+    """
+    Añade la ETag del tablero (u otra derivada de su revisión) y resuelve el GET condicional.
+
+    Returns:
+        Response | None: Un 304 si el cliente ya tiene la revisión actual;
+        None si hay que generar el cuerpo completo.
+    """
+    etag = etag or board_etag(board)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
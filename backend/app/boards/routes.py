@@ -1,56 +1,90 @@
 """
 Rutas principales para gestión de tableros (Board) en la API.
 
-Provee endpoints para consultar los tableros de cada usuario autenticado.
+Provee endpoints para consultar los tableros de cada usuario autenticado, para
+obtener un tablero completo en una sola petición (snapshot) y para crear
+tableros nuevos a partir de plantillas. Los GET son de solo lectura.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List as ListType
+from typing import IO, List as ListType, Optional
 
 from ..auth.utils import get_current_user, get_db
 from ..boards.models import User
-from .models import Board, List
-from .schemas import BoardOut, ListOut
+from ..cards.pagination import KEY_COLUMNS
+from ..cards.ranking import CARD_ORDER, annotate_orders, list_orders
+from ..cards.schemas import CardOut
+from ..projection import FIELDS_DESCRIPTION, load_only_columns, parse_fields, project, projected_response
+from .changes import latest_changes
+from .export import export_board, export_engine, gzip_stream
+from .importer import ImportValidationError, open_lines, run_import, spool_body, start_import, validate_lines
+from .models import Board, BoardImport, BoardMember, Card, List
+from .permissions import OWNER, VIEWER, accessible_boards, verify_board_permission
+from .revisions import conditional_response
+from .schemas import (
+    BoardChanges,
+    BoardCreate,
+    BoardOut,
+    BoardSnapshot,
+    ImportJobOut,
+    ListOut,
+    ListSnapshot,
+    MemberOut,
+    MemberUpdate,
+    Tombstone,
+)
+from .provisioning import UnknownTemplate, provision_board
 
 router = APIRouter(prefix="/boards", tags=["boards"])
 
 
 @router.get("/", response_model=ListType[BoardOut])
-def get_boards(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_boards(
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     """
-    Obtiene todos los tableros pertenecientes al usuario autenticado.
+    Obtiene los tableros del usuario autenticado: propios y compartidos con él.
 
-    Nota (importante):
-        Si el usuario NO tiene tableros (usuarios antiguos creados antes de la creación automática),
-        se crea automáticamente 1 tablero y sus 3 listas por defecto para evitar que el frontend
-        quede bloqueado.
+    Es de solo lectura: los tableros por defecto se crean al registrarse
+    (o con POST /boards/), nunca desde un GET. Una sola consulta, sea cual sea
+    el número de tableros compartidos. Con `fields` solo se leen esos campos.
     """
-    boards = (
-        db.query(Board)
-        .filter(Board.user_id == current_user.id)
-        .order_by(Board.id)
-        .all()
-    )
+    selected = parse_fields(fields, BoardOut)
+    query = accessible_boards(db, current_user.id)
+    if selected:
+        query = query.options(load_only_columns(Board, selected))
+    boards = query.order_by(Board.id).all()
 
-    # ✅ CAMBIO: autocrear tablero + listas si el usuario no tiene ninguno
-    if not boards:
-        default_board = Board(name="Tablero principal", user_id=current_user.id)
-        db.add(default_board)
-        db.commit()
-        db.refresh(default_board)
+    if selected:
+        return projected_response([project(board, selected) for board in boards], response)
+    return boards
 
-        default_lists = [
-            List(name="Por hacer", board_id=default_board.id, position=0),
-            List(name="En curso", board_id=default_board.id, position=1),
-            List(name="Hecho", board_id=default_board.id, position=2),
-        ]
-        db.add_all(default_lists)
-        db.commit()
 
-        boards = [default_board]
+@router.post("/", response_model=BoardOut, status_code=201)
+def create_board(
+    data: BoardCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Crea un tablero con sus listas a partir de una plantilla (una transacción).
 
-    return boards
+    Excepciones:
+        HTTP 400: Si la plantilla no existe.
+    """
+    try:
+        board = provision_board(db, current_user.id, data.template, data.name)
+    except UnknownTemplate:
+        raise HTTPException(status_code=400, detail="Plantilla de tablero desconocida")
+
+    db.commit()
+    db.refresh(board)
+    return board
 
 
 # ✅ CAMBIO: aceptar /lists y /lists/ para eliminar el 307 redirect
@@ -58,6 +92,9 @@ def get_boards(db: Session = Depends(get_db), current_user: User = Depends(get_c
 @router.get("/{board_id}/lists/", response_model=ListType[ListOut])
 def get_board_lists(
     board_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -66,39 +103,345 @@ def get_board_lists(
 
     Reglas de seguridad:
         - El tablero debe existir.
-        - El tablero debe pertenecer al usuario autenticado.
+        - El usuario debe ser propietario o miembro del tablero.
+
+    Admite GET condicional: con `If-None-Match` igual a la ETag actual
+    responde 304 sin consultar las listas. Con `fields` solo se leen esos campos.
+    """
+    selected = parse_fields(fields, ListOut)
+    board = verify_board_permission(board_id, current_user.id, db)
+    not_modified = conditional_response(request, response, board)
+    if not_modified:
+        return not_modified
+
+    query = db.query(List).filter(List.board_id == board_id)
+    if selected:
+        query = query.options(load_only_columns(List, selected))
+    lists = query.order_by(List.position).all()
+
+    if selected:
+        return projected_response([project(lst, selected) for lst in lists], response)
+    return lists
+
+
+@router.get("/{board_id}/snapshot", response_model=BoardSnapshot)
+def get_board_snapshot(
+    board_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Campos de cada tarjeta (p. ej. id,title,list_id,order)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Devuelve el tablero con sus listas y tarjetas ordenadas en una sola respuesta.
+
+    Sustituye a la secuencia GET /boards/ + /lists + /cards/ al abrir un tablero.
+    Coste fijo de 3 consultas (tablero, listas, tarjetas), sin cargas perezosas
+    por fila, sea cual sea el tamaño del tablero. Admite GET condicional
+    (ETag / If-None-Match) como /lists. Con `fields` las tarjetas solo traen
+    esos campos (la vista de tablero no necesita la descripción).
+
+    Excepciones:
+        HTTP 404: Si el tablero no existe.
+        HTTP 403: Si el usuario no tiene acceso al tablero.
+    """
+    card_fields = parse_fields(fields, CardOut)
+    board = verify_board_permission(board_id, current_user.id, db)
+    not_modified = conditional_response(request, response, board)
+    if not_modified:
+        return not_modified
+
+    if card_fields:
+        return projected_response(build_snapshot(db, board, card_fields), response)
+    return build_snapshot(db, board)
+
+
+@router.get("/{board_id}/changes", response_model=BoardChanges)
+def get_board_changes(
+    board_id: int,
+    request: Request,
+    response: Response,
+    since: int = Query(..., ge=0, description="Última revisión que tiene el cliente"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Devuelve los cambios del tablero posteriores a la revisión `since`.
+
+    El cliente guarda la `revision` de la respuesta y la usa como `since` en
+    la siguiente llamada. Si `since` es anterior a lo que conserva el
+    registro, la respuesta trae `full=True` y el snapshot completo.
+
+    Excepciones:
+        HTTP 400: Si `since` es mayor que la revisión actual del tablero.
+        HTTP 404 / 403: Como el resto de lecturas del tablero.
+    """
+    board = verify_board_permission(board_id, current_user.id, db)
+    not_modified = conditional_response(request, response, board)
+    if not_modified:
+        return not_modified
+
+    if since > board.revision:
+        raise HTTPException(status_code=400, detail="Revisión desconocida para este tablero")
+
+    if since < board.changelog_floor:
+        return BoardChanges(revision=board.revision, since=since, full=True, snapshot=build_snapshot(db, board))
+
+    latest = latest_changes(db, board_id, since)
+    changed = {"card": [], "list": []}
+    deleted = []
+    for (entity, entity_id), op in latest.items():
+        if op == "delete":
+            deleted.append(Tombstone(entity=entity, id=entity_id))
+        else:
+            changed[entity].append(entity_id)
+
+    lists = []
+    if changed["list"]:
+        lists = (
+            db.query(List)
+            .filter(List.board_id == board_id, List.id.in_(changed["list"]))
+            .order_by(List.position, List.id)
+            .all()
+        )
+
+    cards = []
+    if changed["card"]:
+        cards = (
+            db.query(Card)
+            .filter(Card.board_id == board_id, Card.id.in_(changed["card"]))
+            .all()
+        )
+        orders = list_orders(db, (card.list_id for card in cards))
+        for card in cards:
+            card.order = orders[card.id]
+        # Orden ascendente por lista e índice: el cliente puede insertarlas en orden
+        cards.sort(key=lambda card: (card.list_id, card.order))
+
+    return BoardChanges(revision=board.revision, since=since, lists=lists, cards=cards, deleted=deleted)
+
+
+# ===== EXPORTAR / IMPORTAR (NDJSON) =====
+@router.get(
+    "/{board_id}/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "Tablero en NDJSON"}},
+)
+def export_board_ndjson(
+    board_id: int,
+    gzip: bool = Query(False, description="Comprimir con gzip al vuelo (Content-Encoding: gzip)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Exporta el tablero (tablero, listas, tarjetas y registros de tiempo) en NDJSON.
+
+    La respuesta se genera en streaming desde una foto consistente de la base
+    de datos, con memoria constante sea cual sea el tamaño del tablero (ver
+    app/boards/export.py).
+    """
+    verify_board_permission(board_id, current_user.id, db)
+    engine = export_engine(db)
+    # La exportación usa su propia conexión: se libera ya la de la petición
+    db.close()
+
+    body = export_board(engine, board_id)
+    headers = {"Content-Disposition": f'attachment; filename="board-{board_id}.ndjson"'}
+    if gzip:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+
+@router.post("/import", response_model=ImportJobOut, status_code=201)
+def import_board(
+    resume: Optional[int] = Query(None, description="Id de una importación interrumpida a reanudar"),
+    body: IO[bytes] = Depends(spool_body),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Importa un tablero desde NDJSON (formato de GET /boards/{id}/export, admite gzip).
+
+    Crea un tablero nuevo del usuario autenticado. El fichero se valida entero
+    antes de escribir y se inserta por lotes con un punto de control por lote:
+    si la importación se interrumpe, se reanuda enviando el mismo fichero con
+    `resume=<id>`. El progreso se consulta en GET /boards/imports/{id}.
+    """
+    try:
+        summary = validate_lines(open_lines(body))
+    except ImportValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if resume is not None:
+        job = db.get(BoardImport, resume)
+        if job is None or job.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Importación no encontrada")
+        if job.status == "done":
+            raise HTTPException(status_code=409, detail="La importación ya terminó")
+    else:
+        job = start_import(db, current_user.id, summary.total_lines)
+
+    body.seek(0)
+    try:
+        run_import(db, job, open_lines(body))
+    except ImportValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return job
+
+
+@router.get("/imports/{import_id}", response_model=ImportJobOut)
+def get_import(
+    import_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Estado y progreso de una importación del usuario autenticado."""
+    job = db.get(BoardImport, import_id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Importación no encontrada")
+    return job
+
+
+# ===== MIEMBROS =====
+@router.get("/{board_id}/members", response_model=ListType[MemberOut])
+def get_board_members(
+    board_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Lista los miembros de un tablero (cualquier usuario con acceso)."""
+    verify_board_permission(board_id, current_user.id, db)
+    return (
+        db.query(BoardMember)
+        .filter(BoardMember.board_id == board_id)
+        .order_by(BoardMember.user_id)
+        .all()
+    )
+
+
+@router.put("/{board_id}/members/{user_id}", response_model=MemberOut)
+def set_board_member(
+    board_id: int,
+    user_id: int,
+    data: MemberUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     """
-    board = db.query(Board).filter(Board.id == board_id).first()
-    if not board:
-        raise HTTPException(status_code=404, detail="Tablero no encontrado")
+    Comparte el tablero con un usuario o cambia su rol (solo propietarios).
+
+    Excepciones:
+        HTTP 400: Si el usuario es el propietario del tablero.
+        HTTP 404: Si el tablero o el usuario no existen.
+    """
+    board = verify_board_permission(board_id, current_user.id, db, OWNER)
+    if user_id == board.user_id:
+        raise HTTPException(status_code=400, detail="El propietario no puede ser miembro de su tablero")
+    if db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+
+    member = (
+        db.query(BoardMember)
+        .filter(BoardMember.board_id == board_id, BoardMember.user_id == user_id)
+        .first()
+    )
+    if member is None:
+        member = BoardMember(board_id=board_id, user_id=user_id)
+        db.add(member)
+    member.role = data.role
+
+    db.commit()
+    db.refresh(member)
+    return member
+
+
+@router.delete("/{board_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_board_member(
+    board_id: int,
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Deja de compartir el tablero con un usuario (propietarios, o el propio miembro)."""
+    # Un miembro puede salir por su cuenta; quitar a otro exige ser propietario
+    required = VIEWER if user_id == current_user.id else OWNER
+    verify_board_permission(board_id, current_user.id, db, required)
+
+    member = (
+        db.query(BoardMember)
+        .filter(BoardMember.board_id == board_id, BoardMember.user_id == user_id)
+        .first()
+    )
+    if member is None:
+        raise HTTPException(status_code=404, detail="Miembro no encontrado")
+
+    db.delete(member)
+    db.commit()
+    return None
 
-    if board.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="No tienes permiso para este tablero")
 
+def build_snapshot(db: Session, board: Board, card_fields: Optional[list[str]] = None):
+    """
+    Construye el snapshot de un tablero ya autorizado (2 consultas: listas y tarjetas).
+
+    Returns:
+        BoardSnapshot, o un dict con las tarjetas proyectadas si hay `card_fields`.
+    """
     lists = (
         db.query(List)
-        .filter(List.board_id == board_id)
-        .order_by(List.position)
+        .filter(List.board_id == board.id)
+        .order_by(List.position, List.id)
         .all()
     )
+    query = db.query(Card).filter(Card.board_id == board.id)
+    if card_fields:
+        query = query.options(load_only_columns(Card, card_fields, KEY_COLUMNS))
+    cards = annotate_orders(query.order_by(Card.list_id, *CARD_ORDER).all())
 
-    # ✅ CAMBIO: autocrear listas si el tablero no tiene ninguna
-    if not lists:
-        default_lists = [
-            List(name="Por hacer", board_id=board_id, position=0),
-            List(name="En curso", board_id=board_id, position=1),
-            List(name="Hecho", board_id=board_id, position=2),
-        ]
-        db.add_all(default_lists)
-        db.commit()
-        lists = default_lists
+    cards_by_list: dict[int, list] = {lst.id: [] for lst in lists}
+    for card in cards:
+        cards_by_list.setdefault(card.list_id, []).append(card)
 
-    return lists
+    if card_fields:
+        return {
+            **BoardOut.model_validate(board).model_dump(),
+            "revision": board.revision,
+            "lists": [
+                {
+                    **ListOut.model_validate(lst).model_dump(),
+                    "cards": [project(card, card_fields) for card in cards_by_list[lst.id]],
+                }
+                for lst in lists
+            ],
+        }
+
+    return BoardSnapshot(
+        **BoardOut.model_validate(board).model_dump(),
+        revision=board.revision,
+        lists=[
+            ListSnapshot(**ListOut.model_validate(lst).model_dump(), cards=cards_by_list[lst.id])
+            for lst in lists
+        ],
+    )
 
 
 # CAMBIOS REALIZADOS Y POR QUÉ:
-# 1) get_boards(): si el usuario no tiene boards, se crea automáticamente:
-#    - 1 board "Tablero principal"
-#    - 3 listas con position 0/1/2
-#    Esto elimina el error del frontend: "No hay tablero disponible para tu usuario".
-# 2) Se mantiene tu fix para aceptar /lists y /lists/ y evitar el 307 redirect.
\ No newline at end of file
+# 1) El tablero por defecto (y sus listas) se crea en /auth/register desde una
+#    plantilla configurable (app/boards/provisioning.py), en una sola transacción.
+#    Los GET ya no escriben; POST /boards/ crea tableros nuevos desde plantilla.
+# 2) Se mantiene tu fix para aceptar /lists y /lists/ y evitar el 307 redirect.
+# 3) GET /boards/{id}/snapshot devuelve tablero + listas + tarjetas en una
+#    petición y 3 consultas; la comprobación de acceso vive en permissions.py.
+# 4) Las lecturas de un tablero llevan ETag (revisión del tablero) y responden
+#    304 a If-None-Match sin leer listas ni tarjetas.
+# 5) GET /boards/{id}/changes?since=N devuelve solo lo cambiado desde N (con
+#    lápidas) a partir del registro de app/boards/changes.py.
+# 6) Tableros compartidos: BoardMember con roles viewer/editor/owner. GET /boards/
+#    incluye los compartidos y /members permite gestionarlos.
+# 7) ?fields= en las lecturas: la proyección se aplica en el SELECT (load_only).
+# 8) GET /boards/{id}/export: NDJSON en streaming desde una foto consistente,
+#    con cursores de servidor y gzip opcional (app/boards/export.py).
+# 9) POST /boards/import: importación NDJSON por lotes con punto de control y
+#    reanudación (app/boards/importer.py; también como CLI).
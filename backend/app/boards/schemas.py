@@ -1,9 +1,12 @@
 """
 Schemas Pydantic para validación y serialización de datos de tableros y listas.
 """
-from pydantic import BaseModel, ConfigDict
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Literal, Optional
+
+from ..cards.schemas import CardOut
 
 
 class ListOut(BaseModel):
@@ -25,3 +28,121 @@ class BoardOut(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BoardCreate(BaseModel):
+    """Schema para crear un tablero desde una plantilla (ver BOARD_TEMPLATES)."""
+    name: Optional[str] = None
+    template: Optional[str] = None
+
+
+class MemberUpdate(BaseModel):
+    """Schema para añadir un miembro a un tablero o cambiar su rol."""
+    role: Literal["viewer", "editor", "owner"]
+
+
+class MemberOut(BaseModel):
+    """Schema para serializar una membresía de tablero."""
+    board_id: int
+    user_id: int
+    role: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ListSnapshot(ListOut):
+    """Lista con sus tarjetas ordenadas (parte de BoardSnapshot)."""
+    cards: list[CardOut] = []
+
+
+class BoardSnapshot(BoardOut):
+    """
+    Tablero completo: sus listas ordenadas y, dentro de cada una, sus tarjetas.
+
+    `revision` es la revisión del tablero que refleja el snapshot (punto de
+    partida para GET /boards/{id}/changes?since=).
+    """
+    revision: int
+    lists: list[ListSnapshot] = []
+
+
+class Tombstone(BaseModel):
+    """Entidad borrada desde la revisión pedida (lápida)."""
+    entity: str
+    id: int
+
+
+class BoardChanges(BaseModel):
+    """
+    Cambios de un tablero desde una revisión (GET /boards/{id}/changes).
+
+    Si `full` es True el registro ya no llega a `since` y `snapshot` trae el
+    tablero completo; si no, `lists` y `cards` traen el estado actual de lo
+    modificado y `deleted` las lápidas de lo borrado.
+    """
+    revision: int
+    since: int
+    full: bool = False
+    snapshot: Optional[BoardSnapshot] = None
+    lists: list[ListOut] = []
+    cards: list[CardOut] = []
+    deleted: list[Tombstone] = []
+
+
+# ===== IMPORTACIÓN (formato de GET /boards/{id}/export) =====
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ImportBoard(BaseModel):
+    """Línea "board" de un fichero de importación."""
+    name: str = Field(min_length=1, max_length=150)
+
+
+class ImportList(BaseModel):
+    """Línea "list": `id` es el del fichero y solo sirve para enlazar tarjetas."""
+    id: int
+    name: str = Field(max_length=100)
+    position: int
+    created_at: datetime = Field(default_factory=_now)
+
+
+class ImportCard(BaseModel):
+    """Línea "card"; `list_id` debe referenciar una lista anterior del fichero."""
+    id: int
+    list_id: int
+    title: str = Field(min_length=1, max_length=200)
+    description: Optional[str] = None
+    due_date: Optional[date] = None
+    responsible_id: Optional[int] = None
+    created_by_id: Optional[int] = None
+    created_at: datetime = Field(default_factory=_now)
+    updated_at: datetime = Field(default_factory=_now)
+    completed_at: Optional[datetime] = None
+    position: int = 0
+    rank: Optional[str] = Field(None, max_length=64)
+    priority: Optional[str] = Field(None, max_length=20)
+    archived: bool = False
+
+
+class ImportTimeEntry(BaseModel):
+    """Línea "time_entry"; `card_id` debe referenciar una tarjeta anterior del fichero."""
+    id: int
+    card_id: int
+    user_id: Optional[int] = None
+    date: date
+    hours: Decimal = Field(max_digits=5, decimal_places=2)
+    note: Optional[str] = None
+    created_at: datetime = Field(default_factory=_now)
+
+
+class ImportJobOut(BaseModel):
+    """Estado de una importación (progreso y tablero creado)."""
+    id: int
+    board_id: Optional[int] = None
+    status: str
+    lines_done: int
+    total_lines: Optional[int] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,106 @@
+"""
+Canal WebSocket con los cambios de un tablero: /ws/boards/{board_id}?token=<JWT>.
+
+El navegador no puede enviar cabeceras en un WebSocket, así que el JWT va en
+el parámetro `token`. Tras conectar se recibe un mensaje `hello` con la
+revisión actual y después un mensaje `change` por cada escritura confirmada:
+
+    {"type":"change","board_id":1,"revision":8,"entity":"card","id":42,"op":"upsert"}
+
+El cliente aplica el cambio pidiendo GET /boards/{id}/changes?since=<su revisión>.
+
+El acceso se vuelve a comprobar antes de enviar cada tanda de mensajes (con
+la caché de permisos, sin consulta mientras la decisión esté vigente): a un
+miembro expulsado, o si el tablero cambia de dueño o se borra, se le cierra
+el socket con 1008 en lugar de seguir recibiendo cambios.
+"""
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..auth.utils import decode_user_id, get_db
+from .events import OVERFLOW, Subscriber, board_events
+from .permissions import check_board_access, verify_board_permission
+
+router = APIRouter(tags=["realtime"])
+
+
+@router.websocket("/ws/boards/{board_id}")
+async def board_updates(
+    websocket: WebSocket,
+    board_id: int,
+    token: str = Query(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Envía al cliente los cambios del tablero mientras esté conectado.
+
+    Códigos de cierre:
+        1008: Token inválido o sin acceso al tablero (también si se pierde el acceso).
+        1013: El cliente no consume los mensajes a tiempo (cola llena).
+    """
+    try:
+        user_id = decode_user_id(token)
+        board = await run_in_threadpool(verify_board_permission, board_id, user_id, db)
+        revision = board.revision
+    except HTTPException as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail))
+        return
+    finally:
+        # No retener una conexión del pool mientras dure el socket
+        await run_in_threadpool(db.close)
+
+    await websocket.accept()
+    subscriber = board_events.hub.subscribe(board_id)
+    try:
+        await websocket.send_text(json.dumps({"type": "hello", "board_id": board_id, "revision": revision}))
+        sender = asyncio.create_task(_forward(websocket, subscriber, user_id, db))
+        receiver = asyncio.create_task(_wait_disconnect(websocket))
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        board_events.hub.unsubscribe(subscriber)
+
+
+def _has_access(board_id: int, user_id: int, db: Session) -> bool:
+    """Comprueba el acceso de lectura (caché de permisos) y libera la conexión."""
+    try:
+        check_board_access(board_id, user_id, db)
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+async def _forward(websocket: WebSocket, subscriber: Subscriber, user_id: int, db: Session) -> None:
+    """Envía los mensajes de la cola del suscriptor hasta que se desborde o se pierda el acceso."""
+    while True:
+        # Una comprobación de acceso por tanda: lo que haya en la cola se envía junto
+        messages = [await subscriber.queue.get()]
+        while not subscriber.queue.empty():
+            messages.append(subscriber.queue.get_nowait())
+        if OVERFLOW in messages:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+        if not await run_in_threadpool(_has_access, subscriber.board_id, user_id, db):
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Sin acceso al tablero")
+            return
+        for message in messages:
+            await websocket.send_text(message)
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """Consume (e ignora) lo que envíe el cliente hasta que se desconecte."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
@@ -0,0 +1,106 @@
+"""
+Caché en memoria acotada (LRU) con caducidad por tiempo (TTL).
+
+Se usa para estado de proceso que debe ser pequeño y de vida corta. Es
+thread-safe y lleva contadores de aciertos, fallos y expulsiones para poder
+verificar su efecto desde /metrics.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+# Cachés con nombre, para exponer sus contadores en /metrics
+_registry: dict = {}
+
+
+class TTLCache:
+    """
+    Diccionario acotado con política LRU y TTL por entrada.
+
+    Args:
+        maxsize (int): Número máximo de entradas; al superarlo se expulsa la menos usada.
+        ttl (float): Segundos de vida de cada entrada desde que se escribe.
+        timer (Callable): Reloj monotónico (inyectable en pruebas).
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Devuelve el valor vigente de `key` (y lo marca como usado) o `default`."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self._timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Guarda `value` en `key` con el TTL por defecto o uno específico."""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        # Llamar con el lock tomado
+        self._data[key] = (self._timer() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Elimina `key` si existe."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Elimina las entradas cuya clave cumple `predicate`. Devuelve cuántas borró."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Contadores para métricas: tamaño, aciertos, fallos y expulsiones."""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def register_cache(name: str, cache: TTLCache) -> TTLCache:
+    """Registra una caché con nombre para /metrics y la devuelve."""
+    _registry[name] = cache
+    return cache
+
+
+def all_cache_stats() -> dict:
+    """Contadores de todas las cachés registradas, por nombre."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,210 @@
+"""
+Operaciones en lote sobre tarjetas (POST /cards/bulk).
+
+La multiselección del frontend hacía una petición por tarjeta: cada una con
+su JWT, su comprobación de permisos y su commit. Aquí un lote de operaciones
+(create / update / move / delete) se aplica en una sola transacción con
+sentencias por conjuntos:
+
+- las tarjetas y listas referenciadas se cargan con una consulta IN por modelo;
+- el permiso (editor) se comprueba una vez por tablero distinto;
+- los borrados son un único DELETE ... WHERE id IN (...);
+- las ediciones con los mismos valores (p. ej. archivar 500 tarjetas) son un
+  único UPDATE ... WHERE id IN (...); las que además cambian de lista van por
+  el ORM junto con los movimientos (el UPDATE por conjuntos no actualiza los
+  objetos cargados y su flush vería una versión antigua);
+- los movimientos calculan sus ranks en memoria por lista destino
+  (`place_cards`) y se escriben en el flush;
+- el registro de cambios sube la revisión una vez por tablero.
+
+Las operaciones que no pueden aplicarse (tarjeta inexistente, sin permiso,
+lista de otro tablero, tarjeta repetida en el lote, `version` que ya no es la
+actual) se devuelven con su error y no impiden aplicar el resto.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import delete, tuple_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from ..boards.changes import record_changes
+from ..boards.models import Board, Card, List
+from ..boards.permissions import EDITOR, check_board_access
+from ..loader import loader_for
+from .ranking import list_orders, place_cards
+from .schemas import BulkItemResult, BulkOperation, CardOut
+
+# Campos de CardUpdate que se aplican tal cual (None = no cambiar)
+UPDATE_FIELDS = ("title", "description", "due_date", "archived")
+
+SUCCESS_STATUS = {"create": 201, "update": 200, "move": 200, "delete": 204}
+
+
+def _conflict(db: Session) -> HTTPException:
+    """Otra transacción cambió alguna tarjeta del lote mientras se aplicaba: no se aplica nada."""
+    db.rollback()
+    return HTTPException(status_code=412, detail="Alguna tarjeta del lote cambió mientras se aplicaba; reinténtalo")
+
+
+def apply_bulk(db: Session, user_id: int, operations: list[BulkOperation]) -> list[BulkItemResult]:
+    """
+    Valida y aplica un lote de operaciones y confirma la transacción.
+
+    Returns:
+        list[BulkItemResult]: Un resultado por operación, en el mismo orden.
+    """
+    loader = loader_for(db)
+    errors: dict[int, tuple[int, str]] = {}
+
+    # 1) Tarjetas y listas referenciadas: una consulta por modelo
+    card_ids = [op.id for op in operations if op.op != "create"]
+    cards = dict(zip(card_ids, loader.load_many(Card, card_ids)))
+    list_ids = {op.list_id for op in operations if getattr(op, "list_id", None) is not None}
+    lists = dict(zip(list_ids, loader.load_many(List, list_ids)))
+
+    seen = set()
+    board_of: dict[int, int] = {}
+    for idx, op in enumerate(operations):
+        if op.op == "create":
+            board_of[idx] = op.board_id
+            continue
+        if op.id in seen:
+            errors[idx] = (409, "Tarjeta repetida en el lote")
+            continue
+        seen.add(op.id)
+        if cards[op.id] is None:
+            errors[idx] = (404, "Tarjeta no encontrada")
+            continue
+        board_of[idx] = cards[op.id].board_id
+        if op.version is not None and op.version != cards[op.id].version:
+            errors[idx] = (412, "La tarjeta ha cambiado desde que la leíste")
+
+    # 2) Permiso de editor una vez por tablero; los tableros que haya que
+    # leer (decisión fuera de caché) se cargan juntos en la primera consulta
+    board_ids = set(board_of.values())
+    loader.prime(Board, board_ids)
+    denied: dict[int, tuple[int, str]] = {}
+    for board_id in board_ids:
+        try:
+            check_board_access(board_id, user_id, db, EDITOR)
+        except HTTPException as exc:
+            denied[board_id] = (exc.status_code, exc.detail)
+    for idx, board_id in board_of.items():
+        if idx not in errors and board_id in denied:
+            errors[idx] = denied[board_id]
+
+    # 3) La lista destino debe pertenecer al tablero de la tarjeta
+    for idx, op in enumerate(operations):
+        list_id = getattr(op, "list_id", None)
+        if idx in errors or list_id is None:
+            continue
+        if lists[list_id] is None or lists[list_id].board_id != board_of[idx]:
+            errors[idx] = (400, "Lista destino inválida")
+
+    # 4) Aplicar lo válido con sentencias por conjuntos
+    now = datetime.now(timezone.utc)
+    changes: dict[int, list] = defaultdict(list)
+    created: dict[int, Card] = {}
+    deletes, placements = [], []
+    updates: dict[tuple, list[int]] = defaultdict(list)
+
+    for idx, op in enumerate(operations):
+        if idx in errors:
+            continue
+        if op.op == "create":
+            card = Card(
+                board_id=op.board_id,
+                list_id=op.list_id,
+                title=op.title,
+                description=op.description,
+                due_date=op.due_date,
+                created_by_id=user_id,
+                updated_at=now,
+            )
+            created[idx] = card
+            placements.append((card, op.list_id, None))
+        elif op.op == "delete":
+            deletes.append(op.id)
+        elif op.op == "move":
+            cards[op.id].updated_at = now
+            placements.append((cards[op.id], op.list_id, op.order))
+        else:
+            values = tuple((name, getattr(op, name)) for name in UPDATE_FIELDS if getattr(op, name) is not None)
+            card = cards[op.id]
+            if op.list_id is not None and op.list_id != card.list_id:
+                # Igual que PATCH: cambiar de lista la deja al final de la destino
+                for name, value in values:
+                    setattr(card, name, value)
+                card.updated_at = now
+                placements.append((card, op.list_id, None))
+            else:
+                updates[values].append(op.id)
+
+    for values, ids in updates.items():
+        # Condicional a la versión leída: si otra transacción la cambió, se detecta abajo
+        versions = [(card_id, cards[card_id].version) for card_id in ids]
+        result = db.execute(
+            update(Card)
+            .where(tuple_(Card.id, Card.version).in_(versions))
+            .values(**dict(values), updated_at=now, version=Card.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(ids):
+            raise _conflict(db)
+        for card_id in ids:
+            # La fila ya tiene otra versión: que el objeto cargado no la pise en el flush
+            db.expire(cards[card_id])
+    # Sin autoflush: las ediciones pendientes van en un único UPDATE por tarjeta (una versión)
+    with db.no_autoflush:
+        place_cards(db, placements)
+    # Las nuevas se añaden ya colocadas (place_cards consulta y haría autoflush)
+    db.add_all(created.values())
+    if deletes:
+        versions = [(card_id, cards[card_id].version) for card_id in deletes]
+        result = db.execute(
+            delete(Card).where(tuple_(Card.id, Card.version).in_(versions)).execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(deletes):
+            raise _conflict(db)
+    try:
+        db.flush()
+    except StaleDataError:
+        raise _conflict(db)
+
+    for idx, op in enumerate(operations):
+        if idx not in errors:
+            card_id = created[idx].id if op.op == "create" else op.id
+            changes[board_of[idx]].append((card_id, "delete" if op.op == "delete" else "upsert"))
+    for board_id, board_changes in changes.items():
+        record_changes(db, board_id, "card", board_changes)
+    db.commit()
+
+    # 5) Resultados: tarjetas finales con su `order` (dos consultas)
+    result_ids = {
+        created[idx].id if op.op == "create" else op.id
+        for idx, op in enumerate(operations)
+        if idx not in errors and op.op != "delete"
+    }
+    final = {card.id: card for card in db.query(Card).filter(Card.id.in_(result_ids)).all()} if result_ids else {}
+    orders = list_orders(db, {card.list_id for card in final.values()})
+
+    results = []
+    for idx, op in enumerate(operations):
+        if idx in errors:
+            status, detail = errors[idx]
+            results.append(BulkItemResult(index=idx, op=op.op, status=status, id=getattr(op, "id", None), error=detail))
+            continue
+        card_id = created[idx].id if op.op == "create" else op.id
+        card = final.get(card_id)
+        if card is not None:
+            card.order = orders.get(card.id, card.position)
+        results.append(BulkItemResult(
+            index=idx,
+            op=op.op,
+            status=SUCCESS_STATUS[op.op],
+            id=card_id,
+            card=CardOut.model_validate(card) if card is not None else None,
+        ))
+    return results
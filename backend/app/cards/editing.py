@@ -0,0 +1,138 @@
+"""
+Edición de tarjetas en una sola sentencia (PATCH/PUT /cards/{id}).
+
+Antes una edición hacía SELECT de la tarjeta, SELECT del tablero, UPDATE,
+COMMIT y un `db.refresh` para releer lo escrito. `edit_card` lo resuelve con un
+único UPDATE ... RETURNING:
+
+- el permiso (editor) va en el propio WHERE, como subconsulta de tableros
+  accesibles (`boards_with_role`), que funciona igual en PostgreSQL y SQLite;
+- RETURNING devuelve las columnas de CardOut y el `order` calculado en la
+  misma sentencia, así que no hay que releer la fila.
+
+Solo si el UPDATE no toca ninguna fila se consulta por qué (404, 403 o 412
+si la versión de If-Match ya no es la actual, ver versioning.py). El registro
+de cambios del tablero añade sus dos sentencias (revisión y cambio).
+
+Cambiar de lista necesita calcular el rank entre las vecinas de la lista
+destino, así que esas ediciones siguen por la ruta ORM (`place_card`).
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func, literal_column, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..boards.changes import record_change
+from ..boards.models import Card
+from ..boards.permissions import EDITOR, boards_with_role, check_board_access
+from ..loader import loader_for
+from .ranking import card_order, place_card
+from .schemas import CardOut, CardUpdate
+from .serialization import CARD_COLUMNS
+from .versioning import check_version, precondition_failed, stale_guard
+
+# Campos de CardUpdate que se escriben tal cual (None = no cambiar)
+EDITABLE_FIELDS = ("title", "description", "due_date", "archived")
+
+_cards = Card.__table__
+_siblings = _cards.alias("siblings")
+
+
+def _col(table: str, name: str):
+    # Referencias explícitas: el dialecto SQLite quita el prefijo de tabla en
+    # RETURNING y la subconsulta correlacionada dejaría de distinguir las filas
+    return literal_column(f"{table}.{name}")
+
+
+# `order` de la fila actualizada, con la misma regla que ranking.card_order
+ORDER_COLUMN = case(
+    (_cards.c.rank.is_(None), _cards.c.position),
+    else_=(
+        select(func.count())
+        .select_from(_siblings)
+        .where(
+            _col("siblings", "list_id") == _col("cards", "list_id"),
+            or_(
+                _col("siblings", "rank") < _col("cards", "rank"),
+                and_(_col("siblings", "rank") == _col("cards", "rank"), _col("siblings", "id") < _col("cards", "id")),
+            ),
+        )
+        .scalar_subquery()
+    ),
+).label("order")
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(status_code=404, detail="Tarjeta no encontrada")
+
+
+def edit_card(
+    db: Session,
+    card_id: int,
+    user_id: int,
+    data: CardUpdate,
+    expected: Optional[set[int]] = None,
+) -> CardOut:
+    """
+    Aplica una edición de tarjeta (sin commit) y devuelve la tarjeta resultante.
+
+    Args:
+        expected (set[int] | None): Versiones aceptadas (If-Match); None = sin condición.
+
+    Raises:
+        HTTPException: 404 si la tarjeta no existe, 403 (o 404 del tablero)
+            si el usuario no es editor del tablero, 412 si la versión cambió.
+    """
+    if data.list_id is not None:
+        return _edit_with_move(db, card_id, user_id, data, expected)
+
+    conditions = [_cards.c.id == card_id, _cards.c.board_id.in_(boards_with_role(user_id, EDITOR))]
+    if expected is not None:
+        conditions.append(_cards.c.version.in_(expected))
+    values = {name: getattr(data, name) for name in EDITABLE_FIELDS if getattr(data, name) is not None}
+    row = db.execute(
+        update(_cards)
+        .where(*conditions)
+        .values(**values, updated_at=datetime.now(timezone.utc), version=_cards.c.version + 1)
+        .returning(*(_cards.c[column.key] for column in CARD_COLUMNS), ORDER_COLUMN)
+    ).mappings().first()
+
+    if row is None:
+        # Sin filas: no existe, no hay permiso o la versión cambió (solo aquí se consulta más)
+        card = loader_for(db).load(Card, card_id)
+        if card is None:
+            raise _not_found()
+        check_board_access(card.board_id, user_id, db, EDITOR)
+        if expected is not None and card.version not in expected:
+            raise precondition_failed(card_id, card.version)
+        raise HTTPException(status_code=403, detail="No tienes permiso para este tablero")
+
+    record_change(db, row["board_id"], "card", card_id)
+    return CardOut.model_validate(dict(row))
+
+
+def _edit_with_move(
+    db: Session, card_id: int, user_id: int, data: CardUpdate, expected: Optional[set[int]]
+) -> CardOut:
+    """Edición que además cambia de lista: ruta ORM con place_card."""
+    card = loader_for(db).load(Card, card_id)
+    if not card:
+        raise _not_found()
+    check_board_access(card.board_id, user_id, db, EDITOR)
+    check_version(card_id, card.version, expected)
+
+    for name in EDITABLE_FIELDS:
+        if getattr(data, name) is not None:
+            setattr(card, name, getattr(data, name))
+    if data.list_id != card.list_id:
+        # Cambiar de lista por PATCH/PUT la deja al final de la lista destino
+        place_card(db, card, data.list_id)
+    card.updated_at = datetime.now(timezone.utc)
+    with stale_guard(db, card_id):
+        db.flush()
+    record_change(db, card.board_id, "card", card.id)
+
+    card.order = card_order(db, card)
+    return CardOut.model_validate(card)
@@ -0,0 +1,129 @@
+"""
+Paginación por cursor (keyset) de las tarjetas de un tablero o de una lista.
+
+Las tarjetas se recorren en el orden visible (ranking.CARD_ORDER): lista a
+lista por id y, dentro de cada lista, por (rank, id). Cada página continúa
+estrictamente después de la última tarjeta devuelta con una comparación de
+tuplas sobre una sola lista, que es un rango del índice ix_cards_list_rank
+(list_id, rank) ya ordenado: ni OFFSET ni ordenación en memoria, así que el
+coste depende del tamaño de la página y no del tablero.
+
+Las tarjetas antiguas sin rank van al final de su lista, por (position, id);
+ese tramo sí se ordena en la consulta, pero solo existe hasta la primera
+escritura en la lista (ensure_list_ranked).
+
+El cursor es opaco para el cliente (base64 de la última clave más su `order`,
+para seguir numerando las tarjetas de esa lista en la página siguiente).
+"""
+import base64
+import json
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from ..boards.models import Card, List
+
+# Columnas que necesitan el orden y el cursor (se cargan aunque no se pidan)
+KEY_COLUMNS = ("id", "board_id", "list_id", "rank", "position")
+
+
+def encode_cursor(card: Card) -> str:
+    """Cursor que apunta justo después de `card` (ya anotada con `order`)."""
+    raw = json.dumps([card.list_id, card.rank, card.position, card.id, card.order], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, Optional[str], int, int, int]:
+    """
+    Decodifica un cursor de `encode_cursor`.
+
+    Raises:
+        HTTPException: 400 si el cursor no es válido.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        list_id, rank, position, card_id, order = json.loads(base64.urlsafe_b64decode(padded))
+        rank = None if rank is None else str(rank)
+        return int(list_id), rank, int(position), int(card_id), int(order)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def _list_window(
+    db: Session, board_id: int, list_id: int, after: Optional[tuple], size: int, options: Sequence
+) -> list[Card]:
+    """
+    Hasta `size` tarjetas de una lista en orden visible, después de `after`.
+
+    `after` es (rank, position, id) de la última tarjeta ya devuelta de esta
+    lista, o None para empezar por el principio.
+    """
+    query = db.query(Card).options(*options).filter(Card.list_id == list_id, Card.board_id == board_id)
+    rows = []
+    if after is None or after[0] is not None:
+        ranked = query.filter(Card.rank.isnot(None))
+        if after is not None:
+            ranked = ranked.filter(tuple_(Card.rank, Card.id) > tuple_(after[0], after[2]))
+        rows = ranked.order_by(Card.rank, Card.id).limit(size).all()
+    if len(rows) < size:
+        unranked = query.filter(Card.rank.is_(None))
+        if after is not None and after[0] is None:
+            unranked = unranked.filter(tuple_(Card.position, Card.id) > tuple_(after[1], after[2]))
+        rows += unranked.order_by(Card.position, Card.id).limit(size - len(rows)).all()
+    return rows
+
+
+def page_cards(
+    db: Session,
+    board_id: int,
+    limit: int,
+    after: Optional[str] = None,
+    list_id: Optional[int] = None,
+    options: Sequence = (),
+) -> tuple[list[Card], Optional[str]]:
+    """
+    Devuelve una página de tarjetas y el cursor de la siguiente (o None).
+
+    Lee lista a lista hasta completar la página: una consulta por lista
+    visitada (dos si la lista conserva tarjetas sin rank).
+
+    Args:
+        limit (int): Tamaño de página.
+        after (str | None): Cursor devuelto por la página anterior.
+        list_id (int | None): Limita la ventana a una lista (scroll virtual por columna).
+        options: Opciones de carga adicionales (p. ej. la proyección de ?fields=).
+
+    Returns:
+        tuple: (tarjetas con `order` calculado, cursor siguiente o None).
+    """
+    if list_id is not None:
+        list_ids = [list_id]
+    else:
+        list_ids = db.scalars(select(List.id).where(List.board_id == board_id).order_by(List.id)).all()
+
+    last_list, last_key, last_order = None, None, -1
+    if after:
+        last_list, rank, position, card_id, last_order = decode_cursor(after)
+        last_key = (rank, position, card_id)
+        # Listas posteriores a la del cursor (la del cursor se continúa)
+        list_ids = [lid for lid in list_ids if lid >= last_list]
+
+    # Una fila de más indica si hay página siguiente
+    rows = []
+    for lid in list_ids:
+        resume = lid == last_list
+        window = _list_window(db, board_id, lid, last_key if resume else None, limit + 1 - len(rows), options)
+        idx = last_order + 1 if resume else 0
+        for card in window:
+            card.order = idx
+            idx += 1
+        rows += window
+        if len(rows) > limit:
+            break
+
+    cards = rows[:limit]
+    next_cursor = encode_cursor(cards[-1]) if len(rows) > limit else None
+    return cards, next_cursor
+
@@ -0,0 +1,343 @@
+"""
+Orden de tarjetas mediante ranks fraccionales (claves lexicográficas).
+
+Cada tarjeta guarda en `Card.rank` una cadena en base 36 (`0-9a-z`) que se
+ordena lexicográficamente dentro de su lista. Para colocar una tarjeta entre
+dos vecinas basta con generar una clave intermedia, de modo que mover una
+tarjeta actualiza una sola fila en lugar de reescribir toda la columna.
+
+Cuando las claves crecen demasiado (muchas inserciones en el mismo hueco) o
+aparecen claves repetidas (escrituras concurrentes), la lista se reequilibra
+asignando claves uniformemente espaciadas.
+
+La API sigue exponiendo el entero `order`: se calcula al leer a partir del
+rank (índice de la tarjeta dentro de su lista).
+"""
+import math
+import string
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, bindparam, func, or_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..boards.models import Card
+from ..config import settings
+
+ALPHABET = string.digits + string.ascii_lowercase
+BASE = len(ALPHABET)
+
+# Orden visible dentro de una lista: primero las tarjetas con rank y detrás las
+# antiguas sin rank, por position (NULL se ordena distinto en SQLite y Postgres)
+CARD_ORDER = (Card.rank.is_(None), Card.rank, Card.position, Card.id)
+
+
+# ===== CLAVES =====
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Genera una clave estrictamente comprendida entre `before` y `after`.
+
+    Args:
+        before (str | None): Clave anterior (None = inicio de la lista).
+        after (str | None): Clave siguiente (None = final de la lista).
+
+    Raises:
+        ValueError: Si `before` no es menor que `after` (no hay hueco).
+
+    Returns:
+        str: Nueva clave. Nunca termina en "0", así siempre queda hueco por debajo.
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"No hay hueco entre los ranks {before!r} y {after!r}")
+
+    before = before or ""
+    result = []
+    i = 0
+    while True:
+        lo = ALPHABET.index(before[i]) if i < len(before) else 0
+        hi = ALPHABET.index(after[i]) if after is not None and i < len(after) else BASE
+
+        if lo == hi:
+            result.append(ALPHABET[lo])
+            i += 1
+            continue
+
+        mid = (lo + hi) // 2
+        if mid > lo:
+            result.append(ALPHABET[mid])
+            return "".join(result)
+
+        # Dígitos consecutivos: fijamos `lo` y seguimos sin límite superior
+        result.append(ALPHABET[lo])
+        after = None
+        i += 1
+
+
+def evenly_spaced_ranks(count: int) -> list[str]:
+    """
+    Genera `count` claves crecientes y uniformemente espaciadas.
+
+    Se usan al reequilibrar una lista: dejan huecos amplios entre vecinas para
+    que las siguientes inserciones produzcan claves cortas.
+    """
+    if count <= 0:
+        return []
+
+    width = max(2, math.ceil(math.log((count + 1) * BASE, BASE)))
+    step = BASE ** width // (count + 1)
+
+    ranks = []
+    for i in range(1, count + 1):
+        value = step * i
+        digits = []
+        for _ in range(width):
+            value, rem = divmod(value, BASE)
+            digits.append(ALPHABET[rem])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+def needs_rebalance(rank: str) -> bool:
+    """Indica si una clave supera la longitud máxima configurada."""
+    return len(rank) > settings.CARD_RANK_MAX_LENGTH
+
+
+# ===== LISTAS =====
+def rebalance_list(db: Session, list_id: int, exclude_card_id: Optional[int] = None) -> list[Card]:
+    """
+    Reasigna claves uniformemente espaciadas a todas las tarjetas de una lista.
+
+    Respeta el orden actual (rank, y para tarjetas antiguas sin rank, position).
+    También sincroniza `position` con el índice para mantenerlo coherente.
+
+    Es un único UPDATE (executemany) que no pasa por el flush del ORM: cambiar
+    solo rank/position no incrementa la versión de las tarjetas, así que
+    reequilibrar no provoca 412 a quien esté editando una vecina.
+
+    Returns:
+        list[Card]: Tarjetas de la lista en su orden final.
+    """
+    query = db.query(Card).filter(Card.list_id == list_id)
+    if exclude_card_id is not None:
+        query = query.filter(Card.id != exclude_card_id)
+
+    cards = query.order_by(*CARD_ORDER).all()
+    if not cards:
+        return cards
+    ranks = evenly_spaced_ranks(len(cards))
+    _rewrite_ranks(db, [(card.id, rank, idx) for idx, (card, rank) in enumerate(zip(cards, ranks))])
+    for idx, (card, rank) in enumerate(zip(cards, ranks)):
+        # Objetos ya cargados: valor nuevo sin marcarlos como modificados
+        set_committed_value(card, "rank", rank)
+        set_committed_value(card, "position", idx)
+    return cards
+
+
+def _rewrite_ranks(db: Session, rows: list[tuple[int, str, int]]) -> None:
+    """UPDATE de rank/position por id (executemany), sin tocar `version`."""
+    cards = Card.__table__
+    db.execute(
+        update(cards)
+        .where(cards.c.id == bindparam("card_id"))
+        .values(rank=bindparam("new_rank"), position=bindparam("new_position")),
+        [{"card_id": card_id, "new_rank": rank, "new_position": idx} for card_id, rank, idx in rows],
+    )
+
+
+def ensure_list_ranked(db: Session, list_id: int) -> None:
+    """
+    Asigna rank a las tarjetas antiguas de una lista (creadas antes de los ranks).
+
+    Es una migración perezosa: solo reequilibra si queda alguna tarjeta sin rank.
+    """
+    pending = (
+        db.query(Card.id)
+        .filter(Card.list_id == list_id, Card.rank.is_(None))
+        .first()
+    )
+    if pending:
+        rebalance_list(db, list_id)
+
+
+def place_card(db: Session, card: Card, list_id: int, index: Optional[int] = None) -> int:
+    """
+    Coloca `card` en la posición `index` de la lista `list_id` actualizando solo esa fila.
+
+    Args:
+        db (Session): Sesión activa.
+        card (Card): Tarjeta a colocar (puede ser nueva o existente).
+        list_id (int): Lista destino.
+        index (int | None): Posición destino; None o fuera de rango = al final.
+
+    Returns:
+        int: Índice efectivo que ocupa la tarjeta en la lista destino.
+    """
+    ensure_list_ranked(db, list_id)
+
+    for attempt in range(2):
+        before, after, effective = _neighbours(db, list_id, index, card.id)
+        try:
+            rank = rank_between(before, after)
+        except ValueError:
+            rank = None
+
+        if rank is not None and not needs_rebalance(rank):
+            break
+        if attempt == 0:
+            rebalance_list(db, list_id, exclude_card_id=card.id)
+    else:
+        raise RuntimeError(f"No se pudo asignar rank en la lista {list_id}")
+
+    card.list_id = list_id
+    card.rank = rank
+    card.order = effective
+    return effective
+
+
+def place_cards(db: Session, placements: Iterable[tuple[Card, int, Optional[int]]]) -> None:
+    """
+    Coloca varias tarjetas con una consulta por lista destino (escrituras en lote).
+
+    Equivale a llamar a `place_card` con cada (tarjeta, lista, índice) en
+    orden, pero las claves se calculan en memoria sobre el orden actual de la
+    lista. Si una lista necesita reequilibrarse, se reasignan todas sus claves
+    una vez y las tarjetas que no están en el lote se actualizan con un único
+    UPDATE (executemany). Ese UPDATE solo cambia rank/position: no incrementa
+    su versión, que es la de su contenido (ver app/cards/versioning.py).
+
+    Args:
+        placements: (tarjeta nueva o existente, lista destino, índice o None = al final).
+    """
+    by_list: dict[int, list] = defaultdict(list)
+    for card, list_id, index in placements:
+        by_list[list_id].append((card, index))
+
+    for list_id, items in by_list.items():
+        ensure_list_ranked(db, list_id)
+        moving = {card.id for card, _ in items if card.id is not None}
+        rows = (
+            db.query(Card.id, Card.rank)
+            .filter(Card.list_id == list_id)
+            .order_by(Card.rank, Card.id)
+            .all()
+        )
+        # Secuencia de la lista: ids de las que no se mueven y objetos Card del lote
+        seq = [card_id for card_id, _ in rows if card_id not in moving]
+        ranks = [rank for card_id, rank in rows if card_id not in moving]
+        others: dict[int, tuple[str, int]] = {}
+
+        for card, index in items:
+            pos = len(seq) if index is None or index >= len(seq) else max(index, 0)
+            before = ranks[pos - 1] if pos > 0 else None
+            after = ranks[pos] if pos < len(ranks) else None
+            try:
+                rank = rank_between(before, after)
+            except ValueError:
+                rank = None
+
+            seq.insert(pos, card)
+            card.list_id = list_id
+            if rank is not None and not needs_rebalance(rank):
+                ranks.insert(pos, rank)
+                card.rank = rank
+                continue
+
+            ranks = evenly_spaced_ranks(len(seq))
+            for idx, (entry, new_rank) in enumerate(zip(seq, ranks)):
+                if isinstance(entry, Card):
+                    entry.rank, entry.position = new_rank, idx
+                else:
+                    others[entry] = (new_rank, idx)
+
+        if others:
+            _rewrite_ranks(db, [(card_id, rank, idx) for card_id, (rank, idx) in others.items()])
+
+
+def _neighbours(db: Session, list_id: int, index: Optional[int], card_id: Optional[int]):
+    """Devuelve (rank_anterior, rank_siguiente, índice_efectivo) para insertar en `index`."""
+    query = db.query(Card.rank).filter(Card.list_id == list_id)
+    if card_id is not None:
+        query = query.filter(Card.id != card_id)
+
+    if index is not None and index <= 0:
+        first = query.order_by(Card.rank, Card.id).first()
+        return None, first.rank if first else None, 0
+
+    if index is not None:
+        rows = query.order_by(Card.rank, Card.id).offset(index - 1).limit(2).all()
+        if rows:
+            return rows[0].rank, rows[1].rank if len(rows) > 1 else None, index
+
+    # Al final de la lista
+    last = query.order_by(Card.rank.desc(), Card.id.desc()).first()
+    count = query.with_entities(func.count(Card.id)).scalar() if last else 0
+    return (last.rank if last else None), None, count
+
+
+# ===== ORDEN EXPUESTO EN LA API =====
+def card_order(db: Session, card: Card) -> int:
+    """
+    Calcula el índice (`order`) de una tarjeta dentro de su lista.
+
+    Para tarjetas antiguas sin rank se usa `position` tal cual.
+    """
+    if card.rank is None:
+        return card.position
+
+    return (
+        db.query(func.count(Card.id))
+        .filter(
+            Card.list_id == card.list_id,
+            or_(Card.rank < card.rank, and_(Card.rank == card.rank, Card.id < card.id)),
+        )
+        .scalar()
+    )
+
+
+def annotate_orders(cards: Iterable[Card]) -> list[Card]:
+    """
+    Asigna `order` a tarjetas ya ordenadas por (list_id, rank, id).
+
+    Evita una consulta por tarjeta: el índice se obtiene enumerando cada lista.
+    """
+    annotated = []
+    current_list = None
+    idx = 0
+    for card in cards:
+        if card.list_id != current_list:
+            current_list = card.list_id
+            idx = 0
+        card.order = idx
+        idx += 1
+        annotated.append(card)
+    return annotated
+
+
+def list_orders(db: Session, list_ids: Iterable[int]) -> dict[int, int]:
+    """
+    Índice (`order`) de cada tarjeta de las listas indicadas, en una consulta.
+
+    Returns:
+        dict: {card_id: order}
+    """
+    list_ids = list(set(list_ids))
+    if not list_ids:
+        return {}
+
+    rows = (
+        db.query(Card.id, Card.list_id)
+        .filter(Card.list_id.in_(list_ids))
+        .order_by(Card.list_id, *CARD_ORDER)
+        .all()
+    )
+    orders = {}
+    current_list = None
+    idx = 0
+    for card_id, list_id in rows:
+        if list_id != current_list:
+            current_list = list_id
+            idx = 0
+        orders[card_id] = idx
+        idx += 1
+    return orders
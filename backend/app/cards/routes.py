@@ -1,79 +1,160 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import Optional
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
-from .schemas import CardCreate, CardUpdate, CardOut, CardMove  # modificacion semana 3
+from .schemas import BulkRequest, BulkResult, CardCreate, CardUpdate, CardOut, CardMove  # modificacion semana 3
+from .bulk import apply_bulk
+from .editing import edit_card
+from .versioning import card_etag, check_version, expected_versions, stale_guard
+from .ranking import CARD_ORDER, place_card, card_order, annotate_orders
+from .pagination import KEY_COLUMNS, page_cards
+from .serialization import dump_card_rows, select_card_rows
 from ..auth.utils import get_current_user, get_db
+from ..idempotency import Idempotent
+from ..loader import loader_for
+from ..projection import (
+    FIELDS_DESCRIPTION, forwarded_headers, load_only_columns, parse_fields, project, projected_response,
+)
 # ✅ CAMBIO 1: Importamos List para poder validar "lista destino" correctamente
 from ..boards.models import Card, Board, List, User
+from ..boards.permissions import EDITOR, check_board_access, verify_board_permission
+from ..boards.changes import record_change
+from ..boards.revisions import conditional_response
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
+# Página por defecto si se pagina con `after` sin indicar `limit`
+DEFAULT_PAGE_SIZE = 100
+
 """Módulo de endpoints para la gestión de 'cards' (tarjetas).
 
 Contiene rutas para crear, listar, obtener, actualizar y eliminar tarjetas.
-Cada endpoint valida que el tablero (board) pertenezca al usuario autenticado
-antes de realizar operaciones que afecten a los recursos.
+Cada endpoint valida que el usuario autenticado tenga acceso al tablero (board):
+las lecturas exigen el rol viewer y las escrituras editor (propietario o
+miembro, ver app/boards/permissions.py). Las escrituras usan
+la caché de decisiones de acceso (check_board_access) y no consultan `boards`
+si la decisión está en caché.
+
+Toda escritura queda en el registro de cambios del tablero e incrementa su
+revisión en la misma transacción (app/boards/changes.py); las lecturas exponen
+la revisión como ETag y responden 304 a If-None-Match.
 """
 
 
-def verify_board_permission(board_id: int, user_id: int, db: Session):
-    """
-    Verifica que el tablero existe y pertenece al usuario.
-    """
-    board = db.query(Board).filter(Board.id == board_id).first()
-    if not board:
-        raise HTTPException(status_code=404, detail="Tablero no encontrado")
-
-    if board.user_id != user_id:
-        raise HTTPException(status_code=403, detail="No tienes permiso para este tablero")
-
-    return board
-
-
 # ================================== CREAR CARDS ==========================================
 @router.post("/", response_model=CardOut)
 def create_card(
     data: CardCreate,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Crea una nueva tarjeta (card) en un tablero y lista especificados.
-    """
-
-    verify_board_permission(data.board_id, current_user.id, db)
 
-    new_card = Card(
-        board_id=data.board_id,
-        list_id=data.list_id,
-        title=data.title,
-        description=data.description,
-        due_date=data.due_date,
-        created_by_id=current_user.id,
-        updated_at=datetime.now(timezone.utc),
-    )
+    Con `Idempotency-Key`, un reintento de la misma petición devuelve la
+    tarjeta ya creada en lugar de crear otra (app/idempotency.py).
+    """
+    with Idempotent(request, db, current_user.id, data) as idem:
+        if idem.replay is not None:
+            return idem.replay
+
+        check_board_access(data.board_id, current_user.id, db, EDITOR)
+
+        new_card = Card(
+            board_id=data.board_id,
+            list_id=data.list_id,
+            title=data.title,
+            description=data.description,
+            due_date=data.due_date,
+            created_by_id=current_user.id,
+            updated_at=datetime.now(timezone.utc),
+        )
+        # La tarjeta nueva se coloca al final de su lista
+        order = place_card(db, new_card, data.list_id)
 
-    db.add(new_card)
-    db.commit()
-    db.refresh(new_card)
-    return new_card
+        db.add(new_card)
+        db.flush()
+        record_change(db, data.board_id, "card", new_card.id)
+        db.commit()
+        db.refresh(new_card)
+        new_card.order = order
+        return idem.respond(CardOut.model_validate(new_card))
 
 
 @router.get("/", response_model=list[CardOut])
 def get_cards(
     board_id: int,
+    request: Request,
+    response: Response,
+    list_id: Optional[int] = Query(None, description="Limitar a una lista (ventana por columna)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Tamaño de página"),
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (X-Next-Cursor)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Lista las tarjetas de un tablero ordenadas por lista y posición.
+
+    Con `limit` (o `after`) pagina por cursor: la respuesta trae como máximo
+    `limit` tarjetas y, si hay más, la cabecera `X-Next-Cursor` con el valor
+    para `after` de la siguiente página. Con `list_id` la ventana se limita a
+    una columna. Sin `limit` devuelve el tablero completo, como antes.
+
+    Con `fields` solo se leen y devuelven esos campos de CardOut. El tablero
+    completo sin proyección se sirve por la ruta rápida de serialization.py.
+
+    Con `If-None-Match` igual a la ETag actual responde 304 sin leer tarjetas.
+    """
+    selected = parse_fields(fields, CardOut)
+    board = verify_board_permission(board_id, current_user.id, db)
+    not_modified = conditional_response(request, response, board)
+    if not_modified:
+        return not_modified
+
+    if limit is None and after is None and not selected:
+        # Tablero completo: filas Core serializadas directamente (sin ORM ni revalidar)
+        rows = select_card_rows(db, board_id, list_id)
+        return Response(
+            content=dump_card_rows(rows),
+            media_type="application/json",
+            headers=forwarded_headers(response),
+        )
+
+    options = [load_only_columns(Card, selected, KEY_COLUMNS)] if selected else []
+
+    if limit is not None or after is not None:
+        cards, next_cursor = page_cards(db, board_id, limit or DEFAULT_PAGE_SIZE, after, list_id, options)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+    else:
+        query = db.query(Card).options(*options).filter(Card.board_id == board_id)
+        if list_id is not None:
+            query = query.filter(Card.list_id == list_id)
+        cards = annotate_orders(query.order_by(Card.list_id, *CARD_ORDER).all())
+
+    if selected:
+        return projected_response([project(card, selected) for card in cards], response)
+    return cards
+
+
+# ============================ OPERACIONES EN LOTE ======================================
+@router.post("/bulk", response_model=BulkResult)
+def bulk_cards(
+    data: BulkRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    verify_board_permission(board_id, current_user.id, db)
+    """
+    Aplica varias operaciones (create/update/move/delete) en una transacción.
 
-    return (
-        db.query(Card)
-        .filter(Card.board_id == board_id)
-        .order_by(Card.list_id, Card.position)
-        .all()
-    )
+    Los permisos se comprueban una vez por tablero y las escrituras se agrupan
+    en sentencias por conjuntos (ver app/cards/bulk.py). La respuesta trae un
+    resultado por operación; las que fallan no impiden aplicar el resto.
+    """
+    return BulkResult(results=apply_bulk(db, current_user.id, data.operations))
 
 
 # ============================ GET /cards/{card_id} ======================================
@@ -81,17 +162,39 @@ def get_cards(
 @router.get("/{card_id}", response_model=CardOut)
 def get_card(
     card_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Obtiene una tarjeta por ID (si pertenece a un board del usuario).
+
+    La ETag combina la versión de la tarjeta y la revisión del tablero: con
+    If-None-Match vigente responde 304, y sirve tal cual como If-Match en
+    PATCH/PUT/move/DELETE. Con `fields` solo se leen y devuelven esos campos.
     """
-    card = db.query(Card).filter(Card.id == card_id).first()
+    selected = parse_fields(fields, CardOut)
+    if selected:
+        card = (
+            db.query(Card)
+            .options(load_only_columns(Card, selected, KEY_COLUMNS + ("version",)))
+            .filter(Card.id == card_id)
+            .first()
+        )
+    else:
+        card = loader_for(db).load(Card, card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Tarjeta no encontrada")
 
-    verify_board_permission(card.board_id, current_user.id, db)
+    board = verify_board_permission(card.board_id, current_user.id, db)
+    not_modified = conditional_response(request, response, board, card_etag(card.id, card.version, board.revision))
+    if not_modified:
+        return not_modified
+    card.order = card_order(db, card)
+    if selected:
+        return projected_response(project(card, selected), response)
     return card
 
 
@@ -101,32 +204,20 @@ def get_card(
 def update_card_patch(
     card_id: int,
     data: CardUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Edita una tarjeta existente (PATCH).
     - Solo aplica los campos que vienen en el body.
+    - Permiso y escritura en un único UPDATE ... RETURNING (ver app/cards/editing.py).
+    - Con `If-Match` (ETag de la tarjeta) responde 412 si la tarjeta cambió.
     """
-    card = db.query(Card).filter(Card.id == card_id).first()
-    if not card:
-        raise HTTPException(status_code=404, detail="Tarjeta no encontrada")
-
-    verify_board_permission(card.board_id, current_user.id, db)
-
-    if data.title is not None:
-        card.title = data.title
-    if data.description is not None:
-        card.description = data.description
-    if data.due_date is not None:
-        card.due_date = data.due_date
-    if data.list_id is not None:
-        card.list_id = data.list_id
-
-    card.updated_at = datetime.now(timezone.utc)
-
+    card = edit_card(db, card_id, current_user.id, data, expected_versions(request, card_id))
     db.commit()
-    db.refresh(card)
+    response.headers["ETag"] = card_etag(card.id, card.version)
     return card
 
 
@@ -136,31 +227,17 @@ def update_card_patch(
 def update_card_put(
     card_id: int,
     data: CardUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Edita una tarjeta existente (PUT).
+    Edita una tarjeta existente (PUT). Misma lógica que PATCH.
     """
-    card = db.query(Card).filter(Card.id == card_id).first()
-    if not card:
-        raise HTTPException(status_code=404, detail="Tarjeta no encontrada")
-
-    verify_board_permission(card.board_id, current_user.id, db)
-
-    if data.title is not None:
-        card.title = data.title
-    if data.description is not None:
-        card.description = data.description
-    if data.due_date is not None:
-        card.due_date = data.due_date
-    if data.list_id is not None:
-        card.list_id = data.list_id
-
-    card.updated_at = datetime.now(timezone.utc)
-
+    card = edit_card(db, card_id, current_user.id, data, expected_versions(request, card_id))
     db.commit()
-    db.refresh(card)
+    response.headers["ETag"] = card_etag(card.id, card.version)
     return card
 
 
@@ -169,6 +246,7 @@ def update_card_put(
 def move_card(
     card_id: int,
     data: CardMove,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -177,120 +255,72 @@ def move_card(
 
     El backend es la autoridad del orden:
     - valida permisos
-    - normaliza posiciones
-    - evita duplicados y huecos
+    - calcula un rank entre las tarjetas vecinas del destino
+    - actualiza solo la fila de la tarjeta movida (sin reescribir columnas)
+    - con `If-Match` (ETag de la tarjeta) responde 412 si la tarjeta cambió;
+      el UPDATE es condicional a la versión leída en cualquier caso
+    - con `Idempotency-Key`, un reintento devuelve la respuesta del primer
+      movimiento sin volver a mover (antes de comprobar If-Match, que ya no
+      coincidiría)
     """
+    with Idempotent(request, db, current_user.id, data) as idem:
+        if idem.replay is not None:
+            return idem.replay
 
-    # 1️⃣ La tarjeta debe existir
-    card = db.query(Card).filter(Card.id == card_id).first()
-    if not card:
-        raise HTTPException(status_code=404, detail="Tarjeta no encontrada")
-
-    # 2️⃣ Seguridad
-    verify_board_permission(card.board_id, current_user.id, db)
-
-    # ✅ CAMBIO 4: Definimos primero old/new para que no reviente con UnboundLocalError
-    old_list_id = card.list_id
-    new_list_id = data.list_id
-    new_order = data.order
-
-    # ✅ CAMBIO 5: Validación correcta de "lista destino": consultamos List (no Card)
-    list_dest = (
-        db.query(List)
-        .filter(List.id == new_list_id, List.board_id == card.board_id)
-        .first()
-    )
-    if not list_dest:
-        raise HTTPException(status_code=400, detail="Lista destino inválida")
-
-    # 3️⃣ Obtener tarjetas destino (para límites)
-    target_cards = (
-        db.query(Card)
-        .filter(Card.board_id == card.board_id, Card.list_id == new_list_id)
-        .order_by(Card.position)
-        .all()
-    )
-
-    # ✅ CAMBIO 6: Normalizamos new_order para evitar índices raros
-    if new_order < 0:
-        new_order = 0
-    if new_order > len(target_cards):
-        new_order = len(target_cards)
-
-    # ================= CASO A: misma columna =================
-    if old_list_id == new_list_id:
-        # quitamos la card de la lista actual y la reinsertamos en new_order
-        remaining = [c for c in target_cards if c.id != card.id]
-        if new_order > len(remaining):
-            new_order = len(remaining)
-        remaining.insert(new_order, card)
-
-        for idx, c in enumerate(remaining):
-            c.position = idx
-            c.updated_at = datetime.now(timezone.utc)
-
-        db.commit()
-        db.refresh(card)
-        return card
-
-    # ================= CASO B: columna distinta =================
-
-    # Reordenar columna origen (sin la card movida)
-    source_cards = (
-        db.query(Card)
-        .filter(
-            Card.board_id == card.board_id,
-            Card.list_id == old_list_id,
-            Card.id != card.id,
-        )
-        .order_by(Card.position)
-        .all()
-    )
+        expected = expected_versions(request, card_id)
 
-    for idx, c in enumerate(source_cards):
-        c.position = idx
-        c.updated_at = datetime.now(timezone.utc)
+        # 1️⃣ La tarjeta debe existir
+        card = loader_for(db).load(Card, card_id)
+        if not card:
+            raise HTTPException(status_code=404, detail="Tarjeta no encontrada")
 
-    # Recalcular destino (antes de insertar)
-    target_cards = (
-        db.query(Card)
-        .filter(Card.board_id == card.board_id, Card.list_id == new_list_id)
-        .order_by(Card.position)
-        .all()
-    )
+        # 2️⃣ Seguridad
+        check_board_access(card.board_id, current_user.id, db, EDITOR)
+        check_version(card_id, card.version, expected)
 
-    if new_order > len(target_cards):
-        new_order = len(target_cards)
+        new_list_id = data.list_id
 
-    target_cards.insert(new_order, card)
+        # ✅ CAMBIO 5: Validación correcta de "lista destino": consultamos List (no Card)
+        list_dest = loader_for(db).load(List, new_list_id)
+        if not list_dest or list_dest.board_id != card.board_id:
+            raise HTTPException(status_code=400, detail="Lista destino inválida")
 
-    for idx, c in enumerate(target_cards):
-        c.list_id = new_list_id
-        c.position = idx
-        c.updated_at = datetime.now(timezone.utc)
+        # 3️⃣ Nuevo rank entre las vecinas del destino (order fuera de rango = al final)
+        order = place_card(db, card, new_list_id, data.order)
+        card.updated_at = datetime.now(timezone.utc)
+        with stale_guard(db, card_id):
+            db.flush()
+        record_change(db, card.board_id, "card", card.id)
 
-    db.commit()
-    db.refresh(card)
-    return card
+        db.commit()
+        db.refresh(card)
+        card.order = order
+        return idem.respond(CardOut.model_validate(card), headers={"ETag": card_etag(card.id, card.version)})
 
 
 # ======================= DELETE CARDS ==============================================
 @router.delete("/{card_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_card(
     card_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Elimina una tarjeta por ID si pertenece a un tablero del usuario autenticado.
-    Retorna 204 si se elimina correctamente.
+    Retorna 204 si se elimina correctamente (412 si hay If-Match y la tarjeta cambió).
     """
-    card = db.query(Card).filter(Card.id == card_id).first()
+    expected = expected_versions(request, card_id)
+    card = loader_for(db).load(Card, card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Tarjeta no encontrada")
 
-    verify_board_permission(card.board_id, current_user.id, db)
+    check_board_access(card.board_id, current_user.id, db, EDITOR)
+    check_version(card_id, card.version, expected)
 
     db.delete(card)
+    with stale_guard(db, card_id):
+        db.flush()
+    record_change(db, card.board_id, "card", card.id, "delete")
     db.commit()
     return None
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import date, datetime
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
+
+from ..config import settings
 
 """
 Módulo de modelos Pydantic para operaciones sobre "cards" (tarjetas) en un tablero.
@@ -9,6 +11,7 @@ Modelos:
 - CardCreate: esquema para la creación de una nueva tarjeta.
 - CardUpdate: esquema para actualización parcial de una tarjeta existente.
 - CardOut: esquema de salida (representación) de una tarjeta tal como se devuelve desde la API/ORMS.        
+- BulkRequest / BulkResult: operaciones en lote de POST /cards/bulk y su resultado por elemento.
 
 Notas:
 - Se usa pydantic para validación automática de tipos y restricciones.
@@ -91,6 +94,7 @@ class CardOut(BaseModel):
     - created_at (datetime): Marca temporal de creación.
     - updated_at (datetime): Marca temporal de la última actualización.
     - archived (bool): Indica si la tarjeta está archivada.
+    - version (int): Versión de la tarjeta (para If-Match en las escrituras).
 
     Configuración:
     - from_attributes = True para permitir compatibilidad con objetos ORM (p. ej., SQLAlchemy).
@@ -108,5 +112,67 @@ class CardOut(BaseModel):
     created_at: datetime
     updated_at: datetime
     archived: bool
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ===== OPERACIONES EN LOTE (POST /cards/bulk) =====
+class BulkCreate(CardCreate):
+    """Crear una tarjeta (al final de su lista)."""
+    op: Literal["create"]
+
+
+class BulkUpdate(CardUpdate):
+    """Editar una tarjeta; `archived` permite archivar/desarchivar en lote."""
+    op: Literal["update"]
+    id: int
+    version: Optional[int] = Field(None, description="Solo si la tarjeta sigue en esta versión (412 si no)")
+
+
+class BulkMove(CardMove):
+    """Mover una tarjeta a `list_id` en la posición `order`."""
+    op: Literal["move"]
+    id: int
+    version: Optional[int] = Field(None, description="Solo si la tarjeta sigue en esta versión (412 si no)")
+
+
+class BulkDelete(BaseModel):
+    """Eliminar una tarjeta."""
+    op: Literal["delete"]
+    id: int
+    version: Optional[int] = Field(None, description="Solo si la tarjeta sigue en esta versión (412 si no)")
+
+
+BulkOperation = Annotated[Union[BulkCreate, BulkUpdate, BulkMove, BulkDelete], Field(discriminator="op")]
+
+
+class BulkRequest(BaseModel):
+    """
+    Lote de operaciones sobre tarjetas.
+
+    Cada tarjeta existente puede aparecer una sola vez en el lote.
+    """
+    operations: list[BulkOperation] = Field(..., min_length=1, max_length=settings.CARD_BULK_MAX_OPERATIONS)
+
+
+class BulkItemResult(BaseModel):
+    """
+    Resultado de una operación del lote (mismo índice que en la petición).
+
+    - status: código HTTP equivalente al de la operación individual
+      (201 create, 200 update/move, 204 delete; 400/403/404/409/412 si falla).
+    - card: la tarjeta resultante (no en borrados ni errores).
+    - error: motivo del fallo, si lo hubo.
+    """
+    index: int
+    op: str
+    status: int
+    id: Optional[int] = None
+    card: Optional[CardOut] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    """Resultado de POST /cards/bulk: un elemento por operación, en orden."""
+    results: list[BulkItemResult]
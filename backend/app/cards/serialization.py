@@ -0,0 +1,79 @@
+"""
+Ruta rápida de lectura masiva de tarjetas: filas Core -> bytes JSON.
+
+La ruta normal crea un objeto ORM por tarjeta, lo valida con CardOut
+(`from_attributes`) y FastAPI lo vuelve a codificar; en tableros grandes eso
+domina la CPU. Aquí se seleccionan solo las columnas de CardOut como filas
+Core (sin identity map ni objetos ORM) y se serializan directamente con un
+serializador de pydantic precompilado (TypeAdapter sobre un TypedDict con los
+mismos campos y tipos que CardOut), que no revalida los datos.
+
+El JSON resultante es idéntico al de CardOut, y la ruta sigue declarando
+`response_model=list[CardOut]`, así que el esquema OpenAPI no cambia.
+"""
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing_extensions import TypedDict
+
+from ..boards.models import Card
+from .ranking import CARD_ORDER
+
+
+class CardRow(TypedDict):
+    """Mismos campos, tipos y orden que CardOut (app/cards/schemas.py)."""
+    id: int
+    board_id: int
+    list_id: int
+    order: int
+    title: str
+    description: Optional[str]
+    due_date: Optional[date]
+    created_by_id: int
+    responsible_id: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+    archived: bool
+    version: int
+
+
+# Serializador compilado una vez al importar el módulo
+CARD_ROWS = TypeAdapter(list[CardRow])
+
+# Columnas de CardOut que existen en la tabla (`order` se calcula). El orden
+# de las claves del dict se conserva en el JSON, así que se respeta el de CardOut.
+CARD_FIELDS = tuple(CardRow.__annotations__)
+_ORDER_AT = CARD_FIELDS.index("order")
+_LIST_AT = CARD_FIELDS.index("list_id")
+CARD_COLUMNS = [getattr(Card, name) for name in CARD_FIELDS if name != "order"]
+
+
+def select_card_rows(db: Session, board_id: int, list_id: Optional[int] = None) -> list[dict]:
+    """
+    Tarjetas del tablero como diccionarios en el orden visible, con `order`.
+
+    Una consulta Core; el índice dentro de cada lista se calcula al recorrer.
+    """
+    stmt = select(*CARD_COLUMNS).where(Card.board_id == board_id)
+    if list_id is not None:
+        stmt = stmt.where(Card.list_id == list_id)
+    stmt = stmt.order_by(Card.list_id, *CARD_ORDER)
+
+    rows = []
+    current_list = None
+    idx = 0
+    for row in db.execute(stmt):
+        if row[_LIST_AT] != current_list:
+            current_list = row[_LIST_AT]
+            idx = 0
+        rows.append(dict(zip(CARD_FIELDS, (*row[:_ORDER_AT], idx, *row[_ORDER_AT:]))))
+        idx += 1
+    return rows
+
+
+def dump_card_rows(rows: list[dict]) -> bytes:
+    """Serializa las filas a JSON (bytes) con el serializador precompilado."""
+    return CARD_ROWS.dump_json(rows)
@@ -0,0 +1,96 @@
+"""
+Concurrencia optimista en tarjetas (versión + If-Match).
+
+Cada tarjeta lleva `Card.version`, que aumenta cada vez que cambia la propia
+tarjeta (contenido, lista o posición al moverla). Reequilibrar los ranks de
+una lista no la incrementa: solo reescribe rank/position de las vecinas
+(app/cards/ranking.py), y no debe provocar 412 a quien las esté editando.
+
+Las escrituras (PATCH/PUT/move/DELETE) aceptan la cabecera `If-Match` con la
+ETag de la tarjeta; si la tarjeta ha cambiado desde entonces se responde 412
+en lugar de pisar el cambio de otra persona.
+
+No hay bloqueos de fila: la comprobación va en el propio UPDATE
+(`... WHERE version = :leída`), tanto en las sentencias Core (editing, bulk)
+como en los flush del ORM (`version_id_col` del modelo, que lanza
+StaleDataError si otra transacción escribió entre la lectura y el flush).
+
+Sin `If-Match` las escrituras siguen siendo incondicionales respecto al
+cliente, pero el ORM sigue protegiendo la ventana lectura -> escritura.
+
+ETags:
+- Escrituras: `"card-<id>-<version>"`.
+- GET /cards/{id}: `"card-<id>-<version>-<revisión del tablero>"`. La revisión
+  cubre el `order`, que cambia al mover otras tarjetas, así que sirve para
+  If-None-Match; en If-Match solo cuentan el id y la versión. De este modo el
+  flujo normal leer -> escribir funciona con la ETag del GET.
+"""
+import re
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+_TAG = re.compile(r'^"card-(\d+)-(\d+)(?:-\d+)?"$')
+
+
+def card_etag(card_id: int, version: int, revision: Optional[int] = None) -> str:
+    """
+    ETag fuerte de una versión concreta de la tarjeta.
+
+    Con `revision` (lecturas) incluye además la revisión del tablero.
+    """
+    suffix = f"-{revision}" if revision is not None else ""
+    return f'"card-{card_id}-{version}{suffix}"'
+
+
+def precondition_failed(card_id: int, version: Optional[int] = None) -> HTTPException:
+    """412 con la ETag vigente (si se conoce) para que el cliente pueda releer."""
+    headers = {"ETag": card_etag(card_id, version)} if version is not None else None
+    return HTTPException(
+        status_code=412,
+        detail="La tarjeta ha cambiado desde que la leíste; vuelve a cargarla",
+        headers=headers,
+    )
+
+
+def expected_versions(request: Request, card_id: int) -> Optional[set[int]]:
+    """
+    Versiones aceptadas según `If-Match`.
+
+    Returns:
+        set[int] | None: None si no hay If-Match o es `*` (sin condición).
+
+    Raises:
+        HTTPException: 412 si If-Match no contiene ninguna ETag de esta tarjeta
+            (comparación fuerte: las ETags débiles nunca coinciden).
+    """
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    versions = set()
+    for value in header.split(","):
+        match = _TAG.match(value.strip())
+        if match and int(match.group(1)) == card_id:
+            versions.add(int(match.group(2)))
+    if not versions:
+        raise precondition_failed(card_id)
+    return versions
+
+
+def check_version(card_id: int, version: int, expected: Optional[set[int]]) -> None:
+    """Lanza 412 si hay condición y la versión actual no la cumple."""
+    if expected is not None and version not in expected:
+        raise precondition_failed(card_id, version)
+
+
+@contextmanager
+def stale_guard(db: Session, card_id: int) -> Iterator[None]:
+    """Convierte un StaleDataError del flush (escritura concurrente) en 412."""
+    try:
+        yield
+    except StaleDataError:
+        db.rollback()
+        raise precondition_failed(card_id)
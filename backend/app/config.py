@@ -1,16 +1,78 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
-from pydantic import ConfigDict
+from pydantic import BaseModel, ConfigDict
+
+
+class BoardTemplate(BaseModel):
+    """Plantilla de tablero: nombre por defecto y listas (en orden)."""
+    name: str
+    lists: list[str]
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./test.db"
+    ASYNC_DB: bool = False  # Rutas de tableros/tarjetas async (asyncpg / aiosqlite)
+    DATABASE_REPLICA_URLS: str = ""  # Réplicas de lectura, separadas por comas
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # Lecturas al primario tras escribir
+
+    # Pool de conexiones (por proceso/worker)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # segundos esperando conexión antes de TimeoutError
+    DB_POOL_RECYCLE: int = 1800  # segundos; -1 desactiva el reciclado
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False
     
     # JWT
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    IDENTITY_CACHE_TTL_SECONDS: float = 60.0  # Caché de usuarios autenticados
+    IDENTITY_CACHE_MAX_SIZE: int = 10_000
+    PERMISSION_CACHE_TTL_SECONDS: float = 30.0  # Decisiones de acceso (usuario, tablero)
+    PERMISSION_CACHE_MAX_SIZE: int = 50_000
+
+    # Hashing de contraseñas (pool de procesos)
+    PBKDF2_ROUNDS: Optional[int] = None  # None = defecto de passlib; calibrar con app.auth.calibrate
+    HASH_POOL_WORKERS: int = 2  # 0 = en el hilo de la petición
+    HASH_QUEUE_DEPTH: int = 32  # trabajos en espera antes de responder 503
+    HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Plantillas de tablero (JSON en la variable de entorno BOARD_TEMPLATES)
+    BOARD_TEMPLATES: dict[str, BoardTemplate] = {
+        "default": BoardTemplate(name="Tablero principal", lists=["Por hacer", "En curso", "Hecho"]),
+    }
+    DEFAULT_BOARD_TEMPLATE: str = "default"  # Plantilla del tablero creado al registrarse
+
+    # Cards (orden por rank fraccional)
+    CARD_RANK_MAX_LENGTH: int = 24
+    CARD_BULK_MAX_OPERATIONS: int = 1000  # Operaciones por petición en POST /cards/bulk
+
+    # Claves de idempotencia (cabecera Idempotency-Key en POST /cards y move)
+    # La tabla guarda solo las claves de las últimas IDEMPOTENCY_TTL_SECONDS: cada reserva
+    # borra hasta IDEMPOTENCY_PURGE_BATCH claves caducadas (más de las que añade), así que
+    # las caducadas no se acumulan aunque no se ejecute `python -m app.idempotency`.
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 3600  # Tiempo durante el que se reproduce una respuesta
+    IDEMPOTENCY_PURGE_BATCH: int = 100  # Claves caducadas borradas en cada reserva
+
+    # Registro de cambios por tablero (GET /boards/{id}/changes)
+    CHANGELOG_RETENTION_SECONDS: float = 7 * 24 * 3600
+
+    # Exportación NDJSON (GET /boards/{id}/export)
+    EXPORT_BATCH_SIZE: int = 1000  # Filas leídas del cursor de servidor por lote
+
+    # Importación NDJSON (POST /boards/import y python -m app.boards.importer)
+    IMPORT_BATCH_SIZE: int = 5000  # Filas por insert() y por punto de control
+    IMPORT_MAX_BYTES: int = 512 * 1024 * 1024  # Tamaño máximo del cuerpo (413 si se supera)
+    IMPORT_SPOOL_MEMORY_BYTES: int = 8 * 1024 * 1024  # A partir de aquí el cuerpo va a disco
+
+    # Eventos en tiempo real (WebSocket /ws/boards/{id})
+    BROADCAST_BACKEND: str = "local"  # "local" (un proceso) o "postgres" (LISTEN/NOTIFY entre workers)
+    BROADCAST_URL: str = ""  # Conexión para LISTEN/NOTIFY; por defecto DATABASE_URL
+    BROADCAST_CHANNEL: str = "neocare_board_events"
+    WS_QUEUE_SIZE: int = 100  # Eventos pendientes por cliente antes de desconectarlo
     
     model_config = ConfigDict(
         env_file=".env" if os.getenv("TESTING") != "1" else None
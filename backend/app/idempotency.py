@@ -0,0 +1,215 @@
+"""
+Claves de idempotencia para escrituras que los clientes reintentan.
+
+Un cliente que no recibe la respuesta (red móvil inestable) reenvía la misma
+petición con la misma cabecera `Idempotency-Key`. La primera ejecución guarda
+su respuesta en la tabla `idempotency_keys`, con clave (usuario, método, ruta,
+clave) y caducidad IDEMPOTENCY_TTL_SECONDS; los reintentos reciben esa misma
+respuesta sin volver a ejecutar la escritura.
+
+- Mismo usuario y clave con otro cuerpo: 422 (la clave no se puede reutilizar).
+- Reintento mientras la primera ejecución sigue en curso: 409 con Retry-After.
+- Si la escritura falla (cualquier excepción, incluidos 4xx), la clave se
+  libera y el siguiente reintento vuelve a ejecutarse.
+
+Al estar en la base de datos, la clave la ven todos los workers e instancias:
+la reserva es un INSERT sobre la clave primaria, así que de dos reintentos
+simultáneos solo uno ejecuta la escritura. Reservar y guardar la respuesta
+usan transacciones cortas propias (otra conexión del pool), independientes
+de la transacción de la escritura.
+
+Cada reserva borra también hasta IDEMPOTENCY_PURGE_BATCH claves caducadas
+(de cualquier usuario), así que la tabla se limita a las claves vivas. Para
+purgarlas todas de una vez:
+
+    python -m app.idempotency
+"""
+import argparse
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .boards.models import IdempotencyKey
+from .config import settings
+from .database import SessionLocal
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Vida máxima de la marca "en curso" si el proceso muere a mitad de la petición
+PENDING_TTL_SECONDS = 60.0
+
+keys = IdempotencyKey.__table__
+
+
+def _fingerprint(payload: Optional[BaseModel]) -> str:
+    raw = payload.model_dump_json().encode() if payload is not None else b""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _expires_in(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+class Idempotent:
+    """
+    Contexto de una escritura idempotente.
+
+    Uso en una ruta:
+
+        with Idempotent(request, db, current_user.id, data) as idem:
+            if idem.replay is not None:
+                return idem.replay
+            ...  # escritura
+            return idem.respond(CardOut.model_validate(card), headers=...)
+
+    Sin cabecera `Idempotency-Key` no hace nada: `replay` es None y `respond`
+    solo construye la respuesta.
+    """
+
+    def __init__(self, request: Request, db: Session, user_id: int, payload: Optional[BaseModel] = None):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is not None and not 0 < len(key) <= MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{IDEMPOTENCY_HEADER} debe tener entre 1 y {MAX_KEY_LENGTH} caracteres",
+            )
+        self.key = (
+            {"user_id": user_id, "method": request.method, "path": request.url.path, "key": key}
+            if key else None
+        )
+        # Primario: la petición escribe, así que RoutingSession no elige réplica
+        self._bind = db.get_bind() if key else None
+        self.fingerprint = _fingerprint(payload)
+        self.replay: Optional[Response] = None
+        self._owner = False
+        self._stored = False
+
+    def _match(self):
+        return [keys.c[name] == value for name, value in self.key.items()]
+
+    def _live_entry(self):
+        with self._bind.connect() as conn:
+            return conn.execute(
+                select(keys.c.fingerprint, keys.c.status_code, keys.c.body, keys.c.headers)
+                .where(*self._match(), keys.c.expires_at > datetime.now(timezone.utc))
+            ).first()
+
+    def _claim(self) -> bool:
+        """Reserva la clave (INSERT); False si otra petición la tiene."""
+        now = datetime.now(timezone.utc)
+        try:
+            with self._bind.begin() as conn:
+                _purge_batch(conn, now)
+                # Una clave caducada se puede reutilizar
+                conn.execute(delete(keys).where(*self._match(), keys.c.expires_at <= now))
+                conn.execute(insert(keys).values(
+                    **self.key, fingerprint=self.fingerprint, expires_at=_expires_in(PENDING_TTL_SECONDS),
+                ))
+            return True
+        except IntegrityError:
+            return False
+
+    def __enter__(self) -> "Idempotent":
+        if self.key is None:
+            return self
+        entry = self._live_entry()
+        if entry is None:
+            if self._claim():
+                self._owner = True
+                return self
+            entry = self._live_entry()
+
+        if entry is not None and entry.fingerprint != self.fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{IDEMPOTENCY_HEADER} ya usada con una petición distinta",
+            )
+        if entry is None or entry.status_code is None:
+            # En curso (o la reserva caducó justo ahora): el cliente reintenta
+            raise HTTPException(
+                status_code=409,
+                detail="Hay una petición con esta Idempotency-Key en curso",
+                headers={"Retry-After": "1"},
+            )
+        self.replay = Response(
+            content=entry.body,
+            status_code=entry.status_code,
+            media_type="application/json",
+            headers={**(entry.headers or {}), REPLAY_HEADER: "true"},
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._owner and not self._stored:
+            # La escritura falló (o no llegó a responder): el reintento la ejecuta
+            with self._bind.begin() as conn:
+                conn.execute(delete(keys).where(*self._match()))
+
+    def respond(self, content: BaseModel, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+        """
+        Respuesta JSON de la escritura; con clave, queda guardada para los reintentos.
+
+        Llamar después del commit: si el commit falla, la clave se libera.
+        """
+        body = content.model_dump_json().encode()
+        headers = dict(headers or {})
+        if self._owner:
+            with self._bind.begin() as conn:
+                conn.execute(
+                    update(keys)
+                    .where(*self._match())
+                    .values(
+                        status_code=status_code,
+                        body=body,
+                        headers=headers,
+                        expires_at=_expires_in(settings.IDEMPOTENCY_TTL_SECONDS),
+                    )
+                )
+            self._stored = True
+        return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def _purge_batch(conn, now: datetime) -> None:
+    """Borra hasta IDEMPOTENCY_PURGE_BATCH claves caducadas (las bloqueadas por otra reserva se saltan)."""
+    pk = tuple_(*keys.primary_key.columns)
+    expired = (
+        select(*keys.primary_key.columns)
+        .where(keys.c.expires_at <= now)
+        .limit(settings.IDEMPOTENCY_PURGE_BATCH)
+        .with_for_update(skip_locked=True)
+    )
+    conn.execute(delete(keys).where(pk.in_(expired)))
+
+
+def purge_expired_keys(db: Session) -> int:
+    """Borra las claves caducadas. Devuelve cuántas borró (no hace commit)."""
+    result = db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Borra las claves de idempotencia caducadas.")
+    parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        deleted = purge_expired_keys(db)
+        db.commit()
+
+    print(f"Claves borradas: {deleted}")
+    return deleted
+
+
+if __name__ == "__main__":
+    main()
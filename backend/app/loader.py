@@ -0,0 +1,87 @@
+"""
+Cargador de entidades por id con ámbito de petición (estilo DataLoader).
+
+Una misma petición suele pedir varias veces las mismas filas (la tarjeta, su
+tablero, la lista destino...). `RequestLoader` vive en `session.info` durante
+la petición y:
+
+- sirve las repeticiones desde el identity map de la sesión, sin SQL;
+- agrupa los ids pendientes de un modelo (`prime`) y los carga todos con un
+  único `SELECT ... WHERE id IN (...)` en el primer `load` de ese modelo;
+- recuerda los ids inexistentes para no volver a consultarlos.
+
+Uso (así comprueba POST /cards/bulk el permiso de cada tablero del lote):
+    loader = loader_for(db)
+    loader.prime(Board, board_ids)
+    board = loader.load(Board, board_id)   # una consulta para todos los primados
+"""
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+# Clave de session.info con el cargador de la petición
+LOADER_KEY = "loader"
+
+
+class RequestLoader:
+    """Cargador por id ligado a una sesión (una petición)."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._pending: dict[type, set] = defaultdict(set)
+        self._absent: dict[type, set] = defaultdict(set)
+        # El identity map guarda referencias débiles: el cargador retiene lo que carga
+        self._loaded: dict[type, dict] = defaultdict(dict)
+        self.batches = 0
+        self.hits = 0
+
+    def prime(self, model: type, ids: Iterable[Any]) -> None:
+        """Anota ids para cargarlos en la próxima consulta de `model`."""
+        self._pending[model].update(i for i in ids if i is not None)
+
+    def load(self, model: type, ident: Any) -> Optional[Any]:
+        """Devuelve la entidad con ese id (o None si no existe)."""
+        return self.load_many(model, [ident])[0]
+
+    def load_many(self, model: type, ids: Iterable[Any]) -> list[Optional[Any]]:
+        """
+        Devuelve las entidades de `ids` en el mismo orden (None si no existen).
+
+        Los ids que no están ya en la sesión, junto con los primados, se
+        cargan con una sola consulta IN.
+        """
+        ids = list(ids)
+        wanted = set(ids) | self._pending.pop(model, set())
+        missing = [
+            i for i in wanted
+            if i not in self._absent[model] and self._from_session(model, i) is None
+        ]
+        if missing:
+            pk = inspect(model).primary_key[0]
+            loaded = self._loaded[model]
+            for obj in self.db.query(model).filter(pk.in_(missing)).all():
+                loaded[getattr(obj, pk.key)] = obj
+            self._absent[model].update(i for i in missing if i not in loaded)
+            self.batches += 1
+        self.hits += sum(1 for i in ids if i not in missing)
+        return [self._from_session(model, i) for i in ids]
+
+    def _from_session(self, model: type, ident: Any) -> Optional[Any]:
+        obj = self._loaded[model].get(ident)
+        if obj is None:
+            obj = self.db.identity_map.get(identity_key(model, ident))
+        # Tras un commit la entidad está caducada: se vuelve a cargar
+        if obj is None or inspect(obj).expired or inspect(obj).deleted or inspect(obj).detached:
+            return None
+        return obj
+
+
+def loader_for(db: Session) -> RequestLoader:
+    """Cargador de la sesión `db`; se crea en el primer uso de la petición."""
+    loader = db.info.get(LOADER_KEY)
+    if loader is None:
+        loader = db.info[LOADER_KEY] = RequestLoader(db)
+    return loader
@@ -5,15 +5,35 @@ Inicializa el servidor FastAPI, configura la política CORS para permitir llamad
 desde el frontend, incluye las rutas de autenticación y expone el endpoint raíz
 de verificación de estado.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI  # Importa la clase FastAPI que se usa para crear la aplicación web/servidor.
 from fastapi.middleware.cors import CORSMiddleware
 
 from .auth.routes import router as auth_router  # importa las rutas de auth
+from .auth.hashing import hashing_executor
+from .boards.events import board_events
 from .boards.routes import router as boards_router
+from .boards.ws import router as ws_router
 from .cards.routes import router as cards_router  # ✅ agrega cards aquí, arriba, como los demás
+from .metrics import router as metrics_router
+from .search.routes import router as search_router
+from .query_count import QueryCountMiddleware
+from .read_your_writes import ReadYourWritesMiddleware
+from .async_routes import asyncify_router
+from .config import settings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arranque y parada de recursos de proceso (eventos en tiempo real, pool de hashing)."""
+    await board_events.start()
+    yield
+    await board_events.stop()
+    hashing_executor.shutdown()
+
 
 # Inicializa la aplicación FastAPI con título personalizado
-app = FastAPI(title="NeoCare API")
+app = FastAPI(title="NeoCare API", lifespan=lifespan)
 
 # CORS (para que el frontend pueda llamar al backend)
 app.add_middleware(
@@ -22,12 +42,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Query-Count", "X-Next-Cursor", "X-Last-Write"],
 )
 
+# Número de sentencias SQL de cada petición en la cabecera X-Query-Count
+app.add_middleware(QueryCountMiddleware)
+
+# Marca de la última escritura del cliente (lecturas consistentes con réplicas)
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Registra las rutas
 app.include_router(auth_router)
-app.include_router(boards_router)
-app.include_router(cards_router)  # ✅ incluye cards aquí también (en orden)
+app.include_router(metrics_router)
+
+# Tableros y tarjetas: versión síncrona (threadpool) o asíncrona (engine async)
+if settings.ASYNC_DB:
+    app.include_router(asyncify_router(boards_router))
+    app.include_router(asyncify_router(cards_router))
+    app.include_router(asyncify_router(search_router))
+else:
+    app.include_router(boards_router)
+    app.include_router(cards_router)  # ✅ incluye cards aquí también (en orden)
+    app.include_router(search_router)
+
+# Cambios de tableros en tiempo real (WebSocket)
+app.include_router(ws_router)
 
 @app.get("/")
 def root():
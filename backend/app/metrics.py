@@ -0,0 +1,53 @@
+"""
+Endpoints de métricas operativas del backend NeoCare.
+
+Expone el estado en vivo de los pools de conexiones (en uso, libres, overflow)
+y los tiempos de espera acumulados, para dimensionar los pools por worker a
+partir de datos reales, los contadores de las cachés en memoria y los
+suscriptores WebSocket de tableros.
+
+Todos requieren un usuario administrador (`User.role == "admin"`): revelan
+detalles internos del despliegue.
+"""
+from fastapi import APIRouter, Depends
+
+from .auth.utils import require_admin
+from .boards.events import board_events
+from .cache import all_cache_stats
+from .pool_metrics import all_pool_status
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics():
+    """
+    Devuelve el estado de cada pool de conexiones registrado en este worker.
+
+    Campos por pool:
+        pool_size, checked_out, idle, overflow, max_overflow,
+        waits, wait_avg_ms, wait_max_ms, wait_total_ms, timeouts.
+    """
+    return {"pools": all_pool_status()}
+
+
+@router.get("/caches")
+def get_cache_metrics():
+    """
+    Devuelve los contadores de cada caché en memoria de este worker.
+
+    Campos por caché:
+        size, maxsize, hits, misses, evictions.
+    """
+    return {"caches": all_cache_stats()}
+
+
+@router.get("/realtime")
+def get_realtime_metrics():
+    """
+    Devuelve el estado de los suscriptores WebSocket de este worker.
+
+    Campos:
+        boards, subscribers, delivered, dropped (clientes desconectados por lentos).
+    """
+    return board_events.hub.stats()
@@ -0,0 +1,115 @@
+"""
+Métricas del pool de conexiones de SQLAlchemy.
+
+Define pools instrumentados que miden cuánto espera cada petición para obtener
+una conexión y cuántas veces se agota el tiempo de espera (QueuePool overflow
+timeout), además de un registro de engines para exponer su estado en vivo
+(conexiones en uso, libres y en overflow) desde app.metrics.
+"""
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Contadores acumulados de espera de un pool (thread-safe).
+
+    Campos:
+        waits (int): Conexiones entregadas.
+        wait_total (float): Segundos totales esperando conexión.
+        wait_max (float): Mayor espera observada (segundos).
+        timeouts (int): Esperas que terminaron en TimeoutError.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def record(self, elapsed: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.waits += 1
+            self.wait_total += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg = self.wait_total / self.waits if self.waits else 0.0
+            return {
+                "waits": self.waits,
+                "wait_avg_ms": round(avg * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+class _InstrumentedMixin:
+    """Mide el tiempo de `_do_get` (obtener conexión del pool, esperando si está lleno)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    """QueuePool con métricas de espera."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool con métricas de espera (engine asíncrono)."""
+
+
+# ===== REGISTRO DE ENGINES =====
+_engines = {}
+
+
+def register_engine(name: str, engine) -> None:
+    """Registra un engine (síncrono o asíncrono) para exponer su pool en /metrics."""
+    _engines[name] = getattr(engine, "sync_engine", engine)
+
+
+def pool_status(pool) -> dict:
+    """
+    Estado en vivo de un pool.
+
+    Returns:
+        dict: pool_size, checked_out, idle, overflow y, si el pool está
+        instrumentado, las métricas de espera.
+    """
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            pool_size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
+
+
+def all_pool_status() -> dict:
+    """Estado de todos los engines registrados, por nombre."""
+    return {name: pool_status(engine.pool) for name, engine in _engines.items()}
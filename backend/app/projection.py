@@ -0,0 +1,77 @@
+"""
+Proyección de campos (`?fields=`) para las lecturas de tarjetas y tableros.
+
+`?fields=id,title,list_id,order` devuelve solo esos campos. La proyección se
+lleva al SELECT con `load_only(..., raiseload=True)`: las columnas no pedidas
+(p. ej. la descripción, de tipo Text) no se leen de la base de datos ni se
+serializan, y si algún código intentara acceder a ellas fallaría en lugar de
+lanzar una consulta por fila.
+
+Los nombres válidos son los campos del schema de salida (CardOut, BoardOut,
+ListOut), de modo que el contrato de la API no cambia; `id` se incluye siempre.
+"""
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only
+
+FIELDS_DESCRIPTION = "Campos a devolver separados por comas (p. ej. id,title,list_id,order)"
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[list[str]]:
+    """
+    Valida `?fields=` contra los campos del schema de salida.
+
+    Returns:
+        list[str] | None: Campos pedidos (con `id` primero), o None si no se
+        pidió proyección.
+
+    Raises:
+        HTTPException: 400 si hay campos desconocidos o la lista está vacía.
+    """
+    if fields is None:
+        return None
+
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in schema.model_fields]
+    if unknown or not requested:
+        detail = f"Campos desconocidos: {', '.join(unknown)}" if unknown else "Indica al menos un campo"
+        raise HTTPException(status_code=400, detail=detail)
+
+    return ["id"] + [name for name in requested if name != "id"]
+
+
+def load_only_columns(model: type, fields: Iterable[str], required: Iterable[str] = ()):
+    """
+    Opción de carga que lee solo las columnas de `fields` más las `required`
+    (las que la ruta necesita internamente, p. ej. para calcular `order`).
+
+    Los campos calculados (que no son columnas) se ignoran.
+    """
+    columns = model.__table__.columns.keys()
+    names = [name for name in dict.fromkeys([*required, *fields]) if name in columns]
+    return load_only(*(getattr(model, name) for name in names), raiseload=True)
+
+
+def project(obj: Any, fields: list[str]) -> dict:
+    """Diccionario con los campos pedidos de un objeto."""
+    return {name: getattr(obj, name) for name in fields}
+
+
+def forwarded_headers(response: Response) -> dict:
+    """
+    Cabeceras ya fijadas en `response` (ETag, X-Next-Cursor...), que FastAPI no
+    aplicaría al devolver una Response propia.
+    """
+    return {
+        key: value for key, value in response.headers.items()
+        if key.lower() not in ("content-length", "content-type")
+    }
+
+
+def projected_response(content: Any, response: Response) -> JSONResponse:
+    """Respuesta JSON para un resultado proyectado, conservando las cabeceras."""
+    return JSONResponse(jsonable_encoder(content), headers=forwarded_headers(response))
@@ -0,0 +1,61 @@
+"""
+Contador de sentencias SQL por petición (cabecera X-Query-Count).
+
+`QueryCountMiddleware` abre un contador por petición en una ContextVar; un
+listener global de `before_cursor_execute` lo incrementa por cada sentencia
+que ejecuta cualquier engine dentro de esa petición (también en el threadpool
+y en el modo async, que heredan el contexto). El total se devuelve en la
+respuesta para poder comprobar desde fuera cuántas consultas cuesta cada
+endpoint.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+HEADER = b"x-query-count"
+
+
+class QueryCounter:
+    """Número de sentencias ejecutadas en la petición actual."""
+
+    def __init__(self):
+        self.count = 0
+
+
+current_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = current_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+class QueryCountMiddleware:
+    """Middleware ASGI que añade X-Query-Count a cada respuesta HTTP."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+        token = current_counter.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((HEADER, str(counter.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            current_counter.reset(token)
@@ -0,0 +1,109 @@
+"""
+Lecturas consistentes tras escribir, con la marca guardada en el cliente.
+
+Cuando una petición confirma escrituras, la respuesta lleva la hora de la
+escritura en la cookie `last_write` y en la cabecera `X-Last-Write`. El cliente
+la devuelve en las peticiones siguientes (el navegador envía la cookie solo;
+otros clientes pueden reenviar la cabecera) y, durante
+READ_YOUR_WRITES_SECONDS, RoutingSession manda sus lecturas al primario en
+lugar de a una réplica.
+
+La marca viaja con cada petición, así que funciona con cualquier número de
+workers o instancias sin estado compartido ni sticky sessions.
+
+`ReadYourWritesMiddleware` abre una `WriteMarker` por petición en una
+ContextVar (como QueryCountMiddleware): la sesión la consulta al elegir
+conexión y la actualiza al hacer commit.
+"""
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from .config import settings
+
+COOKIE = "last_write"
+HEADER = b"x-last-write"
+
+
+class WriteMarker:
+    """
+    Marca de escritura de la petición actual.
+
+    Args:
+        last_write (float | None): Hora (epoch) de la última escritura del
+            cliente, según la cookie o cabecera recibida.
+    """
+
+    def __init__(self, last_write: Optional[float] = None):
+        self.last_write = last_write
+        self.wrote_at: Optional[float] = None  # Escritura confirmada en esta petición
+
+    def recent(self, now: Optional[float] = None) -> bool:
+        """Indica si el cliente escribió hace menos de READ_YOUR_WRITES_SECONDS."""
+        if self.last_write is None:
+            return False
+        age = (time.time() if now is None else now) - self.last_write
+        # Una marca del futuro no es válida: no fija al cliente al primario
+        return 0 <= age < settings.READ_YOUR_WRITES_SECONDS
+
+    def record_write(self) -> None:
+        """Anota una escritura confirmada (se devuelve al cliente en la respuesta)."""
+        self.wrote_at = self.last_write = time.time()
+
+
+current_marker: ContextVar[Optional[WriteMarker]] = ContextVar("write_marker", default=None)
+
+
+def _parse_timestamp(raw: Optional[str]) -> Optional[float]:
+    try:
+        return float(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def marker_from_headers(headers: list[tuple[bytes, bytes]]) -> WriteMarker:
+    """Construye la marca a partir de la cabecera X-Last-Write o de la cookie."""
+    header, cookie = None, None
+    for name, value in headers:
+        if name == HEADER:
+            header = value.decode("latin-1")
+        elif name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(COOKIE)
+            if morsel is not None:
+                cookie = morsel.value
+    last_write = _parse_timestamp(header)
+    return WriteMarker(last_write if last_write is not None else _parse_timestamp(cookie))
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que lee la marca de la petición y devuelve la nueva si hubo escritura."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marker = marker_from_headers(scope.get("headers", []))
+        token = current_marker.set(marker)
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and marker.wrote_at is not None:
+                value = f"{marker.wrote_at:.3f}"
+                max_age = max(1, int(settings.READ_YOUR_WRITES_SECONDS))
+                headers = list(message.get("headers", []))
+                headers.append((HEADER, value.encode()))
+                headers.append((
+                    b"set-cookie",
+                    f"{COOKIE}={value}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax".encode(),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            current_marker.reset(token)
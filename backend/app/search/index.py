@@ -0,0 +1,168 @@
+"""
+Índice de texto completo sobre el título y la descripción de las tarjetas.
+
+- SQLite: tabla virtual FTS5 `cards_fts` de contenido externo (no duplica el
+  texto; lee `cards` por rowid) y triggers AFTER INSERT / UPDATE OF
+  title, description, board_id / DELETE que la mantienen al día. Mover o
+  archivar una tarjeta no toca el índice. También indexa `board_id` como
+  término, para que la consulta filtre por tableros accesibles dentro del
+  propio índice (intersección de listas de postings) en vez de leer de
+  `cards` cada coincidencia de todos los tableros.
+- PostgreSQL: índice GIN de expresión `ix_cards_search` sobre el tsvector
+  ponderado (título 'A', descripción 'B'). Lo mantiene el propio Postgres y
+  las consultas usan exactamente la misma expresión (SEARCH_VECTOR_SQL); el
+  filtro por tablero se combina con ix_cards_board (BitmapAnd).
+
+Al estar en la base de datos, el índice sigue a cualquier escritura: rutas
+ORM, sentencias Core en lote, la importación NDJSON y los borrados en cascada.
+
+Se crea junto con la tabla `cards` (eventos DDL de create_all). En una base ya
+existente se crea y rellena con:
+
+    python -m app.search.index
+
+En SQLite, la búsqueda por prefijo de 2 y 3 letras (escribir "cl" mientras se
+teclea) usa índices de prefijo propios. Tras una carga masiva (importaciones
+grandes) conviene fusionar los segmentos de FTS5, que de otro modo se leen
+por separado en cada consulta:
+
+    python -m app.search.index --optimize
+"""
+import argparse
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import DDL, Engine, event, text
+
+from ..boards.models import Card
+
+# Configuración de texto de Postgres: sin stemming, válida para textos en varios idiomas
+TEXT_CONFIG = "simple"
+
+# Peso del título frente a la descripción en el ranking de SQLite (bm25); board_id no puntúa
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+BOARD_WEIGHT = 0.0
+
+# Con más tableros accesibles, el filtro por tablero se hace solo con el IN de la consulta
+MAX_INDEX_FILTER_BOARDS = 500
+
+# Expresión del índice GIN; la consulta debe usar el mismo texto para que Postgres use el índice
+SEARCH_VECTOR_SQL = (
+    f"(setweight(to_tsvector('{TEXT_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_CONFIG}', coalesce(description, '')), 'B'))"
+)
+
+SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+        title, description, board_id,
+        content='cards', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ai AFTER INSERT ON cards BEGIN
+        INSERT INTO cards_fts(rowid, title, description, board_id)
+        VALUES (new.id, new.title, new.description, new.board_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ad AFTER DELETE ON cards BEGIN
+        INSERT INTO cards_fts(cards_fts, rowid, title, description, board_id)
+        VALUES ('delete', old.id, old.title, old.description, old.board_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_au AFTER UPDATE OF title, description, board_id ON cards BEGIN
+        INSERT INTO cards_fts(cards_fts, rowid, title, description, board_id)
+        VALUES ('delete', old.id, old.title, old.description, old.board_id);
+        INSERT INTO cards_fts(rowid, title, description, board_id)
+        VALUES (new.id, new.title, new.description, new.board_id);
+    END
+    """,
+)
+
+
+def postgres_index_ddl(concurrently: bool = False) -> str:
+    """CREATE INDEX del índice GIN (CONCURRENTLY no bloquea escrituras, pero no admite transacción)."""
+    mode = "CONCURRENTLY " if concurrently else ""
+    return f"CREATE INDEX {mode}IF NOT EXISTS ix_cards_search ON cards USING GIN ({SEARCH_VECTOR_SQL})"
+
+
+for _statement in SQLITE_DDL:
+    event.listen(Card.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Card.__table__, "before_drop", DDL("DROP TABLE IF EXISTS cards_fts").execute_if(dialect="sqlite"))
+event.listen(Card.__table__, "after_create", DDL(postgres_index_ddl()).execute_if(dialect="postgresql"))
+
+
+def search_terms(q: str) -> list[str]:
+    """
+    Palabras de la búsqueda, sin la sintaxis de FTS5 / tsquery.
+
+    Solo se conservan caracteres de palabra, así que el texto del usuario
+    nunca se interpreta como operadores (comillas, NEAR, `:*`, `!`...).
+    """
+    return re.findall(r"\w+", q.lower())
+
+
+def fts5_query(terms: list[str], board_ids: Optional[Sequence[int]] = None) -> str:
+    """
+    Consulta MATCH de FTS5: todas las palabras (la última como prefijo) en
+    título o descripción y, si se indican, solo en esos tableros.
+    """
+    words = " ".join(f'"{term}"' for term in terms) + "*"
+    query = f"{{title description}} : ({words})"
+    if board_ids:
+        query += " AND board_id : (" + " OR ".join(f'"{board_id}"' for board_id in board_ids) + ")"
+    return query
+
+
+def tsquery(terms: list[str]) -> str:
+    """Consulta to_tsquery equivalente a `fts5_query`."""
+    return " & ".join(terms) + ":*"
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """
+    Crea el índice si falta (idempotente) y, en SQLite, lo reconstruye desde `cards`.
+
+    Para bases creadas antes de existir el índice; en las nuevas lo crean los
+    eventos DDL de `cards`. En Postgres se construye CONCURRENTLY, sin
+    bloquear las escrituras en `cards` mientras tanto.
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(postgres_index_ddl(concurrently=True)))
+    elif engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            for statement in SQLITE_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')"))
+
+
+def optimize_search_index(engine: Engine) -> None:
+    """Fusiona los segmentos del índice FTS5 en uno (SQLite); en Postgres no hace nada."""
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO cards_fts(cards_fts) VALUES ('optimize')"))
+
+
+def main(argv=None):
+    from ..database import engine
+
+    parser = argparse.ArgumentParser(description="Crea (o reconstruye) el índice de búsqueda de tarjetas.")
+    parser.add_argument("--optimize", action="store_true", help="Solo fusionar segmentos (tras cargas masivas)")
+    args = parser.parse_args(argv)
+
+    if args.optimize:
+        optimize_search_index(engine)
+        print("Índice de búsqueda optimizado")
+        return
+    ensure_search_index(engine)
+    print(f"Índice de búsqueda listo ({engine.dialect.name})")
+
+
+if __name__ == "__main__":
+    main()
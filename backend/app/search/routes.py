@@ -0,0 +1,137 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Optional
+import base64
+import json
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from .index import (
+    BOARD_WEIGHT, DESCRIPTION_WEIGHT, MAX_INDEX_FILTER_BOARDS, SEARCH_VECTOR_SQL, TEXT_CONFIG, TITLE_WEIGHT,
+    fts5_query, search_terms, tsquery,
+)
+from .schemas import SearchHit
+from ..auth.utils import get_current_user, get_db
+from ..boards.models import Card, User
+from ..boards.permissions import boards_with_role
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+DEFAULT_PAGE_SIZE = 20
+
+"""Módulo de endpoints de búsqueda de texto completo en tarjetas.
+
+GET /search busca en el título y la descripción de las tarjetas de todos los
+tableros a los que el usuario tiene acceso (propios o compartidos, rol viewer
+o superior). Usa el índice de app/search/index.py: FTS5 en SQLite y el índice
+GIN de tsvector en Postgres.
+"""
+
+# Tabla virtual FTS5 (SQLite); no forma parte de los modelos
+cards_fts = table("cards_fts", column("rowid"))
+
+
+def encode_cursor(score: float, card_id: int) -> str:
+    """Cursor opaco que apunta justo después del resultado (score, id)."""
+    raw = json.dumps([score, card_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Decodifica un cursor de `encode_cursor`.
+
+    Raises:
+        HTTPException: 400 si el cursor no es válido.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, card_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(card_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def search_cards(
+    db: Session, user_id: int, q: str, limit: int, after: Optional[str] = None
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Una página de tarjetas que contienen todas las palabras de `q` (la última como prefijo).
+
+    La coincidencia y el orden (score, id) se resuelven en el índice de
+    texto; de `cards` solo se leen las filas de la página, que además se
+    comprueban con `board_id IN (tableros con rol viewer)`. La página
+    siguiente continúa por keyset sobre (score, id).
+
+    En SQLite los tableros accesibles se leen antes (una consulta) y se
+    filtran dentro del propio índice FTS5: solo se puntúan las coincidencias
+    del usuario, no las de todos los tableros. Si son más de
+    MAX_INDEX_FILTER_BOARDS, el filtro se hace uniendo con `cards`.
+
+    Returns:
+        tuple: (resultados como dicts de SearchHit, cursor siguiente o None).
+    """
+    terms = search_terms(q)
+    if not terms:
+        return [], None
+    accessible = boards_with_role(user_id)
+
+    if db.get_bind().dialect.name == "postgresql":
+        vector = literal_column(SEARCH_VECTOR_SQL)
+        query = func.to_tsquery(literal_column(f"'{TEXT_CONFIG}'"), tsquery(terms))
+        score = (-func.ts_rank(vector, query)).label("score")
+        key = Card.id
+        ranked = select(key, score).where(vector.op("@@")(query), Card.board_id.in_(accessible))
+    else:
+        board_ids = db.scalars(accessible).all()
+        if not board_ids:
+            return [], None
+        if len(board_ids) > MAX_INDEX_FILTER_BOARDS:
+            board_ids = None
+        score = func.bm25(literal_column("cards_fts"), TITLE_WEIGHT, DESCRIPTION_WEIGHT, BOARD_WEIGHT).label("score")
+        key = cards_fts.c.rowid
+        ranked = select(key.label("id"), score).where(
+            literal_column("cards_fts").op("MATCH")(fts5_query(terms, board_ids))
+        )
+        if board_ids is None:
+            ranked = ranked.join(Card, Card.id == key).where(Card.board_id.in_(accessible))
+
+    if after:
+        last_score, last_id = decode_cursor(after)
+        ranked = ranked.where(or_(score > last_score, and_(score == last_score, key > last_id)))
+
+    # Una fila de más indica si hay página siguiente
+    page = ranked.order_by(score, key).limit(limit + 1).subquery()
+    rows = db.execute(
+        select(Card.id, Card.board_id, Card.list_id, Card.title, Card.archived, page.c.score)
+        .join(page, Card.id == page.c.id)
+        .where(Card.board_id.in_(accessible))
+        .order_by(page.c.score, Card.id)
+    ).mappings().all()
+    hits = [dict(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(hits[-1]["score"], hits[-1]["id"]) if len(rows) > limit else None
+    return hits, next_cursor
+
+
+# ================================== BUSCAR CARDS ==========================================
+@router.get("", response_model=list[SearchHit])
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Palabras a buscar"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100, description="Tamaño de página"),
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (X-Next-Cursor)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Busca tarjetas por título y descripción en los tableros accesibles.
+
+    Los resultados vienen ordenados por relevancia (el título pesa más que la
+    descripción). Si hay más, la cabecera `X-Next-Cursor` trae el valor para
+    `after` de la siguiente página. Si entre páginas cambian tarjetas, la
+    relevancia puede variar ligeramente, como en cualquier búsqueda paginada.
+    """
+    hits, next_cursor = search_cards(db, current_user.id, q, limit, after)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return hits
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+
+"""
+Modelos Pydantic de la búsqueda de tarjetas (GET /search).
+
+Modelos:
+- SearchHit: una tarjeta encontrada, con lo necesario para abrirla en su tablero.
+"""
+
+
+class SearchHit(BaseModel):
+    """
+    Resultado de búsqueda.
+
+    Campos:
+    - id, board_id, list_id (int): Tarjeta y su ubicación.
+    - title (str): Título de la tarjeta.
+    - archived (bool): Si la tarjeta está archivada.
+    - score (float): Puntuación de relevancia; menor es más relevante
+      (bm25 en SQLite, -ts_rank en Postgres). Solo sirve para ordenar.
+    """
+    id: int
+    board_id: int
+    list_id: int
+    title: str
+    archived: bool
+    score: float
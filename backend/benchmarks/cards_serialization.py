@@ -0,0 +1,105 @@
+"""
+Benchmark de serialización de GET /cards/ para tableros grandes.
+
+Compara, sobre SQLite en memoria con 1k, 10k y 100k tarjetas:
+- orm:    objetos ORM + CardOut (from_attributes) + JSON, como la ruta genérica.
+- rapida: filas Core + serializador precompilado (app.cards.serialization).
+
+Uso (desde backend/):
+    python -m benchmarks.cards_serialization
+    python -m benchmarks.cards_serialization --sizes 1000 10000 --repeat 5
+"""
+import argparse
+import time
+from datetime import date
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.boards.models import Board, Card, List, User
+from app.cards.ranking import annotate_orders
+from app.cards.schemas import CardOut
+from app.cards.serialization import dump_card_rows, select_card_rows
+from app.database import Base
+
+LISTS_PER_BOARD = 10
+CARD_OUT_LIST = TypeAdapter(list[CardOut])
+
+
+def build_board(size: int):
+    """Crea una base en memoria con un tablero de `size` tarjetas. Devuelve (Session, board_id)."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        user = User(email="bench@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Benchmark", user_id=user.id)
+        db.add(board)
+        db.flush()
+        lists = [List(name=f"Lista {i}", board_id=board.id, position=i) for i in range(LISTS_PER_BOARD)]
+        db.add_all(lists)
+        db.flush()
+        db.execute(insert(Card), [
+            {
+                "title": f"Tarjeta {i}",
+                "description": "Descripción de ejemplo" if i % 3 else None,
+                "due_date": date(2026, 1, 1 + i % 28) if i % 2 else None,
+                "board_id": board.id,
+                "list_id": lists[i % LISTS_PER_BOARD].id,
+                "created_by_id": user.id,
+                "rank": f"{i:08d}",
+                "position": i // LISTS_PER_BOARD,
+            }
+            for i in range(size)
+        ])
+        db.commit()
+        return Session, board.id
+
+
+def serialize_orm(db, board_id: int) -> bytes:
+    cards = db.query(Card).filter(Card.board_id == board_id).order_by(
+        Card.list_id, Card.rank, Card.position, Card.id
+    ).all()
+    return CARD_OUT_LIST.dump_json([CardOut.model_validate(card) for card in annotate_orders(cards)])
+
+
+def serialize_fast(db, board_id: int) -> bytes:
+    return dump_card_rows(select_card_rows(db, board_id))
+
+
+def best_time(Session, board_id: int, fn, repeat: int) -> float:
+    """Mejor tiempo (segundos) de `repeat` ejecuciones, cada una con sesión nueva."""
+    best = float("inf")
+    for _ in range(repeat):
+        with Session() as db:
+            start = time.perf_counter()
+            fn(db, board_id)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de tarjetas.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medida (se toma la mejor)")
+    args = parser.parse_args(argv)
+
+    print(f"{'tarjetas':>10} {'orm (ms)':>10} {'rapida (ms)':>12} {'x':>6}")
+    results = []
+    for size in args.sizes:
+        Session, board_id = build_board(size)
+        with Session() as db:
+            assert serialize_orm(db, board_id) == serialize_fast(db, board_id)
+        orm = best_time(Session, board_id, serialize_orm, args.repeat)
+        fast = best_time(Session, board_id, serialize_fast, args.repeat)
+        results.append((size, orm, fast))
+        print(f"{size:>10} {orm * 1000:>10.1f} {fast * 1000:>12.1f} {orm / fast:>6.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
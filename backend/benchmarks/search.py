@@ -0,0 +1,101 @@
+"""
+Benchmark de GET /search (app.search.routes.search_cards) sobre SQLite FTS5.
+
+Crea una base con `size` tarjetas repartidas en BOARDS tableros de USERS
+usuarios, con títulos y descripciones de un vocabulario sintético (unas
+palabras muy frecuentes y muchas raras), y mide el mejor tiempo de una página
+de 20 resultados para el usuario 1 con distintos tipos de búsqueda. Tras la
+carga se fusionan los segmentos de FTS5 (python -m app.search.index --optimize).
+
+Uso (desde backend/):
+    python -m benchmarks.search
+    python -m benchmarks.search --size 1000000 --repeat 5
+"""
+import argparse
+import random
+import string
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.boards.models import Board, Card, List, User
+from app.database import Base
+from app.search.index import optimize_search_index
+from app.search.routes import search_cards
+
+USERS = 100
+BOARDS = 1_000
+_rng = random.Random(0)
+VOCABULARY = ["".join(_rng.choices(string.ascii_lowercase, k=_rng.randint(4, 10))) for _ in range(20_000)]
+COMMON = ["revisar", "cliente", "informe", "urgente"]
+QUERIES = {
+    "rara": VOCABULARY[12345],
+    "frecuente": "cliente",
+    "dos palabras": "revisar informe",
+    "prefijo": VOCABULARY[123][:4],
+    "prefijo corto": VOCABULARY[123][:2],
+}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    picked = [rng.choice(VOCABULARY) for _ in range(words)]
+    if rng.random() < 0.2:
+        picked.append(rng.choice(COMMON))
+    return " ".join(picked)
+
+
+def build(size: int, seed: int = 1):
+    """Crea la base en memoria con `size` tarjetas. Devuelve la clase Session."""
+    rng = random.Random(seed)
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.execute(insert(User), [{"email": f"u{i}@example.com", "password_hash": "x"} for i in range(USERS)])
+        db.execute(insert(Board), [{"name": f"T{i}", "user_id": 1 + i % USERS} for i in range(BOARDS)])
+        db.execute(insert(List), [{"name": "L", "board_id": 1 + i, "position": 0} for i in range(BOARDS)])
+        for start in range(0, size, 50_000):
+            db.execute(insert(Card), [
+                {
+                    "title": _text(rng, 3),
+                    "description": _text(rng, 12),
+                    "board_id": 1 + i % BOARDS,
+                    "list_id": 1 + i % BOARDS,
+                    "created_by_id": 1 + i % USERS,
+                    "rank": f"{i:08d}",
+                }
+                for i in range(start, min(start + 50_000, size))
+            ])
+        db.commit()
+    optimize_search_index(engine)
+    return Session
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de búsqueda de tarjetas.")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por medida (se toma la mejor)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    Session = build(args.size)
+    print(f"{args.size} tarjetas indexadas en {time.perf_counter() - start:.1f} s")
+
+    print(f"{'búsqueda':>14} {'q':>12} {'resultados':>10} {'ms':>8}")
+    results = {}
+    with Session() as db:
+        for name, q in QUERIES.items():
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                hits, _ = search_cards(db, 1, q, 20)
+                best = min(best, time.perf_counter() - t0)
+            results[name] = best
+            print(f"{name:>14} {q:>12} {len(hits):>10} {best * 1000:>8.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
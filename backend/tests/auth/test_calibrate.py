@@ -0,0 +1,67 @@
+"""
+Pruebas de la calibración del coste de hashing y del rehash en login
+(app.auth.calibrate, app.auth.utils.build_pwd_context, /auth/login).
+
+Este módulo verifica:
+- Que calibrate_rounds extrapola las iteraciones al presupuesto indicado y
+  que el redondeo no baja del mínimo.
+- Que un hash con otro coste se marca para actualizar.
+- Que un login correcto sustituye el hash antiguo por uno con el coste configurado.
+"""
+from unittest.mock import patch
+
+from passlib.hash import pbkdf2_sha256
+
+from app.auth import hashing, utils
+from app.auth.calibrate import calibrate_rounds, write_env_value
+from app.auth.hashing import HashingExecutor
+from app.auth.utils import build_pwd_context
+from app.boards.models import User
+
+
+def test_calibrate_rounds_lineal():
+    """Con 1 µs por iteración, 50 ms equivalen a 50.000 iteraciones."""
+    assert calibrate_rounds(50, measure=lambda rounds: rounds * 1e-6) == 50_000
+
+
+def test_calibrate_rounds_respeta_minimo():
+    """Un presupuesto muy bajo nunca da menos iteraciones que el mínimo de seguridad."""
+    assert calibrate_rounds(0.001, measure=lambda rounds: rounds * 1e-6, min_rounds=10_000) == 10_000
+
+
+def test_calibrate_rounds_redondeo_no_baja_del_minimo():
+    """Se redondea hacia arriba: con un mínimo que no es múltiplo de 1000 nunca se queda por debajo."""
+    assert calibrate_rounds(0.001, measure=lambda rounds: rounds * 1e-6, min_rounds=10_400) == 11_000
+    assert calibrate_rounds(12.3, measure=lambda rounds: rounds * 1e-6, min_rounds=1_000) == 13_000
+
+
+def test_write_env_value(tmp_path):
+    """El valor se añade o reemplaza sin tocar el resto del fichero."""
+    env = tmp_path / ".env"
+    env.write_text("SECRET_KEY=x\nPBKDF2_ROUNDS=1000\n")
+    write_env_value(env, "PBKDF2_ROUNDS", 42000)
+    assert env.read_text() == "SECRET_KEY=x\nPBKDF2_ROUNDS=42000\n"
+
+
+def test_needs_update_por_coste():
+    """Solo los hashes con un coste distinto del configurado necesitan actualizarse."""
+    context = build_pwd_context(2000)
+    assert context.needs_update(pbkdf2_sha256.using(rounds=1000).hash("pw")) is True
+    assert context.needs_update(context.hash("pw")) is False
+
+
+def test_login_rehashea_al_nuevo_coste(monkeypatch, Session, client):
+    """Tras un login correcto, el password_hash guardado usa el coste configurado."""
+    with Session() as db:
+        db.add(User(email="rehash@example.com", password_hash=pbkdf2_sha256.using(rounds=1000).hash("pw")))
+        db.commit()
+
+    monkeypatch.setattr(utils, "pwd_context", build_pwd_context(2000))
+    with patch.object(hashing, "hashing_executor", HashingExecutor(workers=0, queue_depth=1)):
+        resp = client.post("/auth/login", json={"email": "rehash@example.com", "password": "pw"})
+
+    assert resp.status_code == 200, resp.text
+    with Session() as db:
+        stored = db.query(User).filter(User.email == "rehash@example.com").one().password_hash
+    assert pbkdf2_sha256.from_string(stored).rounds == 2000
+    assert utils.verify_password("pw", stored) is True
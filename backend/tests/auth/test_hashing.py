@@ -0,0 +1,73 @@
+"""
+Pruebas del hashing de contraseñas en pool de procesos (app.auth.hashing).
+
+Este módulo verifica:
+- Que hash_password/verify_password del pool producen hashes compatibles con
+  las utilidades originales.
+- Que con la cola llena se falla al instante (HashingBusy) en lugar de esperar.
+- Que las rutas traducen la cola llena a 503 con cabecera Retry-After.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import hashing
+from app.auth.hashing import HashingBusy, HashingExecutor
+from app.auth.utils import get_db, verify_password as verify_inline
+from app.main import app
+
+
+def test_pool_de_procesos_hashea_y_verifica():
+    """El hash generado en otro proceso se verifica con las utilidades normales."""
+    executor = HashingExecutor(workers=1, queue_depth=1)
+    try:
+        with patch.object(hashing, "hashing_executor", executor):
+            hashed = hashing.hash_password("secreto")
+            assert verify_inline("secreto", hashed) is True
+            assert hashing.verify_password("secreto", hashed) is True
+            assert hashing.verify_password("otro", hashed) is False
+    finally:
+        executor.shutdown()
+
+
+def test_cola_llena_falla_al_instante():
+    """Sin huecos libres, run() lanza HashingBusy sin bloquear."""
+    executor = HashingExecutor(workers=0, queue_depth=0)
+    started = threading.Event()
+
+    def lento():
+        started.set()
+        time.sleep(0.3)
+
+    hilo = threading.Thread(target=executor.run, args=(lento,))
+    hilo.start()
+    started.wait()
+
+    inicio = time.perf_counter()
+    with pytest.raises(HashingBusy):
+        executor.run(lambda: None)
+    assert time.perf_counter() - inicio < 0.1
+    hilo.join()
+
+    assert executor.run(lambda: "ok") == "ok"
+
+
+def test_login_con_cola_llena_devuelve_503():
+    """El login responde 503 con Retry-After cuando el pool está saturado."""
+    lleno = HashingExecutor(workers=0, queue_depth=0)
+    lleno._slots.acquire()
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = MagicMock(password_hash="x")
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with patch.object(hashing, "hashing_executor", lleno):
+            resp = TestClient(app).post("/auth/login", json={"email": "a@example.com", "password": "x"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
@@ -0,0 +1,83 @@
+"""
+Pruebas de la caché de identidades (app.auth.identity) usada por get_current_user.
+
+Este módulo verifica:
+- Que tras la primera petición get_current_user no vuelve a consultar la tabla users.
+- Que los contadores de aciertos/fallos reflejan ese comportamiento.
+- Que actualizar o eliminar el usuario invalida su entrada.
+
+Se usa un engine SQLite en memoria y se cuentan las sentencias SELECT sobre users.
+"""
+import pytest
+from sqlalchemy import event
+
+from app.auth.identity import identity_cache
+from app.auth.utils import create_token, get_current_user
+from app.boards.models import User
+
+
+@pytest.fixture
+def entorno(engine, Session):
+    """Un usuario, contador de SELECT sobre users y caché limpia."""
+    with Session() as db:
+        user = User(email="cache@example.com", password_hash="hash", name="Cache")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    selects = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar(conn, cursor, statement, params, context, executemany):
+        if statement.startswith("SELECT") and "FROM users" in statement:
+            selects.append(statement)
+
+    identity_cache.clear()
+    yield Session, user_id, create_token({"user_id": user_id}), selects
+    identity_cache.clear()
+
+
+def test_segunda_peticion_no_consulta_users(entorno):
+    """La segunda resolución del mismo token se sirve desde la caché."""
+    Session, user_id, token, selects = entorno
+    antes = identity_cache.stats()
+
+    with Session() as db:
+        assert get_current_user(token=token, db=db).id == user_id
+    with Session() as db:
+        user = get_current_user(token=token, db=db)
+        assert user.email == "cache@example.com"
+        assert user in db
+
+    assert len(selects) == 1
+    despues = identity_cache.stats()
+    assert despues["hits"] - antes["hits"] == 1
+    assert despues["misses"] - antes["misses"] == 1
+
+
+def test_actualizar_usuario_invalida(entorno):
+    """Un cambio en el usuario elimina su entrada y la siguiente petición ve el dato nuevo."""
+    Session, user_id, token, selects = entorno
+
+    with Session() as db:
+        get_current_user(token=token, db=db)
+    with Session() as db:
+        db.get(User, user_id).name = "Nuevo nombre"
+        db.commit()
+    with Session() as db:
+        assert get_current_user(token=token, db=db).name == "Nuevo nombre"
+
+
+def test_eliminar_usuario_invalida(entorno):
+    """Tras eliminar el usuario, su token deja de ser válido."""
+    Session, user_id, token, _ = entorno
+
+    with Session() as db:
+        get_current_user(token=token, db=db)
+    with Session() as db:
+        db.delete(db.get(User, user_id))
+        db.commit()
+    with Session() as db:
+        with pytest.raises(Exception) as excinfo:
+            get_current_user(token=token, db=db)
+        assert "Token inválido o expirado" in str(excinfo.value)
@@ -0,0 +1,113 @@
+"""
+Pruebas del registro de cambios y GET /boards/{id}/changes (app.boards.changes).
+
+Este módulo verifica:
+- Que las escrituras de tarjetas quedan registradas con su revisión.
+- Que /changes devuelve solo lo modificado, reducido al estado final, con lápidas.
+- Que un `since` anterior al recorte devuelve el snapshot completo.
+- Que trim_changes borra lo antiguo y sube changelog_floor.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.changes import record_change, trim_changes
+from app.boards.models import Board, BoardChange, List, User
+
+
+@pytest.fixture
+def entorno(Session, client):
+    """Cliente con un tablero de dos listas."""
+    with Session() as db:
+        user = User(email="changes@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Cambios", user_id=user.id)
+        db.add(board)
+        db.flush()
+        todo = List(name="Por hacer", board_id=board.id, position=0)
+        done = List(name="Hecho", board_id=board.id, position=1)
+        db.add_all([todo, done])
+        db.commit()
+        ids = {"user": user.id, "board": board.id, "todo": todo.id, "done": done.id}
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, headers, ids, Session
+
+
+def crear(client, headers, ids, title):
+    resp = client.post(
+        "/cards/",
+        json={"title": title, "board_id": ids["board"], "list_id": ids["todo"]},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["id"]
+
+
+def test_cambios_desde_revision(entorno):
+    client, headers, ids, _ = entorno
+    primera = crear(client, headers, ids, "Primera")
+    base = client.get(f"/boards/{ids['board']}/snapshot", headers=headers).json()
+    assert base["revision"] == 1
+
+    segunda = crear(client, headers, ids, "Segunda")
+    client.patch(f"/cards/{segunda}", json={"title": "Segunda editada"}, headers=headers)
+    client.patch(f"/cards/{segunda}/move", json={"list_id": ids["done"], "order": 0}, headers=headers)
+    client.delete(f"/cards/{primera}", headers=headers)
+
+    resp = client.get(f"/boards/{ids['board']}/changes", params={"since": base["revision"]}, headers=headers)
+
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["revision"] == 5
+    assert data["full"] is False
+    assert [(c["id"], c["title"], c["list_id"], c["order"]) for c in data["cards"]] == [
+        (segunda, "Segunda editada", ids["done"], 0)
+    ]
+    assert data["deleted"] == [{"entity": "card", "id": primera}]
+
+
+def test_sin_cambios_y_revision_futura(entorno):
+    client, headers, ids, _ = entorno
+    crear(client, headers, ids, "Única")
+    url = f"/boards/{ids['board']}/changes"
+
+    data = client.get(url, params={"since": 1}, headers=headers).json()
+    assert (data["cards"], data["deleted"]) == ([], [])
+
+    assert client.get(url, params={"since": 99}, headers=headers).status_code == 400
+
+
+def test_recorte_y_snapshot_completo(entorno):
+    client, headers, ids, Session = entorno
+    crear(client, headers, ids, "Vieja")
+    crear(client, headers, ids, "Reciente")
+
+    with Session() as db:
+        # La primera entrada pasa a tener 10 días
+        old = db.query(BoardChange).filter(BoardChange.revision == 1).one()
+        old.created_at = datetime.now(timezone.utc) - timedelta(days=10)
+        db.commit()
+
+        assert trim_changes(db, retention_seconds=24 * 3600) == 1
+        db.commit()
+        assert db.get(Board, ids["board"]).changelog_floor == 1
+        assert db.query(BoardChange).count() == 1
+
+    url = f"/boards/{ids['board']}/changes"
+    completo = client.get(url, params={"since": 0}, headers=headers).json()
+    assert completo["full"] is True
+    assert [c["title"] for c in completo["snapshot"]["lists"][0]["cards"]] == ["Vieja", "Reciente"]
+
+    parcial = client.get(url, params={"since": 1}, headers=headers).json()
+    assert parcial["full"] is False
+    assert [c["title"] for c in parcial["cards"]] == ["Reciente"]
+
+
+def test_record_change_valida_operacion(entorno):
+    _, _, ids, Session = entorno
+    with Session() as db:
+        with pytest.raises(ValueError):
+            record_change(db, ids["board"], "card", 1, "rename")
@@ -0,0 +1,208 @@
+"""
+Pruebas de los eventos en tiempo real (app.boards.events y /ws/boards/{id}).
+
+Este módulo verifica:
+- Que el hub reparte cada mensaje a los suscriptores de su tablero y expulsa
+  a los que no vacían su cola.
+- Que los eventos se publican al hacer commit y se descartan con rollback.
+- Que el WebSocket autentica con el JWT y recibe los cambios de otras peticiones.
+- Que un miembro expulsado deja de recibir cambios (cierre 1008).
+- Que el backend postgres reconecta y repite el LISTEN si se pierde la conexión.
+"""
+import asyncio
+import json
+
+import asyncpg
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.auth.utils import create_token
+from app.boards import events
+from app.boards.events import OVERFLOW, BoardHub, PostgresBroadcast, queue_event
+from app.boards.models import Board, BoardMember, List, User
+
+
+def test_hub_reparte_y_expulsa_lentos():
+    async def escenario():
+        hub = BoardHub(queue_size=2)
+        rapido = hub.subscribe(1)
+        lento = hub.subscribe(1)
+        otro = hub.subscribe(2)
+
+        hub.dispatch(1, "a")
+        rapido.queue.get_nowait()
+        hub.dispatch(1, "b")
+        hub.dispatch(1, "c")
+
+        assert [rapido.queue.get_nowait(), rapido.queue.get_nowait()] == ["b", "c"]
+        assert lento.queue.get_nowait() is OVERFLOW
+        assert otro.queue.empty()
+        assert hub.stats()["subscribers"] == 2
+        assert hub.stats()["dropped"] == 1
+
+    asyncio.run(escenario())
+
+
+def test_publica_solo_tras_commit(Session, monkeypatch):
+    publicados = []
+    monkeypatch.setattr(events.board_events, "publish", publicados.append)
+
+    with Session() as db:
+        db.add(User(email="rollback@example.com", password_hash="x"))
+        db.flush()
+        queue_event(db, {"board_id": 1, "id": 1})
+        db.rollback()
+
+        db.add(User(email="commit@example.com", password_hash="x"))
+        db.flush()
+        queue_event(db, {"board_id": 1, "id": 2})
+        db.commit()
+
+    assert publicados == [{"board_id": 1, "id": 2}]
+
+
+def test_websocket_recibe_cambios(Session, client):
+    with Session() as db:
+        user = User(email="ws@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Tiempo real", user_id=user.id)
+        db.add(board)
+        db.flush()
+        lst = List(name="Por hacer", board_id=board.id, position=0)
+        db.add(lst)
+        db.commit()
+        user_id, board_id, list_id = user.id, board.id, lst.id
+
+    token = create_token({"user_id": user_id})
+    with client:
+        with client.websocket_connect(f"/ws/boards/{board_id}?token={token}") as ws:
+            assert ws.receive_json() == {"type": "hello", "board_id": board_id, "revision": 0}
+
+            resp = client.post(
+                "/cards/",
+                json={"title": "En vivo", "board_id": board_id, "list_id": list_id},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert resp.status_code == 200
+
+            assert json.loads(ws.receive_text()) == {
+                "type": "change",
+                "board_id": board_id,
+                "revision": 1,
+                "entity": "card",
+                "id": resp.json()["id"],
+                "op": "upsert",
+            }
+
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect(f"/ws/boards/{board_id}?token=invalido") as ws:
+                ws.receive_text()
+        assert exc.value.code == 1008
+
+
+def test_websocket_cierra_al_perder_el_acceso(Session, client):
+    with Session() as db:
+        owner = User(email="ws-owner@example.com", password_hash="x")
+        member = User(email="ws-member@example.com", password_hash="x")
+        db.add_all([owner, member])
+        db.flush()
+        board = Board(name="Compartido", user_id=owner.id)
+        db.add(board)
+        db.flush()
+        db.add(BoardMember(board_id=board.id, user_id=member.id, role="viewer"))
+        lst = List(name="Por hacer", board_id=board.id, position=0)
+        db.add(lst)
+        db.commit()
+        owner_id, member_id, board_id, list_id = owner.id, member.id, board.id, lst.id
+
+    owner_headers = {"Authorization": f"Bearer {create_token({'user_id': owner_id})}"}
+    token = create_token({"user_id": member_id})
+    with client:
+        with client.websocket_connect(f"/ws/boards/{board_id}?token={token}") as ws:
+            assert ws.receive_json()["type"] == "hello"
+
+            resp = client.delete(f"/boards/{board_id}/members/{member_id}", headers=owner_headers)
+            assert resp.status_code == 204
+            resp = client.post(
+                "/cards/",
+                json={"title": "Privada", "board_id": board_id, "list_id": list_id},
+                headers=owner_headers,
+            )
+            assert resp.status_code == 200
+
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_text()
+            assert exc.value.code == 1008
+
+
+class FakeListenConnection:
+    """Conexión asyncpg mínima: registra los listeners y simula la caída."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel, callback):
+        self.listeners.pop(channel, None)
+
+    def add_termination_listener(self, callback):
+        self.termination.append(callback)
+
+    def remove_termination_listener(self, callback):
+        self.termination.remove(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    def terminate(self):
+        self.closed = True
+        for callback in self.termination:
+            callback(self)
+
+
+def test_postgres_reconecta_y_repite_listen(monkeypatch):
+    conexiones = []
+    fallos = []
+
+    async def connect(dsn):
+        if fallos:
+            raise fallos.pop()
+        conexiones.append(FakeListenConnection())
+        return conexiones[-1]
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+
+    async def escenario():
+        hub = BoardHub(queue_size=10)
+        backend = PostgresBroadcast("postgresql://x", "board_events")
+        backend.RECONNECT_MIN_SECONDS = 0.01
+        await backend.start(hub)
+        sub = hub.subscribe(1)
+
+        # Caída: el primer intento falla y el siguiente (con espera mayor) reconecta
+        fallos.append(OSError("base de datos reiniciando"))
+        conexiones[0].terminate()
+        for _ in range(100):
+            if backend.reconnects:
+                break
+            await asyncio.sleep(0.01)
+
+        assert backend.reconnects == 1
+        assert len(conexiones) == 2
+        conexiones[1].listeners["board_events"](conexiones[1], 0, "board_events", '1:{"id":7}')
+        assert sub.queue.get_nowait() == '{"id":7}'
+
+        # El cierre propio no reconecta
+        await backend.stop()
+        assert conexiones[1].closed
+        assert len(conexiones) == 2
+
+    asyncio.run(escenario())
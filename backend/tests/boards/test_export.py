@@ -0,0 +1,93 @@
+"""
+Pruebas de la exportación NDJSON de un tablero (GET /boards/{id}/export).
+
+Este módulo verifica:
+- Que se exportan tablero, listas, tarjetas y registros de tiempo, en orden.
+- Que la lectura va por lotes (yield_per) y que gzip produce el mismo contenido.
+- Que se aplican las reglas de acceso del resto de lecturas.
+"""
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.export import export_board, gzip_stream
+from app.boards.models import Board, Card, List, TimeEntry, User
+from app.cards.ranking import place_card
+
+
+@pytest.fixture
+def entorno(engine, Session, client):
+    """Tablero con dos listas, cinco tarjetas y un registro de tiempo."""
+    with Session() as db:
+        owner = User(email="export@example.com", password_hash="x")
+        other = User(email="ajeno@example.com", password_hash="x")
+        db.add_all([owner, other])
+        db.flush()
+        board = Board(name="Exportar", user_id=owner.id)
+        db.add(board)
+        db.flush()
+        for pos in range(2):
+            lst = List(name=f"Lista {pos}", board_id=board.id, position=pos)
+            db.add(lst)
+            db.flush()
+            for i in range(2 + pos):
+                card = Card(title=f"{pos}-{i}", board_id=board.id, created_by_id=owner.id)
+                place_card(db, card, lst.id)
+                db.add(card)
+                db.flush()
+        db.add(TimeEntry(user_id=owner.id, card_id=card.id, date=date(2026, 3, 1), hours=Decimal("1.50")))
+        db.commit()
+        ids = {"owner": owner.id, "other": other.id, "board": board.id}
+
+    return client, engine, ids
+
+
+def auth(user_id):
+    return {"Authorization": f"Bearer {create_token({'user_id': user_id})}"}
+
+
+def parse(body: bytes) -> list[dict]:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_exporta_en_orden(entorno):
+    client, _, ids = entorno
+    res = client.get(f"/boards/{ids['board']}/export", headers=auth(ids["owner"]))
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = parse(res.content)
+    assert [line["type"] for line in lines] == ["export", "board"] + ["list"] * 2 + ["card"] * 5 + ["time_entry"]
+    assert lines[0]["version"] == 1
+    assert lines[1]["data"]["name"] == "Exportar"
+    assert [line["data"]["title"] for line in lines if line["type"] == "card"] == ["0-0", "0-1", "1-0", "1-1", "1-2"]
+    assert lines[-1]["data"]["hours"] == "1.50"
+
+
+def test_lotes_y_gzip(entorno):
+    _, engine, ids = entorno
+    chunks = list(export_board(engine, ids["board"], batch_size=2))
+    # export + board + 1 lote de listas + 3 lotes de tarjetas + 1 de registros
+    assert len(chunks) == 7
+
+    comprimido = b"".join(gzip_stream(iter(chunks)))
+    assert gzip.decompress(comprimido) == b"".join(chunks)
+
+
+def test_gzip_por_http(entorno):
+    client, _, ids = entorno
+    res = client.get(f"/boards/{ids['board']}/export?gzip=true", headers=auth(ids["owner"]))
+
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    assert len(parse(res.content)) == 10  # httpx descomprime
+
+
+def test_sin_acceso(entorno):
+    client, _, ids = entorno
+    res = client.get(f"/boards/{ids['board']}/export", headers=auth(ids["other"]))
+    assert res.status_code == 403
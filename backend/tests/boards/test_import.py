@@ -0,0 +1,124 @@
+"""
+Pruebas de la importación NDJSON de tableros (app.boards.importer, POST /boards/import).
+
+Este módulo verifica:
+- Que una exportación se importa como tablero nuevo con el mismo contenido.
+- Que un fichero inválido se rechaza con 400 antes de escribir nada.
+- Que una importación interrumpida se reanuda sin duplicar filas.
+"""
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.auth.utils import create_token
+from app.boards.export import export_board
+from app.boards.importer import run_import, start_import, validate_lines
+from app.boards.models import Board, BoardImport, Card, ImportIdMap, List, TimeEntry, User
+from app.cards.ranking import place_card
+
+
+@pytest.fixture
+def entorno(engine, Session, client):
+    """Tablero de origen con 3 listas, 12 tarjetas y 3 registros de tiempo."""
+    with Session() as db:
+        user = User(email="import@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Origen", user_id=user.id)
+        db.add(board)
+        db.flush()
+        for pos in range(3):
+            lst = List(name=f"Lista {pos}", board_id=board.id, position=pos)
+            db.add(lst)
+            db.flush()
+            for i in range(4):
+                card = Card(title=f"{pos}-{i}", board_id=board.id, created_by_id=user.id)
+                place_card(db, card, lst.id)
+                db.add(card)
+                db.flush()
+            db.add(TimeEntry(user_id=user.id, card_id=card.id, date=date(2026, 2, 1), hours=Decimal("2.25")))
+        db.commit()
+        ids = {"user": user.id, "board": board.id}
+
+    exportado = b"".join(export_board(engine, ids["board"]))
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, Session, ids, exportado, headers
+
+
+def contenido(db, board_id):
+    """Listas y tarjetas (por nombre/título, en orden) y horas registradas."""
+    lists = db.scalars(select(List.name).where(List.board_id == board_id).order_by(List.position)).all()
+    cards = db.scalars(
+        select(Card.title).where(Card.board_id == board_id).order_by(Card.list_id, Card.rank)
+    ).all()
+    hours = db.scalars(
+        select(TimeEntry.hours).join(Card).where(Card.board_id == board_id).order_by(TimeEntry.id)
+    ).all()
+    return lists, cards, hours
+
+
+def test_importa_exportacion(entorno):
+    client, Session, ids, exportado, headers = entorno
+    res = client.post("/boards/import", content=exportado, headers=headers)
+
+    assert res.status_code == 201, res.text
+    job = res.json()
+    assert job["status"] == "done"
+    assert job["lines_done"] == job["total_lines"] == 20
+    assert job["board_id"] != ids["board"]
+
+    with Session() as db:
+        assert contenido(db, job["board_id"]) == contenido(db, ids["board"])
+        assert db.scalar(select(func.count()).select_from(ImportIdMap)) == 0
+
+    res = client.get(f"/boards/imports/{job['id']}", headers=headers)
+    assert res.json()["status"] == "done"
+
+
+def test_importa_gzip(entorno):
+    client, _, _, exportado, headers = entorno
+    res = client.post("/boards/import", content=gzip.compress(exportado), headers=headers)
+    assert res.status_code == 201
+    assert res.json()["status"] == "done"
+
+
+def test_fichero_invalido_no_escribe(entorno):
+    client, Session, _, exportado, headers = entorno
+    lines = exportado.splitlines()
+    card = json.loads(lines[5])
+    card["data"]["list_id"] = 999
+    lines[5] = json.dumps(card).encode()
+
+    res = client.post("/boards/import", content=b"\n".join(lines), headers=headers)
+
+    assert res.status_code == 400
+    assert res.json()["detail"].startswith("Línea 6:")
+    with Session() as db:
+        assert db.scalar(select(func.count()).select_from(Board)) == 1
+        assert db.scalar(select(func.count()).select_from(BoardImport)) == 0
+
+
+def test_reanuda_sin_duplicar(entorno):
+    _, Session, ids, exportado, _ = entorno
+    lines = exportado.splitlines(keepends=True)
+    assert validate_lines(lines).total_lines == 20
+
+    def cortado():
+        yield from lines[:10]
+        raise RuntimeError("conexión perdida")
+
+    with Session() as db:
+        job = start_import(db, ids["user"], 20)
+        with pytest.raises(RuntimeError):
+            run_import(db, job, cortado(), batch_size=3)
+        assert job.status == "failed"
+        # Confirmado: cabecera, tablero, listas y el primer lote de tarjetas
+        assert job.lines_done == 8
+
+        run_import(db, job, lines, batch_size=3)
+        assert job.status == "done"
+        assert contenido(db, job.board_id) == contenido(db, ids["board"])
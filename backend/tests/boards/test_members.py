@@ -0,0 +1,71 @@
+"""
+Pruebas de los tableros compartidos (/boards/{id}/members y roles en las rutas).
+
+Este módulo verifica:
+- Que el propietario comparte un tablero y el miembro lo ve en GET /boards/.
+- Que un viewer lee pero no escribe tarjetas, y un editor sí escribe.
+- Que solo el propietario gestiona miembros y un miembro puede salir por su cuenta.
+"""
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.models import Board, List, User
+
+
+@pytest.fixture
+def entorno(Session, client):
+    """Cliente sobre SQLite en memoria: un propietario con un tablero y otro usuario."""
+    with Session() as db:
+        owner = User(email="owner@example.com", password_hash="x")
+        guest = User(email="guest@example.com", password_hash="x")
+        db.add_all([owner, guest])
+        db.flush()
+        board = Board(name="Equipo", user_id=owner.id)
+        db.add(board)
+        db.flush()
+        lst = List(name="Por hacer", board_id=board.id, position=0)
+        db.add(lst)
+        db.commit()
+        ids = {"owner": owner.id, "guest": guest.id, "board": board.id, "list": lst.id}
+
+    auth = {
+        name: {"Authorization": f"Bearer {create_token({'user_id': ids[name]})}"}
+        for name in ("owner", "guest")
+    }
+    return client, auth, ids
+
+
+def test_compartir_y_roles(entorno):
+    client, auth, ids = entorno
+    members_url = f"/boards/{ids['board']}/members/{ids['guest']}"
+    card = {"title": "Tarea", "board_id": ids["board"], "list_id": ids["list"]}
+
+    assert client.get("/boards/", headers=auth["guest"]).json() == []
+    assert client.put(members_url, json={"role": "viewer"}, headers=auth["guest"]).status_code == 403
+
+    resp = client.put(members_url, json={"role": "viewer"}, headers=auth["owner"])
+    assert resp.status_code == 200
+    assert resp.json() == {"board_id": ids["board"], "user_id": ids["guest"], "role": "viewer"}
+
+    assert [b["id"] for b in client.get("/boards/", headers=auth["guest"]).json()] == [ids["board"]]
+    assert client.get(f"/cards/?board_id={ids['board']}", headers=auth["guest"]).status_code == 200
+    assert client.post("/cards/", json=card, headers=auth["guest"]).status_code == 403
+
+    client.put(members_url, json={"role": "editor"}, headers=auth["owner"])
+    assert client.post("/cards/", json=card, headers=auth["guest"]).status_code == 200
+
+
+def test_gestion_de_miembros(entorno):
+    client, auth, ids = entorno
+    base = f"/boards/{ids['board']}/members"
+
+    assert client.put(f"{base}/{ids['owner']}", json={"role": "editor"}, headers=auth["owner"]).status_code == 400
+    assert client.put(f"{base}/9999", json={"role": "editor"}, headers=auth["owner"]).status_code == 404
+    assert client.put(f"{base}/{ids['guest']}", json={"role": "admin"}, headers=auth["owner"]).status_code == 422
+
+    client.put(f"{base}/{ids['guest']}", json={"role": "viewer"}, headers=auth["owner"])
+    assert [m["user_id"] for m in client.get(base, headers=auth["guest"]).json()] == [ids["guest"]]
+
+    # El miembro sale por su cuenta y pierde el acceso
+    assert client.delete(f"{base}/{ids['guest']}", headers=auth["guest"]).status_code == 204
+    assert client.get(f"/boards/{ids['board']}/lists", headers=auth["guest"]).status_code == 403
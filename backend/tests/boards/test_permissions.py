@@ -0,0 +1,182 @@
+"""
+Pruebas de la caché de decisiones de acceso a tableros (app.boards.permissions).
+
+Este módulo verifica:
+- Que una decisión en caché evita la consulta a `boards`.
+- Que los accesos denegados también se cachean y los tableros inexistentes no.
+- Que la caché se invalida al cambiar de propietario, borrar el tablero o
+  modificar sus membresías, al confirmar la transacción (no en el flush ni
+  tras un rollback).
+- Que los miembros acceden según su rol y GET /boards/ incluye los compartidos
+  en una sola consulta.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.boards.models import Board, BoardMember, User
+from app.boards.permissions import (
+    EDITOR,
+    NO_ACCESS,
+    OWNER,
+    VIEWER,
+    accessible_boards,
+    check_board_access,
+    permission_cache,
+    verify_board_permission,
+)
+
+
+@pytest.fixture
+def entorno(engine, Session):
+    """Sesión con dos usuarios y un tablero; cuenta los SELECT."""
+    selects = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    with Session() as db:
+        owner = User(email="owner@example.com", password_hash="x")
+        other = User(email="other@example.com", password_hash="x")
+        db.add_all([owner, other])
+        db.flush()
+        board = Board(name="Privado", user_id=owner.id)
+        db.add(board)
+        db.commit()
+        ids = {"owner": owner.id, "other": other.id, "board": board.id}
+
+    selects.clear()
+    with Session() as db:
+        yield db, ids, selects
+
+
+def test_decision_cacheada_sin_consulta(entorno):
+    db, ids, selects = entorno
+
+    check_board_access(ids["board"], ids["owner"], db)
+    hits = permission_cache.stats()["hits"]
+    selects.clear()
+    check_board_access(ids["board"], ids["owner"], db)
+
+    assert selects == []
+    assert permission_cache.stats()["hits"] == hits + 1
+
+
+def test_denegado_cacheado_e_inexistente_no(entorno):
+    db, ids, selects = entorno
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            check_board_access(ids["board"], ids["other"], db)
+        assert exc.value.status_code == 403
+    # Tablero + membresía la primera vez; la segunda, desde la caché
+    assert len(selects) == 2
+
+    with pytest.raises(HTTPException) as exc:
+        check_board_access(9999, ids["owner"], db)
+    assert exc.value.status_code == 404
+    assert permission_cache.get((ids["owner"], 9999)) is None
+
+
+def test_verify_rellena_la_cache(entorno):
+    db, ids, selects = entorno
+
+    verify_board_permission(ids["board"], ids["owner"], db)
+    selects.clear()
+    check_board_access(ids["board"], ids["owner"], db)
+
+    assert selects == []
+
+
+def test_invalidacion_por_cambio_de_propietario(entorno):
+    db, ids, _ = entorno
+    check_board_access(ids["board"], ids["owner"], db)
+
+    board = db.get(Board, ids["board"])
+    board.user_id = ids["other"]
+    db.commit()
+
+    assert permission_cache.get((ids["owner"], ids["board"])) is None
+    with pytest.raises(HTTPException):
+        check_board_access(ids["board"], ids["owner"], db)
+
+
+def test_invalidacion_por_membresia_y_borrado(entorno):
+    db, ids, _ = entorno
+    with pytest.raises(HTTPException):
+        check_board_access(ids["board"], ids["other"], db)
+
+    db.add(BoardMember(board_id=ids["board"], user_id=ids["other"], role="viewer"))
+    db.commit()
+    assert permission_cache.get((ids["other"], ids["board"])) is None
+    assert check_board_access(ids["board"], ids["other"], db) == VIEWER
+
+    check_board_access(ids["board"], ids["owner"], db)
+    db.delete(db.get(Board, ids["board"]))
+    db.commit()
+    assert len(permission_cache) == 0
+
+
+def test_roles_de_miembro(entorno):
+    db, ids, _ = entorno
+    member = BoardMember(board_id=ids["board"], user_id=ids["other"], role="viewer")
+    db.add(member)
+    db.commit()
+
+    verify_board_permission(ids["board"], ids["other"], db)
+    with pytest.raises(HTTPException) as exc:
+        check_board_access(ids["board"], ids["other"], db, EDITOR)
+    assert exc.value.status_code == 403
+
+    member.role = "editor"
+    db.commit()
+    assert check_board_access(ids["board"], ids["other"], db, EDITOR) == EDITOR
+    assert check_board_access(ids["board"], ids["owner"], db, OWNER) == OWNER
+
+
+def test_tableros_accesibles_en_una_consulta(entorno):
+    db, ids, selects = entorno
+    shared = Board(name="Compartido", user_id=ids["owner"])
+    own = Board(name="Propio", user_id=ids["other"])
+    db.add_all([shared, own])
+    db.flush()
+    db.add(BoardMember(board_id=shared.id, user_id=ids["other"], role="editor"))
+    db.commit()
+
+    selects.clear()
+    boards = accessible_boards(db, ids["other"]).order_by(Board.id).all()
+
+    assert [b.name for b in boards] == ["Compartido", "Propio"]
+    assert len(selects) == 1
+
+
+def test_invalidacion_tras_commit(entorno):
+    """Una decisión cacheada entre el flush y el commit (estado anterior) no sobrevive al commit."""
+    db, ids, _ = entorno
+    key = (ids["other"], ids["board"])
+
+    db.add(BoardMember(board_id=ids["board"], user_id=ids["other"], role="editor"))
+    db.flush()
+    # Otra petición aún ve el estado confirmado (sin membresía) y lo cachea
+    permission_cache.set(key, NO_ACCESS)
+    assert permission_cache.get(key) == NO_ACCESS
+
+    db.commit()
+    assert permission_cache.get(key) is None
+
+
+def test_rollback_no_invalida(entorno):
+    db, ids, _ = entorno
+    key = (ids["owner"], ids["board"])
+    check_board_access(ids["board"], ids["owner"], db)
+
+    board = db.get(Board, ids["board"])
+    board.user_id = ids["other"]
+    db.flush()
+    db.rollback()
+
+    assert permission_cache.get(key) == OWNER
+    db.commit()
+    assert permission_cache.get(key) == OWNER
@@ -0,0 +1,97 @@
+"""
+Pruebas de la creación de tableros desde plantillas (app.boards.provisioning).
+
+Este módulo verifica:
+- Que /auth/register crea usuario, tablero y listas con un único commit.
+- Que las plantillas se leen de la configuración y las desconocidas se rechazan.
+- Que GET /boards/ y GET /boards/{id}/lists ya no escriben en la base de datos.
+
+Se usa un engine SQLite en memoria y el hashing se ejecuta en el propio hilo.
+"""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from app.auth import hashing
+from app.auth.hashing import HashingExecutor
+from app.auth.utils import create_token
+from app.boards.models import Board, List, User
+from app.boards.provisioning import UnknownTemplate, provision_board
+from app.config import BoardTemplate, settings
+
+
+@pytest.fixture
+def entorno(engine, Session, client):
+    """Cliente con get_db sobre SQLite en memoria; registra commits y sentencias de escritura."""
+    registro = {"commits": 0, "writes": []}
+
+    @event.listens_for(engine, "commit")
+    def contar_commit(conn):
+        registro["commits"] += 1
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar_escritura(conn, cursor, statement, params, context, executemany):
+        if statement.split()[0] in ("INSERT", "UPDATE", "DELETE"):
+            registro["writes"].append(statement)
+
+    with patch.object(hashing, "hashing_executor", HashingExecutor(workers=0, queue_depth=4)):
+        yield client, Session, registro
+
+
+def test_registro_en_una_transaccion(entorno):
+    """Registrar crea usuario + tablero + 3 listas con un solo commit y un INSERT para las listas."""
+    client, Session, registro = entorno
+    resp = client.post("/auth/register", json={"email": "plantilla@example.com", "password": "pw"})
+    assert resp.status_code == 200, resp.text
+
+    assert registro["commits"] == 1
+    assert sum(stmt.startswith("INSERT INTO lists") for stmt in registro["writes"]) == 1
+
+    with Session() as db:
+        board = db.query(Board).one()
+        nombres = [lst.name for lst in db.query(List).filter(List.board_id == board.id).order_by(List.position)]
+    assert board.name == "Tablero principal"
+    assert nombres == ["Por hacer", "En curso", "Hecho"]
+
+
+def test_plantilla_configurable(entorno, monkeypatch):
+    """POST /boards/ usa las plantillas definidas en la configuración."""
+    client, Session, _ = entorno
+    monkeypatch.setitem(
+        settings.BOARD_TEMPLATES, "scrum", BoardTemplate(name="Sprint", lists=["Backlog", "Sprint", "Review", "Done"])
+    )
+    token = client.post("/auth/register", json={"email": "scrum@example.com", "password": "pw"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.post("/boards/", json={"template": "scrum"}, headers=headers)
+    assert resp.status_code == 201, resp.text
+    board_id = resp.json()["id"]
+    assert resp.json()["name"] == "Sprint"
+
+    lists = client.get(f"/boards/{board_id}/lists", headers=headers).json()
+    assert [lst["name"] for lst in lists] == ["Backlog", "Sprint", "Review", "Done"]
+
+    assert client.post("/boards/", json={"template": "no-existe"}, headers=headers).status_code == 400
+
+
+def test_get_no_escribe(entorno):
+    """Un usuario sin tableros recibe [] y los GET no emiten ninguna escritura."""
+    client, Session, registro = entorno
+    with Session() as db:
+        user = User(email="antiguo@example.com", password_hash="hash")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': user_id})}"}
+    registro["writes"].clear()
+
+    assert client.get("/boards/", headers=headers).json() == []
+    assert registro["writes"] == []
+
+
+def test_plantilla_desconocida():
+    """provision_board rechaza plantillas que no existen."""
+    with pytest.raises(UnknownTemplate):
+        provision_board(None, 1, "no-existe")
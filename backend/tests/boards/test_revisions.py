@@ -0,0 +1,101 @@
+"""
+Pruebas de la revisión por tablero y los GET condicionales (app.boards.revisions).
+
+Este módulo verifica:
+- Que las lecturas de tablero, listas y tarjetas devuelven ETag.
+- Que If-None-Match vigente produce 304 sin consultar listas ni tarjetas.
+- Que cada escritura de tarjetas incrementa la revisión e invalida la ETag.
+"""
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.models import Board, List, User
+from app.boards.revisions import etag_matches
+
+
+@pytest.fixture
+def entorno(Session, client, sentencias):
+    """Cliente sobre SQLite en memoria con un tablero de una lista; registra sentencias."""
+    with Session() as db:
+        user = User(email="etag@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="ETag", user_id=user.id)
+        db.add(board)
+        db.flush()
+        lst = List(name="Por hacer", board_id=board.id, position=0)
+        db.add(lst)
+        db.commit()
+        ids = {"user": user.id, "board": board.id, "list": lst.id}
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, headers, ids, sentencias
+
+
+def test_lecturas_con_etag(entorno):
+    client, headers, ids, _ = entorno
+    board_id = ids["board"]
+
+    etags = {
+        client.get(url, headers=headers).headers.get("etag")
+        for url in (f"/boards/{board_id}/lists", f"/boards/{board_id}/snapshot", f"/cards/?board_id={board_id}")
+    }
+
+    assert etags == {f'W/"{board_id}-0"'}
+
+
+def test_304_sin_leer_tarjetas(entorno):
+    client, headers, ids, sentencias = entorno
+    url = f"/cards/?board_id={ids['board']}"
+    etag = client.get(url, headers=headers).headers["etag"]
+
+    sentencias.clear()
+    resp = client.get(url, headers={**headers, "If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert not any("FROM cards" in sql for sql in sentencias)
+
+
+def test_escrituras_incrementan_revision(entorno):
+    client, headers, ids, _ = entorno
+    url = f"/boards/{ids['board']}/lists"
+    etag = client.get(url, headers=headers).headers["etag"]
+
+    created = client.post(
+        "/cards/",
+        json={"title": "Nueva", "board_id": ids["board"], "list_id": ids["list"]},
+        headers=headers,
+    )
+    assert created.status_code == 200
+    card_id = created.json()["id"]
+
+    resp = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] == f'W/"{ids["board"]}-1"'
+
+    client.patch(f"/cards/{card_id}", json={"title": "Editada"}, headers=headers)
+    client.patch(f"/cards/{card_id}/move", json={"list_id": ids["list"], "order": 0}, headers=headers)
+    client.delete(f"/cards/{card_id}", headers=headers)
+
+    assert client.get(url, headers=headers).headers["etag"] == f'W/"{ids["board"]}-4"'
+
+
+class _FakeRequest:
+    def __init__(self, value):
+        self.headers = {"if-none-match": value} if value is not None else {}
+
+
+@pytest.mark.parametrize(
+    "header, esperado",
+    [
+        (None, False),
+        ('W/"1-3"', True),
+        ('"1-3"', True),
+        ('W/"1-2", W/"1-3"', True),
+        ("*", True),
+        ('W/"1-2"', False),
+    ],
+)
+def test_etag_matches(header, esperado):
+    assert etag_matches(_FakeRequest(header), 'W/"1-3"') is esperado
@@ -0,0 +1,128 @@
+"""
+Pruebas de GET /boards/{id}/snapshot.
+
+Este módulo verifica:
+- Que el snapshot devuelve tablero, listas y tarjetas en el orden visible.
+- Que, con tarjetas sin rank (legadas), el orden coincide con GET /cards/.
+- Que el número de sentencias SQL no crece con el número de listas o tarjetas.
+- Que se aplican las mismas reglas de acceso que en el resto de endpoints.
+"""
+import pytest
+from sqlalchemy import event
+
+from app.auth.utils import create_token
+from app.boards.models import Board, Card, List, User
+from app.cards.ranking import place_card
+
+
+@pytest.fixture
+def entorno(engine, Session, client):
+    """Cliente sobre SQLite en memoria que cuenta las sentencias SELECT ejecutadas."""
+    registro = {"selects": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            registro["selects"] += 1
+
+    return client, Session, registro
+
+
+def crear_tablero(Session, email, n_listas, n_tarjetas):
+    """Crea usuario + tablero con `n_listas` listas y `n_tarjetas` tarjetas en cada una."""
+    with Session() as db:
+        user = User(email=email, password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Snapshot", user_id=user.id)
+        db.add(board)
+        db.flush()
+        for pos in range(n_listas):
+            lst = List(name=f"Lista {pos}", board_id=board.id, position=pos)
+            db.add(lst)
+            db.flush()
+            for i in range(n_tarjetas):
+                card = Card(title=f"{pos}-{i}", board_id=board.id, created_by_id=user.id)
+                # Se inserta cada tarjeta al principio: el orden visible es el inverso
+                place_card(db, card, lst.id, 0)
+                db.add(card)
+                db.flush()
+        db.commit()
+        return user.id, board.id
+
+
+def auth(user_id):
+    return {"Authorization": f"Bearer {create_token({'user_id': user_id})}"}
+
+
+def test_snapshot_ordenado(entorno):
+    client, Session, _ = entorno
+    user_id, board_id = crear_tablero(Session, "snap@example.com", 2, 3)
+
+    resp = client.get(f"/boards/{board_id}/snapshot", headers=auth(user_id))
+
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["id"] == board_id
+    assert [lst["name"] for lst in data["lists"]] == ["Lista 0", "Lista 1"]
+    primera = data["lists"][0]["cards"]
+    assert [c["title"] for c in primera] == ["0-2", "0-1", "0-0"]
+    assert [c["order"] for c in primera] == [0, 1, 2]
+
+
+def test_snapshot_tarjetas_sin_rank(entorno):
+    """Tarjetas con rank primero y legadas (rank NULL) al final, igual que GET /cards/."""
+    client, Session, _ = entorno
+    with Session() as db:
+        user = User(email="legacy@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Mixto", user_id=user.id)
+        db.add(board)
+        db.flush()
+        lst = List(name="Lista", board_id=board.id, position=0)
+        db.add(lst)
+        db.flush()
+        db.add_all([
+            Card(title="legada-0", board_id=board.id, list_id=lst.id, position=0, created_by_id=user.id),
+            Card(title="b", board_id=board.id, list_id=lst.id, rank="n", position=5, created_by_id=user.id),
+            Card(title="legada-1", board_id=board.id, list_id=lst.id, position=1, created_by_id=user.id),
+            Card(title="a", board_id=board.id, list_id=lst.id, rank="g", position=9, created_by_id=user.id),
+        ])
+        db.commit()
+        user_id, board_id = user.id, board.id
+
+    snapshot = client.get(f"/boards/{board_id}/snapshot", headers=auth(user_id))
+    cards = client.get("/cards/", params={"board_id": board_id}, headers=auth(user_id))
+
+    assert snapshot.status_code == 200, snapshot.text
+    assert cards.status_code == 200, cards.text
+    en_snapshot = [(c["title"], c["order"]) for c in snapshot.json()["lists"][0]["cards"]]
+    assert en_snapshot == [("a", 0), ("b", 1), ("legada-0", 2), ("legada-1", 3)]
+    assert en_snapshot == [(c["title"], c["order"]) for c in cards.json()]
+
+
+def test_snapshot_consultas_acotadas(entorno):
+    """Un tablero 10 veces mayor no ejecuta más consultas."""
+    client, Session, registro = entorno
+    small_user, small_board = crear_tablero(Session, "small@example.com", 1, 1)
+    big_user, big_board = crear_tablero(Session, "big@example.com", 5, 10)
+
+    registro["selects"] = 0
+    assert client.get(f"/boards/{small_board}/snapshot", headers=auth(small_user)).status_code == 200
+    pequeno = registro["selects"]
+
+    registro["selects"] = 0
+    resp = client.get(f"/boards/{big_board}/snapshot", headers=auth(big_user))
+    assert resp.status_code == 200
+    assert sum(len(lst["cards"]) for lst in resp.json()["lists"]) == 50
+    assert registro["selects"] == pequeno
+
+
+def test_snapshot_permisos(entorno):
+    client, Session, _ = entorno
+    _, board_id = crear_tablero(Session, "owner@example.com", 1, 0)
+    other_id, _ = crear_tablero(Session, "other@example.com", 1, 0)
+
+    assert client.get(f"/boards/{board_id}/snapshot", headers=auth(other_id)).status_code == 403
+    assert client.get("/boards/9999/snapshot", headers=auth(other_id)).status_code == 404
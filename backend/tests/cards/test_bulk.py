@@ -0,0 +1,203 @@
+"""
+Pruebas de POST /cards/bulk (app.cards.bulk).
+
+Este módulo verifica:
+- Que archivar muchas tarjetas cuesta un número fijo de sentencias SQL.
+- Que cada operación tiene su resultado y las que fallan no impiden el resto.
+- Que los movimientos en lote dejan el mismo orden que moverlas una a una.
+"""
+import pytest
+from sqlalchemy import func, select
+
+from app.auth.utils import create_token
+from app.boards.models import Board, BoardChange, Card, List, User
+from app.cards.ranking import place_card
+
+
+@pytest.fixture
+def entorno(Session, client, sentencias):
+    """Dos usuarios con un tablero cada uno; el primero con dos listas."""
+    with Session() as db:
+        user = User(email="bulk@example.com", password_hash="x")
+        other = User(email="otro@example.com", password_hash="x")
+        db.add_all([user, other])
+        db.flush()
+        board = Board(name="Lote", user_id=user.id)
+        ajeno = Board(name="Ajeno", user_id=other.id)
+        db.add_all([board, ajeno])
+        db.flush()
+        todo = List(name="Por hacer", board_id=board.id, position=0)
+        done = List(name="Hecho", board_id=board.id, position=1)
+        lista_ajena = List(name="Ajena", board_id=ajeno.id, position=0)
+        db.add_all([todo, done, lista_ajena])
+        db.flush()
+        db.commit()
+        ids = {
+            "user": user.id, "board": board.id, "todo": todo.id, "done": done.id,
+            "ajeno": ajeno.id, "lista_ajena": lista_ajena.id, "other": other.id,
+        }
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, Session, ids, headers, sentencias
+
+
+def crear_tarjetas(Session, board_id, list_id, user_id, titulos):
+    with Session() as db:
+        cards = []
+        for titulo in titulos:
+            card = Card(title=titulo, board_id=board_id, created_by_id=user_id)
+            place_card(db, card, list_id)
+            db.add(card)
+            db.flush()
+            cards.append(card.id)
+        db.commit()
+        return cards
+
+
+def titulos(Session, list_id):
+    with Session() as db:
+        return db.scalars(select(Card.title).where(Card.list_id == list_id).order_by(Card.rank, Card.id)).all()
+
+
+def test_archivar_500_con_pocas_sentencias(entorno):
+    client, Session, ids, headers, sentencias = entorno
+    card_ids = crear_tarjetas(Session, ids["board"], ids["todo"], ids["user"], [f"t{i}" for i in range(500)])
+    sentencias.clear()
+
+    res = client.post("/cards/bulk", headers=headers, json={
+        "operations": [{"op": "update", "id": card_id, "archived": True} for card_id in card_ids],
+    })
+
+    assert res.status_code == 200, res.text
+    results = res.json()["results"]
+    assert [r["status"] for r in results] == [200] * 500
+    assert all(r["card"]["archived"] for r in results)
+    assert len(sentencias) <= 10
+    with Session() as db:
+        assert db.scalar(select(func.count()).where(Card.archived.is_(True))) == 500
+        # Una sola revisión para todo el lote
+        assert db.get(Board, ids["board"]).revision == 1
+        assert db.scalar(select(func.count()).select_from(BoardChange)) == 500
+
+
+def test_resultados_por_operacion(entorno):
+    client, Session, ids, headers, _ = entorno
+    a, b, c = crear_tarjetas(Session, ids["board"], ids["todo"], ids["user"], ["A", "B", "C"])
+    (ajena,) = crear_tarjetas(Session, ids["ajeno"], ids["lista_ajena"], ids["other"], ["X"])
+
+    res = client.post("/cards/bulk", headers=headers, json={"operations": [
+        {"op": "create", "title": "Nueva", "board_id": ids["board"], "list_id": ids["done"]},
+        {"op": "move", "id": a, "list_id": ids["done"], "order": 0},
+        {"op": "delete", "id": b},
+        {"op": "update", "id": c, "title": "C2"},
+        {"op": "delete", "id": 9999},
+        {"op": "update", "id": ajena, "title": "no"},
+        {"op": "update", "id": c, "title": "repetida"},
+        {"op": "create", "title": "Mal", "board_id": ids["board"], "list_id": ids["lista_ajena"]},
+    ]})
+
+    assert res.status_code == 200, res.text
+    results = res.json()["results"]
+    assert [r["status"] for r in results] == [201, 200, 204, 200, 404, 403, 409, 400]
+    assert results[0]["card"]["order"] == 1
+    assert results[1]["card"]["order"] == 0
+    assert results[3]["card"]["title"] == "C2"
+    assert titulos(Session, ids["done"]) == ["A", "Nueva"]
+    assert titulos(Session, ids["todo"]) == ["C2"]
+    with Session() as db:
+        assert db.get(Card, ajena).title == "X"
+        # Una revisión más para el tablero, con un cambio por operación aplicada
+        assert db.get(Board, ids["board"]).revision == 1
+        assert db.scalar(select(func.count()).where(BoardChange.revision == 1)) == 4
+
+
+def test_tableros_en_una_consulta(entorno):
+    client, Session, ids, headers, sentencias = entorno
+    (propia,) = crear_tarjetas(Session, ids["board"], ids["todo"], ids["user"], ["A"])
+    (ajena,) = crear_tarjetas(Session, ids["ajeno"], ids["lista_ajena"], ids["other"], ["X"])
+    sentencias.clear()
+
+    res = client.post("/cards/bulk", headers=headers, json={"operations": [
+        {"op": "update", "id": propia, "title": "A2"},
+        {"op": "update", "id": ajena, "title": "no"},
+    ]})
+
+    assert [r["status"] for r in res.json()["results"]] == [200, 403]
+    assert len([sql for sql in sentencias if sql.startswith("SELECT") and "FROM boards" in sql]) == 1
+
+
+def test_movimientos_como_secuenciales(entorno):
+    client, Session, ids, headers, _ = entorno
+    crear_tarjetas(Session, ids["board"], ids["done"], ids["user"], ["A", "B", "C"])
+    d, e = crear_tarjetas(Session, ids["board"], ids["todo"], ids["user"], ["D", "E"])
+
+    res = client.post("/cards/bulk", headers=headers, json={"operations": [
+        {"op": "move", "id": d, "list_id": ids["done"], "order": 0},
+        {"op": "move", "id": e, "list_id": ids["done"], "order": 2},
+    ]})
+
+    assert res.status_code == 200
+    assert titulos(Session, ids["done"]) == ["D", "A", "E", "B", "C"]
+    assert [r["card"]["order"] for r in res.json()["results"]] == [0, 2]
+
+
+def test_reequilibra_sin_hueco(entorno):
+    client, Session, ids, headers, _ = entorno
+    a, b, c = crear_tarjetas(Session, ids["board"], ids["done"], ids["user"], ["A", "B", "C"])
+    with Session() as db:
+        # Ranks repetidos (escrituras concurrentes): no hay hueco entre A y B
+        db.get(Card, b).rank = db.get(Card, a).rank
+        db.commit()
+    (d,) = crear_tarjetas(Session, ids["board"], ids["todo"], ids["user"], ["D"])
+
+    res = client.post("/cards/bulk", headers=headers, json={"operations": [
+        {"op": "move", "id": d, "list_id": ids["done"], "order": 1},
+    ]})
+
+    assert res.status_code == 200
+    assert titulos(Session, ids["done"]) == ["A", "D", "B", "C"]
+    with Session() as db:
+        ranks = db.scalars(select(Card.rank).where(Card.list_id == ids["done"]).order_by(Card.rank)).all()
+        assert len(set(ranks)) == 4
+
+
+def test_update_con_cambio_de_lista(entorno):
+    client, Session, ids, headers, _ = entorno
+    a, b = crear_tarjetas(Session, ids["board"], ids["todo"], ids["user"], ["A", "B"])
+    crear_tarjetas(Session, ids["board"], ids["done"], ids["user"], ["C"])
+
+    res = client.post("/cards/bulk", headers=headers, json={"operations": [
+        {"op": "update", "id": a, "list_id": ids["done"]},
+        {"op": "update", "id": b, "list_id": ids["done"], "title": "B2", "version": 1},
+    ]})
+
+    assert res.status_code == 200
+    assert [r["status"] for r in res.json()["results"]] == [200, 200]
+    assert titulos(Session, ids["done"]) == ["C", "A", "B2"]
+    assert [r["card"]["version"] for r in res.json()["results"]] == [2, 2]
+
+
+def test_reequilibrio_y_borrado_en_el_mismo_lote(entorno):
+    client, Session, ids, headers, _ = entorno
+    a, b, c = crear_tarjetas(Session, ids["board"], ids["done"], ids["user"], ["A", "B", "C"])
+    with Session() as db:
+        # Sin hueco entre A y B: colocar D entre ellas reequilibra la lista (B y C incluidas)
+        db.get(Card, b).rank = db.get(Card, a).rank
+        db.commit()
+        version_c = db.get(Card, c).version
+    (d,) = crear_tarjetas(Session, ids["board"], ids["todo"], ids["user"], ["D"])
+
+    res = client.post("/cards/bulk", headers=headers, json={"operations": [
+        {"op": "move", "id": d, "list_id": ids["done"], "order": 1},
+        {"op": "delete", "id": c, "version": version_c},
+    ]})
+
+    assert res.status_code == 200
+    assert [r["status"] for r in res.json()["results"]] == [200, 204]
+    assert titulos(Session, ids["done"]) == ["A", "D", "B"]
+
+
+def test_limite_de_operaciones(entorno):
+    client, _, ids, headers, _ = entorno
+    res = client.post("/cards/bulk", headers=headers, json={"operations": []})
+    assert res.status_code == 422
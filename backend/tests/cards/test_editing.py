@@ -0,0 +1,90 @@
+"""
+Pruebas de la edición de tarjetas en una sola sentencia (app.cards.editing).
+
+Este módulo verifica:
+- Que una edición no lee la tarjeta ni el tablero: un UPDATE ... RETURNING.
+- Que el `order` devuelto coincide con el de la lectura.
+- Que los permisos por rol se aplican dentro del propio UPDATE (403/404).
+"""
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.models import Board, BoardMember, Card, List, User
+from app.cards.ranking import place_card
+
+
+@pytest.fixture
+def entorno(Session, client, sentencias):
+    """Tablero con dos listas y tres tarjetas; un editor y un lector invitados."""
+    with Session() as db:
+        owner = User(email="owner@example.com", password_hash="x")
+        editor = User(email="editor@example.com", password_hash="x")
+        viewer = User(email="viewer@example.com", password_hash="x")
+        db.add_all([owner, editor, viewer])
+        db.flush()
+        board = Board(name="Edición", user_id=owner.id)
+        db.add(board)
+        db.flush()
+        db.add_all([
+            BoardMember(board_id=board.id, user_id=editor.id, role="editor"),
+            BoardMember(board_id=board.id, user_id=viewer.id, role="viewer"),
+        ])
+        todo = List(name="Por hacer", board_id=board.id, position=0)
+        done = List(name="Hecho", board_id=board.id, position=1)
+        db.add_all([todo, done])
+        db.flush()
+        cards = []
+        for title in ("A", "B", "C"):
+            card = Card(title=title, board_id=board.id, created_by_id=owner.id)
+            place_card(db, card, todo.id)
+            db.add(card)
+            db.flush()
+            cards.append(card.id)
+        db.commit()
+        ids = {"owner": owner.id, "editor": editor.id, "viewer": viewer.id, "cards": cards, "done": done.id}
+
+    return client, ids, sentencias
+
+
+def auth(user_id):
+    return {"Authorization": f"Bearer {create_token({'user_id': user_id})}"}
+
+
+def test_edicion_en_una_sentencia(entorno):
+    client, ids, sentencias = entorno
+    card_id = ids["cards"][1]
+    client.get(f"/cards/{card_id}", headers=auth(ids["owner"]))  # usuario en la caché de identidad
+    sentencias.clear()
+
+    res = client.patch(f"/cards/{card_id}", json={"title": "B2", "archived": True}, headers=auth(ids["owner"]))
+
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert (data["title"], data["archived"], data["order"]) == ("B2", True, 1)
+    selects = [s for s in sentencias if s.lstrip().upper().startswith("SELECT")]
+    assert selects == []
+    updates = [s for s in sentencias if s.lstrip().upper().startswith("UPDATE CARDS")]
+    assert len(updates) == 1 and "RETURNING" in updates[0]
+
+    assert client.get(f"/cards/{card_id}", headers=auth(ids["owner"])).json() == data
+
+
+def test_permisos_por_rol(entorno):
+    client, ids, _ = entorno
+    card_id = ids["cards"][0]
+
+    assert client.put(f"/cards/{card_id}", json={"title": "E"}, headers=auth(ids["editor"])).status_code == 200
+    assert client.patch(f"/cards/{card_id}", json={"title": "V"}, headers=auth(ids["viewer"])).status_code == 403
+    assert client.patch("/cards/9999", json={"title": "X"}, headers=auth(ids["owner"])).status_code == 404
+    assert client.get(f"/cards/{card_id}", headers=auth(ids["owner"])).json()["title"] == "E"
+
+
+def test_cambio_de_lista(entorno):
+    client, ids, _ = entorno
+    card_id = ids["cards"][0]
+
+    res = client.patch(f"/cards/{card_id}", json={"list_id": ids["done"], "title": "A2"}, headers=auth(ids["owner"]))
+
+    assert res.status_code == 200
+    data = res.json()
+    assert (data["list_id"], data["title"], data["order"]) == (ids["done"], "A2", 0)
@@ -0,0 +1,199 @@
+"""
+Pruebas de las claves de idempotencia (app.idempotency) en POST /cards/ y move.
+
+Este módulo verifica:
+- Que un reintento con la misma Idempotency-Key reproduce la respuesta sin
+  volver a escribir (ni una sentencia INSERT/UPDATE).
+- Que la clave es por usuario y que reutilizarla con otro cuerpo da 422.
+- Que una escritura fallida libera la clave para el siguiente reintento.
+- Que la clave vive en la base de datos (la ve cualquier worker) y que las
+  caducadas se pueden reutilizar y purgar.
+- Que cada reserva borra un lote acotado de claves caducadas.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, func, insert, select, update
+
+from app.auth.utils import create_token
+from app.boards.models import Board, BoardMember, Card, IdempotencyKey, List, User
+from app.config import settings
+from app.idempotency import purge_expired_keys
+
+
+@pytest.fixture
+def entorno(engine, Session, client):
+    """Tablero con dos listas, su propietario y un editor invitado."""
+    with Session() as db:
+        owner = User(email="idem@example.com", password_hash="x")
+        editor = User(email="idem-editor@example.com", password_hash="x")
+        db.add_all([owner, editor])
+        db.flush()
+        board = Board(name="Reintentos", user_id=owner.id)
+        db.add(board)
+        db.flush()
+        db.add(BoardMember(board_id=board.id, user_id=editor.id, role="editor"))
+        lists = [List(name=name, board_id=board.id, position=i) for i, name in enumerate(("A", "B"))]
+        db.add_all(lists)
+        db.commit()
+        ids = {"owner": owner.id, "editor": editor.id, "board": board.id, "lists": [l.id for l in lists]}
+
+    writes = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+            writes.append(statement)
+
+    return client, Session, ids, writes
+
+
+def _headers(user_id, key=None):
+    headers = {"Authorization": f"Bearer {create_token({'user_id': user_id})}"}
+    if key:
+        headers["Idempotency-Key"] = key
+    return headers
+
+
+def _count(Session, model):
+    with Session() as db:
+        return db.scalar(select(func.count()).select_from(model))
+
+
+def _count_cards(Session):
+    with Session() as db:
+        return db.scalar(select(func.count()).select_from(Card))
+
+
+def test_reintento_de_creacion_no_duplica(entorno):
+    client, Session, ids, writes = entorno
+    body = {"title": "Nueva", "board_id": ids["board"], "list_id": ids["lists"][0]}
+
+    first = client.post("/cards/", json=body, headers=_headers(ids["owner"], "k-1"))
+    assert first.status_code == 200
+    writes.clear()
+
+    retry = client.post("/cards/", json=body, headers=_headers(ids["owner"], "k-1"))
+    assert retry.status_code == 200
+    assert retry.content == first.content
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert writes == []
+    assert _count_cards(Session) == 1
+
+    # Sin clave (o con otra) sí se crea otra tarjeta
+    assert client.post("/cards/", json=body, headers=_headers(ids["owner"], "k-2")).status_code == 200
+    assert client.post("/cards/", json=body, headers=_headers(ids["owner"])).status_code == 200
+    assert _count_cards(Session) == 3
+
+
+def test_clave_por_usuario_y_cuerpo(entorno):
+    client, Session, ids, _ = entorno
+    body = {"title": "Nueva", "board_id": ids["board"], "list_id": ids["lists"][0]}
+
+    client.post("/cards/", json=body, headers=_headers(ids["owner"], "k"))
+    # Otro usuario con la misma clave no recibe la respuesta ajena
+    res = client.post("/cards/", json=body, headers=_headers(ids["editor"], "k"))
+    assert "idempotent-replayed" not in res.headers
+    assert _count_cards(Session) == 2
+
+    res = client.post("/cards/", json={**body, "title": "Otra"}, headers=_headers(ids["owner"], "k"))
+    assert res.status_code == 422
+    assert _count_cards(Session) == 2
+
+
+def test_reintento_de_move(entorno):
+    client, Session, ids, writes = entorno
+    headers = _headers(ids["owner"])
+    card = client.post("/cards/", json={"title": "C", "board_id": ids["board"], "list_id": ids["lists"][0]},
+                       headers=headers).json()
+    move = {"list_id": ids["lists"][1], "order": 0}
+    key_headers = {**_headers(ids["owner"], "m-1"), "If-Match": f'"card-{card["id"]}-1"'}
+
+    first = client.patch(f"/cards/{card['id']}/move", json=move, headers=key_headers)
+    assert first.status_code == 200
+    assert first.headers["etag"] == f'"card-{card["id"]}-2"'
+    writes.clear()
+
+    # El If-Match ya no coincide, pero el reintento se reproduce antes de comprobarlo
+    retry = client.patch(f"/cards/{card['id']}/move", json=move, headers=key_headers)
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["etag"] == first.headers["etag"]
+    assert writes == []
+    with Session() as db:
+        assert db.get(Card, card["id"]).version == 2
+
+
+def test_escritura_fallida_libera_la_clave(entorno):
+    client, Session, ids, _ = entorno
+    card = client.post("/cards/", json={"title": "C", "board_id": ids["board"], "list_id": ids["lists"][0]},
+                       headers=_headers(ids["owner"])).json()
+
+    res = client.patch(f"/cards/{card['id']}/move", json={"list_id": 9999, "order": 0},
+                       headers=_headers(ids["owner"], "m-2"))
+    assert res.status_code == 400
+    assert _count(Session, IdempotencyKey) == 0
+
+    body = {"title": "C", "board_id": ids["board"], "list_id": ids["lists"][0]}
+    res = client.post("/cards/", json=body, headers=_headers(ids["owner"], "x" * 256))
+    assert res.status_code == 400
+
+
+def test_clave_en_curso_en_otro_worker(entorno):
+    client, Session, ids, _ = entorno
+    body = {"title": "Nueva", "board_id": ids["board"], "list_id": ids["lists"][0]}
+    first = client.post("/cards/", json=body, headers=_headers(ids["owner"], "w-1"))
+
+    # Otro worker acaba de reservar "w-2" y aún no ha respondido
+    with Session() as db:
+        stored = db.get(IdempotencyKey, (ids["owner"], "POST", "/cards/", "w-1"))
+        assert (stored.status_code, stored.body) == (200, first.content)
+        db.execute(insert(IdempotencyKey).values(
+            user_id=ids["owner"], method="POST", path="/cards/", key="w-2",
+            fingerprint=stored.fingerprint, expires_at=datetime.now(timezone.utc) + timedelta(seconds=60),
+        ))
+        db.commit()
+
+    res = client.post("/cards/", json=body, headers=_headers(ids["owner"], "w-2"))
+    assert res.status_code == 409
+    assert res.headers["retry-after"] == "1"
+    assert _count_cards(Session) == 1
+
+
+def test_clave_caducada_se_reutiliza_y_se_purga(entorno):
+    client, Session, ids, _ = entorno
+    body = {"title": "Nueva", "board_id": ids["board"], "list_id": ids["lists"][0]}
+    for key in ("c-1", "c-2"):
+        client.post("/cards/", json=body, headers=_headers(ids["owner"], key))
+
+    with Session() as db:
+        db.execute(update(IdempotencyKey).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        db.commit()
+
+    res = client.post("/cards/", json=body, headers=_headers(ids["owner"], "c-1"))
+    assert "idempotent-replayed" not in res.headers
+    assert _count_cards(Session) == 3
+    # La reserva de "c-1" se llevó también la caducada "c-2"
+    assert _count(Session, IdempotencyKey) == 1
+
+
+def test_reserva_purga_un_lote_de_caducadas(entorno, monkeypatch):
+    """Cada reserva borra como mucho IDEMPOTENCY_PURGE_BATCH claves caducadas."""
+    client, Session, ids, _ = entorno
+    monkeypatch.setattr(settings, "IDEMPOTENCY_PURGE_BATCH", 2)
+    with Session() as db:
+        db.execute(insert(IdempotencyKey), [
+            {"user_id": ids["editor"], "method": "POST", "path": "/cards/", "key": f"old-{i}",
+             "fingerprint": "x", "expires_at": datetime.now(timezone.utc) - timedelta(hours=1)}
+            for i in range(5)
+        ])
+        db.commit()
+
+    body = {"title": "Nueva", "board_id": ids["board"], "list_id": ids["lists"][0]}
+    assert client.post("/cards/", json=body, headers=_headers(ids["owner"], "p-1")).status_code == 200
+    assert _count(Session, IdempotencyKey) == 1 + 3
+
+    with Session() as db:
+        assert purge_expired_keys(db) == 3
+        db.commit()
+    assert _count(Session, IdempotencyKey) == 1
@@ -0,0 +1,123 @@
+"""
+Pruebas de la paginación por cursor de GET /cards/ (app.cards.pagination).
+
+Este módulo verifica:
+- Que recorrer todas las páginas devuelve lo mismo que la lista completa,
+  con `order` continuo entre páginas.
+- Que la ventana por lista (list_id + after + limit) solo devuelve esa columna.
+- Que la consulta usa LIMIT y que un cursor inválido responde 400.
+- Que las tarjetas antiguas sin rank salen en el mismo orden paginadas y sin
+  paginar, y que cada página es un rango del índice (sin ordenar en memoria).
+"""
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.models import Board, Card, List, User
+from app.cards.ranking import place_card
+
+
+@pytest.fixture
+def entorno(Session, client, sentencias):
+    """Tablero con listas de 12 y 13 tarjetas y otra de 4 sin rank (antiguas) sobre SQLite en memoria."""
+    with Session() as db:
+        user = User(email="pages@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Grande", user_id=user.id)
+        db.add(board)
+        db.flush()
+        list_ids = []
+        for pos, total in enumerate((12, 13)):
+            lst = List(name=f"Lista {pos}", board_id=board.id, position=pos)
+            db.add(lst)
+            db.flush()
+            list_ids.append(lst.id)
+            for i in range(total):
+                card = Card(title=f"{pos}-{i}", board_id=board.id, created_by_id=user.id)
+                place_card(db, card, lst.id, i // 2)
+                db.add(card)
+                db.flush()
+        antigua = List(name="Antigua", board_id=board.id, position=2)
+        db.add(antigua)
+        db.flush()
+        list_ids.append(antigua.id)
+        for i, position in enumerate((2, 0, 3, 1)):
+            db.add(Card(title=f"antigua-{i}", board_id=board.id, list_id=antigua.id,
+                        position=position, created_by_id=user.id))
+        db.commit()
+        ids = {"user": user.id, "board": board.id, "lists": list_ids}
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, headers, ids, sentencias
+
+
+def recorrer(client, headers, params):
+    """Pide páginas siguiendo X-Next-Cursor hasta el final."""
+    cards, pages = [], 0
+    params = dict(params)
+    while True:
+        resp = client.get("/cards/", params=params, headers=headers)
+        assert resp.status_code == 200, resp.text
+        cards += resp.json()
+        pages += 1
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            return cards, pages
+        params["after"] = cursor
+
+
+def test_paginas_equivalen_a_la_lista_completa(entorno):
+    client, headers, ids, _ = entorno
+    completa = client.get("/cards/", params={"board_id": ids["board"]}, headers=headers).json()
+
+    paginada, pages = recorrer(client, headers, {"board_id": ids["board"], "limit": 10})
+
+    assert pages == 3
+    assert [c["title"] for c in paginada[-4:]] == ["antigua-1", "antigua-3", "antigua-0", "antigua-2"]
+    assert [(c["id"], c["order"]) for c in paginada] == [(c["id"], c["order"]) for c in completa]
+
+
+def test_ventana_por_lista(entorno):
+    client, headers, ids, sentencias = entorno
+    segunda = ids["lists"][1]
+
+    sentencias.clear()
+    cards, pages = recorrer(client, headers, {"board_id": ids["board"], "list_id": segunda, "limit": 5})
+
+    assert pages == 3
+    assert {c["list_id"] for c in cards} == {segunda}
+    assert [c["order"] for c in cards] == list(range(13))
+    assert any("LIMIT" in sql and "FROM cards" in sql for sql in sentencias)
+
+
+def test_cursor_invalido(entorno):
+    client, headers, ids, _ = entorno
+    resp = client.get("/cards/", params={"board_id": ids["board"], "after": "no-es-un-cursor"}, headers=headers)
+    assert resp.status_code == 400
+
+
+def test_pagina_sin_rank_en_medio_de_la_lista(entorno):
+    client, headers, ids, _ = entorno
+    antigua = ids["lists"][2]
+    completa = client.get("/cards/", params={"board_id": ids["board"], "list_id": antigua}, headers=headers).json()
+
+    paginada, pages = recorrer(client, headers, {"board_id": ids["board"], "list_id": antigua, "limit": 3})
+
+    assert pages == 2
+    assert [(c["id"], c["order"]) for c in paginada] == [(c["id"], c["order"]) for c in completa]
+
+
+def test_pagina_sin_ordenar_en_memoria(entorno, engine):
+    client, headers, ids, sentencias = entorno
+    primera = client.get("/cards/", params={"board_id": ids["board"], "limit": 5}, headers=headers)
+
+    sentencias.clear()
+    client.get("/cards/", params={"board_id": ids["board"], "after": primera.headers["x-next-cursor"], "limit": 5},
+               headers=headers)
+
+    consulta = next(sql for sql in sentencias if "FROM cards" in sql and "LIMIT" in sql)
+    with engine.connect() as conn:
+        parametros = [1] * consulta.count("?")
+        plan = " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {consulta}", tuple(parametros)))
+    assert "ix_cards_list_rank" in plan
+    assert "TEMP B-TREE" not in plan
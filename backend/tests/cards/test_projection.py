@@ -0,0 +1,73 @@
+"""
+Pruebas de la proyección de campos (?fields=) en tarjetas y tableros (app.projection).
+
+Este módulo verifica:
+- Que solo se devuelven los campos pedidos (más `id`).
+- Que las columnas no pedidas no aparecen en el SELECT de tarjetas.
+- Que un campo desconocido responde 400 y que la ETag se conserva.
+"""
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.models import Board, Card, List, User
+from app.cards.ranking import place_card
+
+
+@pytest.fixture
+def entorno(Session, client, sentencias):
+    """Tablero con una lista y dos tarjetas con descripción larga."""
+    with Session() as db:
+        user = User(email="fields@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Proyección", user_id=user.id)
+        db.add(board)
+        db.flush()
+        lst = List(name="Por hacer", board_id=board.id, position=0)
+        db.add(lst)
+        db.flush()
+        for title in ("Uno", "Dos"):
+            card = Card(title=title, description="x" * 10_000, board_id=board.id, created_by_id=user.id)
+            place_card(db, card, lst.id)
+            db.add(card)
+            db.flush()
+        db.commit()
+        ids = {"user": user.id, "board": board.id, "card": card.id}
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, headers, ids, sentencias
+
+
+def test_get_cards_proyectado(entorno):
+    client, headers, ids, sentencias = entorno
+    sentencias.clear()
+
+    resp = client.get("/cards/", params={"board_id": ids["board"], "fields": "title,list_id,order"}, headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"]
+    assert [set(c) for c in resp.json()] == [{"id", "title", "list_id", "order"}] * 2
+    assert [c["order"] for c in resp.json()] == [0, 1]
+    card_selects = [sql for sql in sentencias if "FROM cards" in sql]
+    assert card_selects and not any("description" in sql for sql in card_selects)
+
+
+def test_get_card_y_snapshot_proyectados(entorno):
+    client, headers, ids, _ = entorno
+
+    card = client.get(f"/cards/{ids['card']}", params={"fields": "title,order"}, headers=headers).json()
+    assert card == {"id": ids["card"], "title": "Dos", "order": 1}
+
+    snapshot = client.get(f"/boards/{ids['board']}/snapshot", params={"fields": "title"}, headers=headers).json()
+    assert snapshot["revision"] == 0
+    assert snapshot["lists"][0]["cards"] == [{"id": ids["card"] - 1, "title": "Uno"}, {"id": ids["card"], "title": "Dos"}]
+
+    boards = client.get("/boards/", params={"fields": "name"}, headers=headers).json()
+    assert boards == [{"id": ids["board"], "name": "Proyección"}]
+
+
+def test_campo_desconocido(entorno):
+    client, headers, ids, _ = entorno
+    resp = client.get("/cards/", params={"board_id": ids["board"], "fields": "title,password_hash"}, headers=headers)
+    assert resp.status_code == 400
+    assert "password_hash" in resp.json()["detail"]
@@ -0,0 +1,134 @@
+"""
+Pruebas del orden por ranks fraccionales (app.cards.ranking).
+
+Este módulo verifica:
+- rank_between genera claves estrictamente intermedias y rechaza huecos imposibles.
+- evenly_spaced_ranks produce claves crecientes y cortas.
+- place_card mueve una tarjeta actualizando una sola fila y reequilibra la lista
+  cuando las claves superan la longitud máxima.
+
+Las pruebas de base de datos usan un engine SQLite en memoria, sin depender de
+la base configurada en la aplicación.
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.boards.models import User, Board, List, Card
+from app.cards.ranking import (
+    rank_between,
+    evenly_spaced_ranks,
+    place_card,
+    annotate_orders,
+)
+from app.config import settings
+
+
+@pytest.fixture
+def db():
+    """Sesión sobre una base SQLite en memoria con un tablero y una lista."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    user = User(email="rank@example.com", password_hash="hash")
+    session.add(user)
+    session.flush()
+    board = Board(name="Tablero", user_id=user.id)
+    session.add(board)
+    session.flush()
+    lista = List(name="Por hacer", board_id=board.id, position=0)
+    session.add(lista)
+    session.commit()
+
+    session.info["ids"] = (user.id, board.id, lista.id)
+    yield session
+    session.close()
+
+
+def _crear_tarjetas(db, n):
+    user_id, board_id, list_id = db.info["ids"]
+    cards = []
+    for i in range(n):
+        card = Card(title=f"c{i}", board_id=board_id, list_id=list_id, created_by_id=user_id)
+        place_card(db, card, list_id)
+        db.add(card)
+        db.flush()
+        cards.append(card)
+    db.commit()
+    return cards
+
+
+def _orden_actual(db):
+    _, _, list_id = db.info["ids"]
+    return [c.id for c in db.query(Card).filter(Card.list_id == list_id).order_by(Card.rank, Card.id)]
+
+
+def test_rank_between_intermedio():
+    """La clave generada queda estrictamente entre sus vecinas."""
+    casos = [(None, None), (None, "5"), ("5", None), ("a", "b"), ("a", "a1"), ("0", "01"), ("zz", None)]
+    for before, after in casos:
+        rank = rank_between(before, after)
+        assert before is None or before < rank
+        assert after is None or rank < after
+        assert not rank.endswith("0")
+
+
+def test_rank_between_sin_hueco():
+    """Vecinas iguales o invertidas no tienen clave intermedia."""
+    with pytest.raises(ValueError):
+        rank_between("b", "b")
+    with pytest.raises(ValueError):
+        rank_between("c", "b")
+
+
+def test_evenly_spaced_ranks_crecientes():
+    """Las claves de reequilibrio son crecientes y cortas."""
+    ranks = evenly_spaced_ranks(2000)
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == 2000
+    assert max(len(r) for r in ranks) <= 4
+
+
+def test_mover_actualiza_una_sola_fila(db):
+    """Mover una tarjeta en una lista grande solo emite un UPDATE de cards."""
+    cards = _crear_tarjetas(db, 50)
+    _, _, list_id = db.info["ids"]
+
+    updates = []
+
+    def contar(conn, cursor, statement, params, context, executemany):
+        if statement.startswith("UPDATE cards"):
+            updates.append(executemany)
+
+    event.listen(db.get_bind(), "before_cursor_execute", contar)
+    order = place_card(db, cards[0], list_id, 30)
+    db.commit()
+    event.remove(db.get_bind(), "before_cursor_execute", contar)
+
+    assert order == 30
+    assert updates == [False]
+    assert _orden_actual(db).index(cards[0].id) == 30
+
+
+def test_reequilibrio_por_longitud(db, monkeypatch):
+    """Insertar repetidamente en el mismo hueco dispara un reequilibrio de la lista."""
+    monkeypatch.setattr(settings, "CARD_RANK_MAX_LENGTH", 4)
+    cards = _crear_tarjetas(db, 3)
+    _, _, list_id = db.info["ids"]
+
+    # Siempre a la posición 1: las claves entre c0 y la anterior crecen
+    for card in _crear_tarjetas(db, 20):
+        place_card(db, card, list_id, 1)
+        db.commit()
+
+    ranks = [c.rank for c in db.query(Card).filter(Card.list_id == list_id)]
+    assert max(len(r) for r in ranks) <= 4
+    assert _orden_actual(db)[0] == cards[0].id
+
+
+def test_annotate_orders_por_lista():
+    """order es el índice dentro de cada lista."""
+    cards = [Card(list_id=1), Card(list_id=1), Card(list_id=2), Card(list_id=2), Card(list_id=2)]
+    assert [c.order for c in annotate_orders(cards)] == [0, 1, 0, 1, 2]
@@ -0,0 +1,89 @@
+"""
+Pruebas de la ruta rápida de serialización de tarjetas (app.cards.serialization).
+
+Este módulo verifica:
+- Que el JSON de la ruta rápida es idéntico al de CardOut sobre objetos ORM.
+- Que GET /cards/ sirve el tablero completo por la ruta rápida con su ETag.
+- Que el esquema OpenAPI de GET /cards/ sigue siendo list[CardOut].
+"""
+import json
+from datetime import date
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.auth.utils import create_token
+from app.boards.models import Board, Card, List, User
+from app.cards.ranking import annotate_orders, place_card
+from app.cards.schemas import CardOut
+from app.cards.serialization import CardRow, dump_card_rows, select_card_rows
+
+
+@pytest.fixture
+def entorno(Session, client):
+    """Tablero con dos listas y tarjetas con y sin campos opcionales."""
+    with Session() as db:
+        user = User(email="fast@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Rápido", user_id=user.id)
+        db.add(board)
+        db.flush()
+        for pos, name in enumerate(("Por hacer", "Hecho")):
+            lst = List(name=name, board_id=board.id, position=pos)
+            db.add(lst)
+            db.flush()
+            for idx in range(3):
+                card = Card(
+                    title=f"{name} {idx} «ñ»",
+                    description=None if idx else "detalle",
+                    due_date=date(2026, 1, idx + 1) if idx else None,
+                    responsible_id=user.id if idx == 2 else None,
+                    board_id=board.id,
+                    created_by_id=user.id,
+                )
+                place_card(db, card, lst.id)
+                db.add(card)
+                db.flush()
+        db.commit()
+        ids = {"user": user.id, "board": board.id}
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, headers, ids, Session
+
+
+def test_campos_iguales_a_cardout():
+    assert list(CardRow.__annotations__) == list(CardOut.model_fields)
+
+
+def test_json_identico_a_ruta_orm(entorno):
+    _, _, ids, Session = entorno
+    with Session() as db:
+        rapido = dump_card_rows(select_card_rows(db, ids["board"]))
+        cards = db.query(Card).filter(Card.board_id == ids["board"]).order_by(
+            Card.list_id, Card.rank, Card.position, Card.id
+        ).all()
+        orm = TypeAdapter(list[CardOut]).dump_json(
+            [CardOut.model_validate(card) for card in annotate_orders(cards)]
+        )
+    assert rapido == orm
+
+
+def test_get_cards_usa_ruta_rapida(entorno):
+    client, headers, ids, _ = entorno
+    res = client.get(f"/cards/?board_id={ids['board']}", headers=headers)
+    assert res.status_code == 200
+    assert res.headers["etag"]
+    data = res.json()
+    assert len(data) == 6
+    assert [card["order"] for card in data] == [0, 1, 2, 0, 1, 2]
+
+    res = client.get(f"/cards/?board_id={ids['board']}", headers={**headers, "If-None-Match": res.headers["etag"]})
+    assert res.status_code == 304
+
+
+def test_openapi_sin_cambios(entorno):
+    client, _, _, _ = entorno
+    schema = client.get("/openapi.json").json()
+    ok = schema["paths"]["/cards/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert ok["items"]["$ref"].endswith("/CardOut")
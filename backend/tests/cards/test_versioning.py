@@ -0,0 +1,167 @@
+"""
+Pruebas de concurrencia optimista en tarjetas (app.cards.versioning).
+
+Este módulo verifica:
+- Que cada escritura incrementa `version` y devuelve la ETag de la tarjeta.
+- Que If-Match con una versión antigua (o una ETag que no es de la tarjeta)
+  responde 412 en PATCH, move, DELETE y en las operaciones en lote.
+- Que una escritura concurrente entre la lectura y el flush también da 412.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+
+from app.auth.utils import create_token
+from app.boards.models import Board, Card, List, User
+from app.cards.ranking import place_card
+from app.cards.versioning import stale_guard
+
+
+@pytest.fixture
+def entorno(Session, client):
+    """Tablero con una lista y dos tarjetas."""
+    with Session() as db:
+        user = User(email="version@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Versiones", user_id=user.id)
+        db.add(board)
+        db.flush()
+        lst = List(name="Por hacer", board_id=board.id, position=0)
+        db.add(lst)
+        db.flush()
+        cards = []
+        for title in ("A", "B"):
+            card = Card(title=title, board_id=board.id, created_by_id=user.id)
+            place_card(db, card, lst.id)
+            db.add(card)
+            db.flush()
+            cards.append(card.id)
+        db.commit()
+        ids = {"user": user.id, "board": board.id, "list": lst.id, "cards": cards}
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+    return client, Session, ids, headers
+
+
+def test_patch_con_if_match(entorno):
+    client, _, ids, headers = entorno
+    card_id = ids["cards"][0]
+
+    res = client.patch(f"/cards/{card_id}", json={"title": "A2"}, headers=headers)
+    assert res.status_code == 200
+    assert res.json()["version"] == 2
+    etag = res.headers["etag"]
+    assert etag == f'"card-{card_id}-2"'
+
+    res = client.patch(f"/cards/{card_id}", json={"title": "A3"}, headers={**headers, "If-Match": etag})
+    assert res.status_code == 200
+
+    # La ETag anterior ya no vale: no se pisa el cambio
+    res = client.patch(f"/cards/{card_id}", json={"title": "pisado"}, headers={**headers, "If-Match": etag})
+    assert res.status_code == 412
+    assert res.headers["etag"] == f'"card-{card_id}-3"'
+    assert client.get(f"/cards/{card_id}", headers=headers).json()["title"] == "A3"
+
+
+def test_leer_y_escribir_con_la_etag_del_get(entorno):
+    client, _, ids, headers = entorno
+    a, b = ids["cards"]
+
+    res = client.get(f"/cards/{a}", headers=headers)
+    etag = res.headers["etag"]
+    assert etag.startswith(f'"card-{a}-1-')
+    assert client.get(f"/cards/{a}", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    # Mover otra tarjeta cambia el `order` de esta: la ETag de lectura cambia, la versión no
+    client.patch(f"/cards/{b}/move", json={"list_id": ids["list"], "order": 0}, headers=headers)
+    assert client.get(f"/cards/{a}", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+    res = client.patch(f"/cards/{a}", json={"title": "A2"}, headers={**headers, "If-Match": etag})
+    assert res.status_code == 200
+    res = client.patch(f"/cards/{a}", json={"title": "A3"}, headers={**headers, "If-Match": etag})
+    assert res.status_code == 412
+
+
+def test_if_match_de_otra_entidad(entorno):
+    client, _, ids, headers = entorno
+    a, b = ids["cards"]
+    otra = client.get(f"/cards/{b}", headers=headers).headers["etag"]
+
+    for tag in (otra, 'W/"1-1"', f'W/"card-{a}-1"'):
+        res = client.put(f"/cards/{a}", json={"title": "X"}, headers={**headers, "If-Match": tag})
+        assert res.status_code == 412
+    res = client.put(f"/cards/{a}", json={"title": "X"}, headers={**headers, "If-Match": "*"})
+    assert res.status_code == 200
+
+
+def test_reequilibrar_no_cambia_la_version_de_las_vecinas(entorno):
+    client, Session, ids, headers = entorno
+    a, b = ids["cards"]
+    with Session() as db:
+        # Ranks repetidos: mover entre A y B obliga a reequilibrar la lista
+        db.execute(update(Card).where(Card.id == b).values(rank=select(Card.rank).where(Card.id == a).scalar_subquery()))
+        db.commit()
+    c = client.post(
+        "/cards/", json={"title": "C", "board_id": ids["board"], "list_id": ids["list"]}, headers=headers
+    ).json()["id"]
+
+    res = client.patch(f"/cards/{c}/move", json={"list_id": ids["list"], "order": 1}, headers=headers)
+    assert res.status_code == 200
+    with Session() as db:
+        assert [db.get(Card, card_id).version for card_id in (a, b)] == [1, 1]
+        assert len(set(db.scalars(select(Card.rank).where(Card.list_id == ids["list"])))) == 3
+    res = client.patch(f"/cards/{b}", json={"title": "B2"}, headers={**headers, "If-Match": f'"card-{b}-1"'})
+    assert res.status_code == 200
+
+
+def test_move_y_delete_con_version_antigua(entorno):
+    client, _, ids, headers = entorno
+    a, b = ids["cards"]
+    antigua = f'"card-{a}-1"'
+
+    res = client.patch(f"/cards/{a}/move", json={"list_id": ids["list"], "order": 1}, headers=headers)
+    assert res.status_code == 200
+    assert res.headers["etag"] == f'"card-{a}-2"'
+
+    res = client.patch(
+        f"/cards/{a}/move", json={"list_id": ids["list"], "order": 0}, headers={**headers, "If-Match": antigua}
+    )
+    assert res.status_code == 412
+    assert client.delete(f"/cards/{a}", headers={**headers, "If-Match": antigua}).status_code == 412
+    assert client.delete(f"/cards/{a}", headers={**headers, "If-Match": f'"card-{a}-2"'}).status_code == 204
+    assert client.delete(f"/cards/{b}", headers=headers).status_code == 204
+
+
+def test_lote_con_version(entorno):
+    client, _, ids, headers = entorno
+    a, b = ids["cards"]
+    client.patch(f"/cards/{a}", json={"title": "A2"}, headers=headers)
+
+    res = client.post("/cards/bulk", headers=headers, json={"operations": [
+        {"op": "update", "id": a, "version": 1, "archived": True},
+        {"op": "update", "id": b, "version": 1, "archived": True},
+    ]})
+
+    assert [r["status"] for r in res.json()["results"]] == [412, 200]
+    assert res.json()["results"][1]["card"]["version"] == 2
+
+
+def test_escritura_concurrente_entre_lectura_y_flush(entorno):
+    _, Session, ids, _ = entorno
+    card_id = ids["cards"][0]
+
+    with Session() as primero, Session() as segundo:
+        card = primero.get(Card, card_id)
+        otra = segundo.get(Card, card_id)
+        otra.title = "gana"
+        segundo.commit()
+
+        card.title = "pierde"
+        with pytest.raises(HTTPException) as exc:
+            with stale_guard(primero, card_id):
+                primero.flush()
+        assert exc.value.status_code == 412
+
+    with Session() as db:
+        assert db.get(Card, card_id).title == "gana"
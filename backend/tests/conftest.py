@@ -0,0 +1,69 @@
+"""
+Configuración común de pytest.
+
+Las cachés en memoria del proceso (identidades, etc.) se vacían antes de cada
+prueba: varias pruebas usan bases SQLite propias en las que se repiten los ids,
+y una entrada de otra prueba no debe influir en el resultado.
+
+Fixtures de base de datos compartidas (cada módulo solo añade sus datos):
+- `engine`: SQLite en memoria con el esquema creado.
+- `Session`: sessionmaker sobre `engine`.
+- `sentencias`: SQL ejecutado en `engine`, en orden.
+- `client`: TestClient de la app con get_db sobre `Session`.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.auth.identity import identity_cache
+from app.auth.utils import get_db
+from app.boards.permissions import permission_cache
+from app.database import Base
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def limpiar_caches():
+    identity_cache.clear()
+    permission_cache.clear()
+    yield
+
+
+@pytest.fixture
+def engine():
+    """SQLite en memoria: una sola conexión compartida por todos los hilos (StaticPool)."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def Session(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def sentencias(engine):
+    """Lista con el SQL de cada sentencia ejecutada en `engine` (vaciar con clear())."""
+    registro = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def registrar(conn, cursor, statement, params, context, executemany):
+        registro.append(statement)
+
+    return registro
+
+
+@pytest.fixture
+def client(Session):
+    """TestClient de la app con la dependencia get_db sobre `Session`."""
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
@@ -0,0 +1,138 @@
+"""
+Pruebas de la búsqueda de texto completo (GET /search, app.search).
+
+Este módulo verifica:
+- Que solo se devuelven tarjetas de tableros accesibles (propios o compartidos).
+- Que el índice sigue a las escrituras: crear, editar, borrar y lotes.
+- El ranking (título antes que descripción), el prefijo de la última palabra
+  y la paginación por cursor.
+- Que ensure_search_index reconstruye el índice de una base ya existente.
+"""
+import pytest
+from sqlalchemy import text
+
+from app.auth.utils import create_token
+from app.boards.models import Board, BoardMember, List, User
+from app.search.index import ensure_search_index, optimize_search_index
+
+
+@pytest.fixture
+def entorno(engine, Session, client):
+    """Dos usuarios; el primero ve su tablero y uno compartido, pero no el tercero."""
+    with Session() as db:
+        ana = User(email="ana@example.com", password_hash="x")
+        luis = User(email="luis@example.com", password_hash="x")
+        db.add_all([ana, luis])
+        db.flush()
+        boards = [Board(name=name, user_id=owner.id) for name, owner in (("Ana", ana), ("Luis", luis), ("Privado", luis))]
+        db.add_all(boards)
+        db.flush()
+        db.add(BoardMember(board_id=boards[1].id, user_id=ana.id, role="viewer"))
+        lists = [List(name="Por hacer", board_id=board.id, position=0) for board in boards]
+        db.add_all(lists)
+        db.commit()
+        ids = {
+            "ana": ana.id,
+            "luis": luis.id,
+            "boards": [board.id for board in boards],
+            "lists": [lst.id for lst in lists],
+        }
+
+    return client, engine, ids
+
+
+def _headers(user_id):
+    return {"Authorization": f"Bearer {create_token({'user_id': user_id})}"}
+
+
+def _create(client, ids, user, idx, title, description=None):
+    body = {"title": title, "description": description, "board_id": ids["boards"][idx], "list_id": ids["lists"][idx]}
+    res = client.post("/cards/", json=body, headers=_headers(ids[user]))
+    assert res.status_code == 200
+    return res.json()["id"]
+
+
+def _search(client, user_id, q, **params):
+    res = client.get("/search", params={"q": q, **params}, headers=_headers(user_id))
+    assert res.status_code == 200
+    return res
+
+
+@pytest.mark.parametrize("max_boards", [500, 0])
+def test_solo_tableros_accesibles(entorno, monkeypatch, max_boards):
+    """Con pocos tableros se filtra en el índice; con muchos, solo con el IN de la consulta."""
+    monkeypatch.setattr("app.search.routes.MAX_INDEX_FILTER_BOARDS", max_boards)
+    client, _, ids = entorno
+    propia = _create(client, ids, "ana", 0, "Informe mensual")
+    compartida = _create(client, ids, "luis", 1, "Revisar informe")
+    _create(client, ids, "luis", 2, "Informe secreto")
+
+    found = {hit["id"] for hit in _search(client, ids["ana"], "informe").json()}
+    assert found == {propia, compartida}
+    assert len(_search(client, ids["luis"], "informe").json()) == 2
+
+
+def test_ranking_prefijo_y_acentos(entorno):
+    client, _, ids = entorno
+    en_descripcion = _create(client, ids, "ana", 0, "Tarea", "llamar por el camión")
+    en_titulo = _create(client, ids, "ana", 0, "Camión de reparto")
+    _create(client, ids, "ana", 0, "Otra cosa")
+
+    hits = _search(client, ids["ana"], "camion").json()
+    assert [hit["id"] for hit in hits] == [en_titulo, en_descripcion]
+    assert [hit["id"] for hit in _search(client, ids["ana"], "camión rep").json()] == [en_titulo]
+    # Prefijo corto (índice de prefijos de 2 y 3 letras)
+    assert [hit["id"] for hit in _search(client, ids["ana"], "ca").json()] == [en_titulo, en_descripcion]
+    # La sintaxis de FTS5 del usuario se trata como texto
+    assert _search(client, ids["ana"], 'camion" OR "*').json() == []
+    assert _search(client, ids["ana"], "!!").json() == []
+    # El board_id indexado no se busca como texto
+    assert _search(client, ids["ana"], str(ids["boards"][0])).json() == []
+
+
+def test_indice_sigue_a_las_escrituras(entorno):
+    client, _, ids = entorno
+    headers = _headers(ids["ana"])
+    card_id = _create(client, ids, "ana", 0, "Presupuesto")
+
+    client.patch(f"/cards/{card_id}", json={"title": "Factura"}, headers=headers)
+    assert _search(client, ids["ana"], "presupuesto").json() == []
+    assert [hit["id"] for hit in _search(client, ids["ana"], "factura").json()] == [card_id]
+
+    # Archivar y mover no reindexan, pero se reflejan en el resultado
+    client.post("/cards/bulk", json={"operations": [{"op": "update", "id": card_id, "archived": True}]}, headers=headers)
+    assert _search(client, ids["ana"], "factura").json()[0]["archived"] is True
+
+    client.delete(f"/cards/{card_id}", headers=headers)
+    assert _search(client, ids["ana"], "factura").json() == []
+
+
+def test_paginacion_por_cursor(entorno):
+    client, _, ids = entorno
+    created = {_create(client, ids, "ana", 0, f"Reunión {i}", "reunión semanal" * (i % 3)) for i in range(7)}
+
+    seen, after = [], None
+    while True:
+        params = {"limit": 3, **({"after": after} if after else {})}
+        res = _search(client, ids["ana"], "reunion", **params)
+        seen += [hit["id"] for hit in res.json()]
+        after = res.headers.get("x-next-cursor")
+        if not after:
+            break
+
+    assert len(seen) == 7 and set(seen) == created
+    assert client.get("/search", params={"q": "x", "after": "no-es-cursor"}, headers=_headers(ids["ana"])).status_code == 400
+
+
+def test_reconstruye_indice_existente(entorno):
+    client, engine, ids = entorno
+    card_id = _create(client, ids, "ana", 0, "Inventario")
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE cards_fts"))
+        conn.execute(text("DROP TRIGGER IF EXISTS cards_fts_ai"))
+
+    ensure_search_index(engine)
+    ensure_search_index(engine)  # idempotente
+    optimize_search_index(engine)
+
+    assert [hit["id"] for hit in _search(client, ids["ana"], "inventario").json()] == [card_id]
@@ -0,0 +1,115 @@
+"""
+Pruebas de la capa asíncrona (app.async_database y app.async_routes).
+
+Este módulo verifica:
+- Que las URLs síncronas se traducen a drivers asíncronos.
+- Que los routers generados por asyncify_router son corutinas con dependencias async.
+- Un flujo completo (crear, listar y mover tarjetas) servido por las rutas async
+  sobre una base SQLite en memoria con aiosqlite.
+"""
+import asyncio
+import inspect
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.async_database import to_async_url
+from app.async_routes import asyncify_router
+from app.auth.utils import create_token, get_async_db
+from app.boards.models import User, Board, List
+from app.boards.routes import router as boards_router
+from app.cards.routes import router as cards_router
+from app.database import Base
+
+
+def test_to_async_url():
+    """Los esquemas conocidos cambian a su driver asíncrono."""
+    assert to_async_url("postgresql://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+def test_rutas_async_son_corutinas():
+    """Cada ruta del router generado es una corutina que depende de get_async_db."""
+    router = asyncify_router(cards_router)
+    for route in router.routes:
+        assert inspect.iscoroutinefunction(route.endpoint)
+        deps = [p.default.dependency for p in inspect.signature(route.endpoint).parameters.values()
+                if hasattr(p.default, "dependency")]
+        assert get_async_db in deps
+
+
+@pytest.fixture
+def async_client():
+    """Aplicación con las rutas async sobre SQLite en memoria, con un usuario y su tablero."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Session = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def preparar():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with Session() as db:
+            user = User(email="async@example.com", password_hash="hash")
+            db.add(user)
+            await db.flush()
+            board = Board(name="Async", user_id=user.id)
+            db.add(board)
+            await db.flush()
+            lists = [List(name=n, board_id=board.id, position=i) for i, n in enumerate(["A", "B"])]
+            db.add_all(lists)
+            await db.commit()
+            return user.id, board.id, [lst.id for lst in lists]
+
+    user_id, board_id, list_ids = asyncio.run(preparar())
+
+    async def override_get_async_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(asyncify_router(boards_router))
+    app.include_router(asyncify_router(cards_router))
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    headers = {"Authorization": f"Bearer {create_token({'user_id': user_id})}"}
+    yield TestClient(app), headers, board_id, list_ids
+
+
+def test_flujo_tarjetas_async(async_client):
+    """Crear, listar y mover tarjetas a través de las rutas asíncronas."""
+    client, headers, board_id, (list_a, list_b) = async_client
+
+    resp = client.get(f"/boards/{board_id}/lists", headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert [lst["name"] for lst in resp.json()] == ["A", "B"]
+
+    ids = []
+    for title in ("uno", "dos", "tres"):
+        resp = client.post(
+            "/cards/",
+            json={"title": title, "board_id": board_id, "list_id": list_a},
+            headers=headers,
+        )
+        assert resp.status_code == 200, resp.text
+        ids.append(resp.json()["id"])
+
+    resp = client.patch(f"/cards/{ids[0]}/move", json={"list_id": list_b, "order": 0}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["list_id"] == list_b
+
+    resp = client.get(f"/cards/?board_id={board_id}", headers=headers)
+    cards = {c["id"]: c for c in resp.json()}
+    assert cards[ids[1]]["order"] == 0 and cards[ids[2]]["order"] == 1
+    assert cards[ids[0]]["list_id"] == list_b
+
+
+def test_sin_token_async(async_client):
+    """Las rutas async siguen exigiendo autenticación."""
+    client, _, board_id, _ = async_client
+    assert client.get(f"/cards/?board_id={board_id}").status_code == 401
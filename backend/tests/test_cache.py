@@ -0,0 +1,55 @@
+"""
+Pruebas de la caché acotada con TTL (app.cache.TTLCache).
+
+Este módulo verifica la caducidad por tiempo, la expulsión LRU al superar el
+tamaño máximo, la invalidación y los contadores de aciertos/fallos.
+"""
+from app.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_caduca():
+    """Una entrada deja de devolverse cuando vence su TTL."""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, timer=clock)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    clock.now = 5.1
+    assert cache.get("a") is None
+
+
+def test_lru_expulsa_la_menos_usada():
+    """Al superar maxsize se expulsa la entrada usada hace más tiempo."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidacion_y_contadores():
+    """invalidate/invalidate_where borran entradas y los contadores reflejan aciertos y fallos."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set((1, 10), "owner")
+    cache.set((2, 10), "viewer")
+    cache.set((2, 11), "editor")
+
+    assert cache.get((1, 10)) == "owner"
+    cache.invalidate((1, 10))
+    assert cache.get((1, 10)) is None
+    assert cache.invalidate_where(lambda key: key[1] == 10) == 1
+    assert len(cache) == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
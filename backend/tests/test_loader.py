@@ -0,0 +1,74 @@
+"""
+Pruebas del cargador por petición (app.loader) y de la cabecera X-Query-Count.
+
+Este módulo verifica:
+- Que load_many agrupa los ids en una sola consulta IN y respeta el orden.
+- Que las repeticiones se sirven desde la sesión y los ids primados se cargan juntos.
+- Que cada respuesta HTTP lleva el número de sentencias SQL de la petición.
+"""
+import pytest
+
+from app.auth.utils import create_token
+from app.boards.models import Board, List, User
+from app.loader import loader_for
+
+
+@pytest.fixture
+def entorno(Session, sentencias):
+    """SQLite en memoria con un usuario y tres tableros; registra las sentencias."""
+    with Session() as db:
+        user = User(email="loader@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        boards = [Board(name=f"B{i}", user_id=user.id) for i in range(3)]
+        db.add_all(boards)
+        db.flush()
+        db.add(List(name="Por hacer", board_id=boards[0].id, position=0))
+        db.commit()
+        ids = {"user": user.id, "boards": [b.id for b in boards]}
+
+    sentencias.clear()
+    return Session, ids, sentencias
+
+
+def test_load_many_en_una_consulta(entorno):
+    Session, ids, sentencias = entorno
+    with Session() as db:
+        loader = loader_for(db)
+        wanted = list(reversed(ids["boards"])) + [9999]
+
+        boards = loader.load_many(Board, wanted)
+
+        assert [b.id if b else None for b in boards] == wanted[:-1] + [None]
+        assert len(sentencias) == 1 and " IN " in sentencias[0]
+
+        # Repeticiones e inexistentes: sin SQL
+        assert loader.load(Board, ids["boards"][0]).name == "B0"
+        assert loader.load(Board, 9999) is None
+        assert len(sentencias) == 1
+        assert loader.batches == 1
+
+
+def test_prime_agrupa_la_siguiente_carga(entorno):
+    Session, ids, sentencias = entorno
+    with Session() as db:
+        loader = loader_for(db)
+        loader.prime(Board, ids["boards"])
+
+        loader.load(Board, ids["boards"][0])
+        for board_id in ids["boards"]:
+            loader.load(Board, board_id)
+
+        assert len(sentencias) == 1
+        assert loader_for(db) is loader
+
+
+def test_cabecera_x_query_count(entorno, client):
+    Session, ids, sentencias = entorno
+    headers = {"Authorization": f"Bearer {create_token({'user_id': ids['user']})}"}
+
+    resp = client.get(f"/boards/{ids['boards'][0]}/lists", headers=headers)
+
+    assert resp.status_code == 200
+    assert int(resp.headers["x-query-count"]) == len(sentencias)
+    assert client.get("/").headers["x-query-count"] == "0"
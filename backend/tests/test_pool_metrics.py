@@ -0,0 +1,98 @@
+"""
+Pruebas de la configuración del pool y sus métricas (app.database, app.pool_metrics, app.metrics).
+
+Este módulo verifica:
+- Que engine_options aplica la configuración de Settings según el tipo de URL.
+- Que el pool instrumentado cuenta conexiones en uso, esperas y timeouts.
+- Que GET /metrics/db-pool expone el estado del pool principal.
+- Que las métricas solo son accesibles para administradores.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.auth.utils import ADMIN_ROLE, create_token
+from app.boards.models import User
+from app.database import engine_options
+from app.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool, pool_status
+from app.config import settings
+
+
+def test_engine_options_postgres(monkeypatch):
+    """PostgreSQL usa QueuePool instrumentado con los valores de Settings y sin echo."""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    options = engine_options("postgresql://u:p@localhost/db")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert options["echo"] is False
+    assert options["connect_args"] == {"client_encoding": "utf8"}
+
+    async_options = engine_options("postgresql+asyncpg://u:p@localhost/db", is_async=True)
+    assert async_options["poolclass"] is InstrumentedAsyncQueuePool
+    assert "connect_args" not in async_options
+
+
+def test_engine_options_sqlite_memoria():
+    """SQLite en memoria no usa QueuePool (una conexión por hilo)."""
+    options = engine_options("sqlite:///:memory:")
+    assert "poolclass" not in options
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_pool_instrumentado_cuenta_timeouts(tmp_path):
+    """Con el pool lleno, la siguiente petición espera, agota el timeout y se contabiliza."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    conn = engine.connect()
+
+    status = pool_status(engine.pool)
+    assert status["checked_out"] == 1
+    assert status["waits"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    assert pool_status(engine.pool)["timeouts"] == 1
+
+    conn.close()
+    status = pool_status(engine.pool)
+    assert status["checked_out"] == 0
+    assert status["idle"] == 1
+    engine.dispose()
+
+
+@pytest.fixture
+def auth(Session):
+    """Cabeceras de un administrador y de un usuario normal."""
+    with Session() as db:
+        admin = User(email="admin@example.com", password_hash="x", role=ADMIN_ROLE)
+        user = User(email="user@example.com", password_hash="x")
+        db.add_all([admin, user])
+        db.commit()
+        return {
+            name: {"Authorization": f"Bearer {create_token({'user_id': u.id})}"}
+            for name, u in (("admin", admin), ("user", user))
+        }
+
+
+def test_endpoint_metricas_pool(client, auth):
+    """GET /metrics/db-pool devuelve el pool principal con sus contadores."""
+    resp = client.get("/metrics/db-pool", headers=auth["admin"])
+    assert resp.status_code == 200
+    primary = resp.json()["pools"]["primary"]
+    for key in ("checked_out", "idle", "overflow", "wait_avg_ms", "timeouts"):
+        assert key in primary
+
+
+@pytest.mark.parametrize("path", ["/metrics/db-pool", "/metrics/caches", "/metrics/realtime"])
+def test_metricas_solo_administradores(client, auth, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers=auth["user"]).status_code == 403
+    assert client.get(path, headers=auth["admin"]).status_code == 200
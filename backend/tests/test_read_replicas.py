@@ -0,0 +1,210 @@
+"""
+Pruebas del enrutado a réplicas de lectura (app.database.RoutingSession).
+
+Se usan dos ficheros SQLite: uno hace de primario y otro de réplica. Ambos
+tienen el mismo esquema pero datos distintos, de modo que cada lectura revela
+a qué base se envió.
+
+Este módulo verifica:
+- Las sesiones de solo lectura consultan la réplica; las demás, el primario.
+- Las escrituras siempre van al primario.
+- Tras escribir, las lecturas del mismo cliente van al primario durante la
+  ventana de lectura consistente, y vuelven a la réplica cuando caduca.
+- Que la marca de escritura viaja en la cookie / cabecera X-Last-Write, sin
+  estado en el proceso, también tras escrituras Core (PATCH, lotes).
+- Que las sesiones consecutivas reparten las lecturas entre las réplicas.
+"""
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.utils import create_token
+from app.boards.models import Board, Card, List, User
+from app.database import Base, RoutingSession
+from app.read_your_writes import COOKIE, WriteMarker, current_marker, marker_from_headers
+
+
+@pytest.fixture
+def routing(tmp_path):
+    """Sessionmaker con primario y réplica SQLite."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, email in ((primary, "primary@example.com"), (replica, "replica@example.com")):
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(User(id=1, email=email, password_hash="hash"))
+            db.commit()
+
+    yield sessionmaker(class_=RoutingSession, bind=primary, replicas=[replica])
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def Session(engine):
+    """Sesiones de la app (RoutingSession) para el cliente HTTP de conftest."""
+    return sessionmaker(class_=RoutingSession, bind=engine)
+
+
+def _email(db):
+    return db.get(User, 1).email
+
+
+@contextmanager
+def peticion(last_write=None):
+    """Simula la marca que ReadYourWritesMiddleware abre para cada petición."""
+    marker = WriteMarker(last_write)
+    token = current_marker.set(marker)
+    try:
+        yield marker
+    finally:
+        current_marker.reset(token)
+
+
+def test_lecturas_a_replica_y_resto_al_primario(routing):
+    """Solo las sesiones read_only leen de la réplica."""
+    Session = routing
+
+    with Session() as db:
+        db.info["read_only"] = True
+        assert _email(db) == "replica@example.com"
+
+    with Session() as db:
+        assert _email(db) == "primary@example.com"
+
+
+def test_escrituras_van_al_primario(routing, tmp_path):
+    """Un flush desde una sesión read_only escribe en el primario y fija la sesión a él."""
+    Session = routing
+
+    with Session() as db:
+        db.info["read_only"] = True
+        db.add(User(email="nuevo@example.com", password_hash="hash"))
+        db.commit()
+        assert db.query(User).filter(User.email == "nuevo@example.com").count() == 1
+
+    with Session() as db:
+        db.info["read_only"] = True
+        assert db.query(User).filter(User.email == "nuevo@example.com").count() == 0
+
+
+def test_lectura_consistente_tras_escribir(routing):
+    """Tras escribir, el cliente lee del primario hasta que caduca la ventana."""
+    Session = routing
+
+    with peticion() as escritura, Session() as db:
+        db.get(User, 1).name = "Editado"
+        db.commit()
+    assert escritura.wrote_at is not None
+
+    with peticion(escritura.wrote_at), Session() as db:
+        db.info["read_only"] = True
+        assert _email(db) == "primary@example.com"
+
+    # Un cliente sin marca (u otro usuario) sigue leyendo de la réplica
+    with peticion(), Session() as db:
+        db.info["read_only"] = True
+        assert _email(db) == "replica@example.com"
+
+    with peticion(escritura.wrote_at - 6), Session() as db:
+        db.info["read_only"] = True
+        assert _email(db) == "replica@example.com"
+
+
+def test_rollback_no_marca_escritura(routing):
+    """Una transacción deshecha no activa la ventana de lectura consistente."""
+    Session = routing
+
+    with peticion() as marker, Session() as db:
+        db.get(User, 1).name = "Descartado"
+        db.flush()
+        db.rollback()
+
+    assert marker.wrote_at is None
+
+
+def test_sesiones_consecutivas_rotan_las_replicas():
+    """El round-robin es común a todas las sesiones, no empieza de cero en cada una."""
+    primary, *replicas = [create_engine("sqlite://") for _ in range(3)]
+    Session = sessionmaker(class_=RoutingSession, bind=primary, replicas=replicas)
+
+    elegidas = []
+    for _ in range(4):
+        with Session() as db:
+            db.info["read_only"] = True
+            elegidas.append(replicas.index(db.get_bind()))
+
+    assert elegidas in ([0, 1, 0, 1], [1, 0, 1, 0])
+
+
+def test_escritura_core_va_al_primario_y_marca(routing):
+    """Un UPDATE Core desde una sesión read_only va al primario y cuenta como escritura."""
+    Session = routing
+
+    with peticion() as marker, Session() as db:
+        db.info["read_only"] = True
+        db.execute(update(User).where(User.id == 1).values(name="Core"))
+        assert _email(db) == "primary@example.com"
+        db.commit()
+
+    assert marker.wrote_at is not None
+
+
+def test_marca_de_la_peticion():
+    """La cabecera tiene prioridad sobre la cookie; marcas futuras o inválidas no cuentan."""
+    now = time.time()
+    cookie = (b"cookie", f"otra=1; {COOKIE}={now - 1}".encode())
+
+    assert marker_from_headers([cookie]).recent()
+    assert not marker_from_headers([cookie, (b"x-last-write", str(now - 60).encode())]).recent()
+    assert not marker_from_headers([(b"x-last-write", str(now + 60).encode())]).recent()
+    assert marker_from_headers([(b"x-last-write", b"no-es-un-numero")]).last_write is None
+
+
+def test_escritura_devuelve_la_marca(Session, client):
+    """Una escritura HTTP devuelve la marca en cookie y cabecera; una lectura no."""
+    with Session() as db:
+        user = User(email="marca@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_token({'user_id': user.id})}"}
+
+    lectura = client.get("/boards/", headers=headers)
+    assert "x-last-write" not in lectura.headers
+
+    resp = client.post("/boards/", json={"name": "Nuevo"}, headers=headers)
+
+    assert resp.status_code in (200, 201), resp.text
+    assert time.time() - float(resp.headers["x-last-write"]) < 5
+    assert client.cookies[COOKIE] == resp.headers["x-last-write"]
+
+
+def test_escrituras_core_devuelven_la_marca(Session, client):
+    """PATCH (UPDATE ... RETURNING) y un lote solo de updates también devuelven la marca."""
+    with Session() as db:
+        user = User(email="core@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        board = Board(name="Core", user_id=user.id)
+        db.add(board)
+        db.flush()
+        lst = List(name="Por hacer", board_id=board.id, position=0)
+        db.add(lst)
+        db.flush()
+        card = Card(title="A", board_id=board.id, list_id=lst.id, rank="i", created_by_id=user.id)
+        db.add(card)
+        db.commit()
+        card_id = card.id
+        headers = {"Authorization": f"Bearer {create_token({'user_id': user.id})}"}
+
+    patch = client.patch(f"/cards/{card_id}", json={"title": "B"}, headers=headers)
+    assert patch.status_code == 200, patch.text
+    assert "x-last-write" in patch.headers
+
+    bulk = client.post("/cards/bulk", json={"operations": [{"op": "update", "id": card_id, "title": "C"}]},
+                       headers=headers)
+    assert bulk.status_code == 200, bulk.text
+    assert "x-last-write" in bulk.headers